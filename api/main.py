@@ -1,19 +1,28 @@
 """
 Data Operations API Service
 RESTful API to expose setup-skills, teardown-skills, and granular ingestion operations.
-Synchronous operations - all endpoints wait for completion before returning.
+Ops endpoints run as background jobs by default and return a job id that can be
+polled at /api/v1/jobs/{job_id}; pass ?sync=true to wait for the full result.
+Blocking Elasticsearch and filesystem work never runs on the event loop.
 """
 
 import logging
 import os
 import sys
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from dotenv import load_dotenv
 from elasticsearch import Elasticsearch
-from fastapi import Depends, FastAPI, HTTPException, Security
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, Security
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from fastapi.security import APIKeyHeader
 from pydantic import BaseModel
 
@@ -39,6 +48,15 @@ CONFIG_DIR = PROJECT_ROOT / "config"
 # API Key Security
 API_KEY_HEADER = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+# Shared Elasticsearch client settings
+ES_CONNECTIONS_PER_NODE = int(os.getenv("ES_CONNECTIONS_PER_NODE", "10"))
+ES_REQUEST_TIMEOUT = float(os.getenv("ES_REQUEST_TIMEOUT", "30"))
+ES_MAX_RETRIES = int(os.getenv("ES_MAX_RETRIES", "3"))
+ES_RETRY_ON_TIMEOUT = os.getenv("ES_RETRY_ON_TIMEOUT", "true").lower() in ("1", "true", "yes")
+
+# Batch request bodies larger than this are spooled to a temporary file
+BATCH_SPOOL_BYTES = int(os.getenv("BATCH_SPOOL_BYTES", str(8 * 1024 * 1024)))
+
 
 # =============================================================================
 # Authentication
@@ -55,22 +73,123 @@ def get_api_key(api_key: Optional[str] = Security(API_KEY_HEADER)) -> str:
     return api_key
 
 
+# =============================================================================
+# Elasticsearch Client
+# =============================================================================
+
+_es_client: Optional[Elasticsearch] = None
+_es_client_lock = threading.Lock()
+_es_client_created_at: Optional[str] = None
+
+
 def get_es_client() -> Elasticsearch:
-    """Create and return an Elasticsearch client."""
-    es_url = os.getenv("ELASTIC_SEARCH_URL")
-    api_key = os.getenv("ELASTIC_API_KEY")
+    """
+    Return the process-wide Elasticsearch client, creating it on first use.
 
-    if not es_url or not api_key:
-        logger.error("Missing ELASTIC_SEARCH_URL or ELASTIC_API_KEY environment variables")
-        raise Exception("ELASTIC_SEARCH_URL and ELASTIC_API_KEY must be configured")
+    The client owns one keep-alive connection pool per node that is shared by
+    every request and background job (the client is thread-safe), so repeated
+    workflow triggers reuse connections instead of opening new ones. Pool size,
+    request timeout and retries come from the ES_* environment settings.
+    The connection is verified with a ping only when the client is created.
+    """
+    global _es_client, _es_client_created_at
+
+    if _es_client is not None:
+        return _es_client
+
+    with _es_client_lock:
+        if _es_client is not None:
+            return _es_client
+
+        es_url = os.getenv("ELASTIC_SEARCH_URL")
+        api_key = os.getenv("ELASTIC_API_KEY")
 
-    client = Elasticsearch(hosts=[es_url], api_key=api_key)
+        if not es_url or not api_key:
+            logger.error("Missing ELASTIC_SEARCH_URL or ELASTIC_API_KEY environment variables")
+            raise Exception("ELASTIC_SEARCH_URL and ELASTIC_API_KEY must be configured")
 
-    if not client.ping():
-        logger.error("Failed to connect to Elasticsearch")
-        raise Exception("Cannot connect to Elasticsearch")
+        client = Elasticsearch(
+            hosts=[es_url],
+            api_key=api_key,
+            connections_per_node=ES_CONNECTIONS_PER_NODE,
+            request_timeout=ES_REQUEST_TIMEOUT,
+            max_retries=ES_MAX_RETRIES,
+            retry_on_timeout=ES_RETRY_ON_TIMEOUT,
+        )
+
+        if not client.ping():
+            client.close()
+            logger.error("Failed to connect to Elasticsearch")
+            raise Exception("Cannot connect to Elasticsearch")
+
+        logger.info(
+            f"Elasticsearch client created (pool size {ES_CONNECTIONS_PER_NODE}/node, "
+            f"timeout {ES_REQUEST_TIMEOUT}s, retries {ES_MAX_RETRIES})"
+        )
+        _es_client = client
+        _es_client_created_at = get_timestamp()
+        return client
 
-    return client
+
+def close_es_client() -> None:
+    """Close the shared Elasticsearch client and its connection pools."""
+    global _es_client, _es_client_created_at
+
+    with _es_client_lock:
+        if _es_client is not None:
+            _es_client.close()
+            logger.info("Elasticsearch client closed")
+        _es_client = None
+        _es_client_created_at = None
+
+
+def get_es_pool_metrics() -> Dict[str, Any]:
+    """
+    Report connection pool utilization of the shared Elasticsearch client.
+
+    Returns:
+        Dictionary with client settings, per-node pool statistics and totals
+    """
+    client = _es_client
+    metrics: Dict[str, Any] = {
+        "client_initialized": client is not None,
+        "created_at": _es_client_created_at,
+        "settings": {
+            "connections_per_node": ES_CONNECTIONS_PER_NODE,
+            "request_timeout": ES_REQUEST_TIMEOUT,
+            "max_retries": ES_MAX_RETRIES,
+            "retry_on_timeout": ES_RETRY_ON_TIMEOUT,
+        },
+        "nodes": [],
+        "totals": {"pool_size": 0, "in_use": 0, "idle": 0, "connections_opened": 0, "requests": 0},
+    }
+    if client is None:
+        return metrics
+
+    for node in client.transport.node_pool.all():
+        pool = getattr(node, "pool", None)
+        queue = getattr(pool, "pool", None)
+        if queue is None:
+            continue
+
+        # urllib3 keeps free slots in a queue: None for never-opened slots,
+        # a connection object for idle keep-alive connections
+        pool_size = queue.maxsize
+        node_metrics = {
+            "node": str(node.base_url),
+            "pool_size": pool_size,
+            "in_use": pool_size - queue.qsize(),
+            "idle": sum(1 for conn in list(queue.queue) if conn is not None),
+            "connections_opened": pool.num_connections,
+            "requests": pool.num_requests,
+        }
+        node_metrics["utilization"] = round(node_metrics["in_use"] / pool_size, 3) if pool_size else 0.0
+        metrics["nodes"].append(node_metrics)
+
+        for key in metrics["totals"]:
+            metrics["totals"][key] += node_metrics[key]
+
+    return metrics
 
 
 # =============================================================================
@@ -82,7 +201,9 @@ class OperationDetails(BaseModel):
     indexes_deleted: List[str] = []
     skills_created: List[str] = []
     skills_deleted: List[str] = []
+    skills_unchanged: List[str] = []
     files_indexed: int = 0
+    files_deleted: int = 0
 
 
 class OperationResponse(BaseModel):
@@ -111,32 +232,39 @@ class IngestResponse(BaseModel):
     errors: int
 
 
-# =============================================================================
-# FastAPI App
-# =============================================================================
+class JobProgress(BaseModel):
+    completed: int = 0
+    total: int = 0
 
-app = FastAPI(
-    title="Data Operations API",
-    description="API service for data operations including setup-skills, teardown-skills, and granular skill ingestion. All operations are synchronous.",
-    version="3.0.0",
-)
 
+class JobStatus(BaseModel):
+    job_id: str
+    operation: str
+    status: str
+    status_url: str
+    progress: JobProgress = JobProgress()
+    message: str = ""
+    result: Optional[OperationResponse] = None
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
 
-def get_timestamp() -> str:
-    """Get current timestamp in ISO format."""
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
+# =============================================================================
+# FastAPI App
+# =============================================================================
 
-@app.on_event("startup")
-async def startup_event():
-    """Log startup information."""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Log startup information and release shared resources on shutdown."""
     logger.info("=" * 60)
-    logger.info("Data Operations API Service v3.0 starting...")
+    logger.info("Data Operations API Service v3.1 starting...")
     logger.info(f"Project root: {PROJECT_ROOT}")
     logger.info(f"Production skills directory: {PRODUCTION_SKILLS_DIR}")
     logger.info(f"Staged skills directory: {STAGED_SKILLS_DIR}")
     logger.info(f"Dev skills directory: {DEV_SKILLS_DIR}")
-    logger.info("Synchronous mode - all operations wait for completion")
+    logger.info("Ops run as background jobs; pass ?sync=true to wait for completion")
     logger.info("=" * 60)
 
     # Ensure skills directories exist
@@ -145,6 +273,164 @@ async def startup_event():
             skills_dir.mkdir(parents=True, exist_ok=True)
             logger.info(f"Created skills directory at {skills_dir}")
 
+    yield
+
+    jobs.shutdown()
+    close_es_client()
+
+
+app = FastAPI(
+    title="Data Operations API",
+    description=(
+        "API service for data operations including setup-skills, teardown-skills, and granular skill ingestion. "
+        "Ops endpoints run as background jobs unless called with ?sync=true."
+    ),
+    version="3.1.0",
+    lifespan=lifespan,
+)
+
+
+def get_timestamp() -> str:
+    """Get current timestamp in ISO format."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# =============================================================================
+# Job Tracking
+# =============================================================================
+
+# Called by operations as progress(completed, total)
+ProgressCallback = Callable[[int, int], None]
+
+
+def _no_progress(completed: int, total: int) -> None:
+    """Progress callback used when an operation runs synchronously."""
+
+
+class JobManager:
+    """
+    In-memory registry of background operations.
+
+    Jobs run on a single worker thread so setup, teardown and update never
+    race each other on the same indexes; further submissions queue as PENDING.
+    Only the most recent finished jobs are kept.
+    """
+
+    def __init__(self, max_workers: int = 1, max_finished: int = 100):
+        self._jobs: Dict[str, JobStatus] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._max_workers = max_workers
+        self._max_finished = max_finished
+
+    def submit(self, operation: str, func: Callable[[ProgressCallback], OperationResponse]) -> JobStatus:
+        """Queue an operation and return its initial status."""
+        job_id = uuid.uuid4().hex
+        job = JobStatus(
+            job_id=job_id,
+            operation=operation,
+            status="PENDING",
+            status_url=f"/api/v1/jobs/{job_id}",
+            message=f"{operation} queued",
+            created_at=get_timestamp(),
+        )
+        with self._lock:
+            self._jobs[job_id] = job
+            self._prune()
+            snapshot = job.model_copy(deep=True)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="ops-job"
+                )
+            executor = self._executor
+
+        executor.submit(self._run, job_id, func)
+        logger.info(f"Job {job_id} queued: {operation}")
+        return snapshot
+
+    def get(self, job_id: str) -> Optional[JobStatus]:
+        """Return a copy of a job's current status, or None if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.model_copy(deep=True) if job else None
+
+    def list(self) -> List[JobStatus]:
+        """Return copies of all tracked jobs, newest first."""
+        with self._lock:
+            return [job.model_copy(deep=True) for job in reversed(list(self._jobs.values()))]
+
+    def shutdown(self) -> None:
+        """Cancel jobs that have not started and release the worker thread."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            for name, value in fields.items():
+                setattr(job, name, value)
+
+    def _run(self, job_id: str, func: Callable[[ProgressCallback], OperationResponse]) -> None:
+        self._update(job_id, status="IN_PROGRESS", started_at=get_timestamp(), message="Running")
+
+        def progress(completed: int, total: int) -> None:
+            self._update(job_id, progress=JobProgress(completed=completed, total=total))
+
+        try:
+            result = func(progress)
+        except HTTPException as e:
+            logger.error(f"Job {job_id} failed: {e.detail}")
+            self._update(job_id, status="FAILED", error=str(e.detail), message=str(e.detail),
+                         finished_at=get_timestamp())
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}")
+            self._update(job_id, status="FAILED", error=str(e), message=str(e),
+                         finished_at=get_timestamp())
+        else:
+            logger.info(f"Job {job_id} completed")
+            self._update(job_id, status="COMPLETED", result=result, message=result.message,
+                         finished_at=get_timestamp())
+
+    def _prune(self) -> None:
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in ("COMPLETED", "FAILED")
+        ]
+        for job_id in finished[:max(0, len(finished) - self._max_finished)]:
+            del self._jobs[job_id]
+
+
+jobs = JobManager()
+
+
+async def run_operation(
+    operation: str,
+    func: Callable[[ProgressCallback], OperationResponse],
+    sync: bool,
+    response: Response,
+) -> Union[OperationResponse, JobStatus]:
+    """
+    Run an operation on a worker thread.
+
+    Args:
+        operation: Operation name used for the job record
+        func: Blocking operation taking a progress callback
+        sync: Wait for the result instead of returning a job
+        response: Response used to set 202 Accepted for background jobs
+
+    Returns:
+        The OperationResponse when sync, otherwise the queued JobStatus
+    """
+    if sync:
+        return await run_in_threadpool(func, _no_progress)
+
+    response.status_code = 202
+    return jobs.submit(operation, func)
+
 
 # =============================================================================
 # API Endpoints
@@ -156,13 +442,22 @@ async def health_check():
     return {"status": "healthy", "timestamp": get_timestamp()}
 
 
-@app.post("/api/v1/ops/setup-skills", response_model=OperationResponse)
-async def setup_skills(_api_key: str = Depends(get_api_key)):
+@app.post("/api/v1/ops/setup-skills", response_model=Union[OperationResponse, JobStatus])
+async def setup_skills(
+    response: Response,
+    sync: bool = Query(False, description="Wait for completion instead of returning a job id"),
+    _api_key: str = Depends(get_api_key),
+):
     """
-    Run the full data setup process (synchronous).
+    Run the full data setup process.
     Creates indexes and ingests all skills from production-skills folder.
-    Waits for completion and returns the full result.
+    Returns a job id (202) unless sync=true, in which case it waits for the full result.
     """
+    return await run_operation("setup-skills", run_setup_skills, sync, response)
+
+
+def run_setup_skills(progress: ProgressCallback = _no_progress) -> OperationResponse:
+    """Create indexes and bulk ingest production skills (blocking)."""
     logger.info("=" * 60)
     logger.info("SETUP-SKILLS - Starting full data setup process")
     logger.info("=" * 60)
@@ -206,7 +501,11 @@ async def setup_skills(_api_key: str = Depends(get_api_key)):
 
         # Bulk ingest all skills
         logger.info(f"Bulk ingesting {total_skills} skills...")
-        stats = ingest_skills(PRODUCTION_SKILLS_DIR, es, "agent_skills", "agent_skill_files")
+        progress(0, total_skills)
+        stats = ingest_skills(
+            PRODUCTION_SKILLS_DIR, es, "agent_skills", "agent_skill_files",
+            progress_callback=progress,
+        )
 
         details.skills_created = skill_folders
         details.files_indexed = stats.get("files_indexed", 0) if isinstance(stats, dict) else 0
@@ -239,13 +538,22 @@ async def setup_skills(_api_key: str = Depends(get_api_key)):
         raise HTTPException(status_code=500, detail=f"Setup failed: {str(e)}")
 
 
-@app.post("/api/v1/ops/teardown-skills", response_model=OperationResponse)
-async def teardown_skills(_api_key: str = Depends(get_api_key)):
+@app.post("/api/v1/ops/teardown-skills", response_model=Union[OperationResponse, JobStatus])
+async def teardown_skills(
+    response: Response,
+    sync: bool = Query(False, description="Wait for completion instead of returning a job id"),
+    _api_key: str = Depends(get_api_key),
+):
     """
-    Run the data cleanup process (synchronous).
+    Run the data cleanup process.
     Deletes all indexes and their contents.
-    Waits for completion and returns the full result.
+    Returns a job id (202) unless sync=true, in which case it waits for the full result.
     """
+    return await run_operation("teardown-skills", run_teardown_skills, sync, response)
+
+
+def run_teardown_skills(progress: ProgressCallback = _no_progress) -> OperationResponse:
+    """Delete the skill indexes (blocking)."""
     logger.info("=" * 60)
     logger.info("TEARDOWN-SKILLS - Starting cleanup process")
     logger.info("=" * 60)
@@ -277,7 +585,8 @@ async def teardown_skills(_api_key: str = Depends(get_api_key)):
         indexes = ["agent_skills", "agent_skill_files"]
         skipped = []
 
-        for index in indexes:
+        progress(0, len(indexes))
+        for i, index in enumerate(indexes, 1):
             logger.info(f"Deleting index '{index}'...")
             if es.indices.exists(index=index):
                 es.indices.delete(index=index)
@@ -286,6 +595,7 @@ async def teardown_skills(_api_key: str = Depends(get_api_key)):
             else:
                 skipped.append(index)
                 logger.info(f"Index '{index}' does not exist, skipping")
+            progress(i, len(indexes))
 
         # Build response
         summary = f"Deleted {len(details.indexes_deleted)} indexes, {len(details.skills_deleted)} skills"
@@ -315,15 +625,19 @@ async def teardown_skills(_api_key: str = Depends(get_api_key)):
         raise HTTPException(status_code=500, detail=f"Teardown failed: {str(e)}")
 
 
-@app.post("/api/v1/ops/update-skills", response_model=OperationResponse)
+@app.post("/api/v1/ops/update-skills", response_model=Union[OperationResponse, JobStatus])
 async def update_skills(
+    response: Response,
     request: Optional[UpdateSkillsRequest] = None,
+    sync: bool = Query(False, description="Wait for completion instead of returning a job id"),
     _api_key: str = Depends(get_api_key),
 ):
     """
-    Ingest all skills from a specified folder (synchronous).
-    Scans the directory and ingests any skill folders found.
-    Waits for completion and returns the full result.
+    Ingest all skills from a specified folder.
+    Scans the directory and incrementally re-ingests any skill folders found:
+    skills whose content hash is unchanged are skipped, only new or edited
+    files are indexed, and files removed from disk are deleted.
+    Returns a job id (202) unless sync=true, in which case it waits for the full result.
 
     Args:
         request: Optional request body with skills_path. If not provided or skills_path is None,
@@ -337,6 +651,23 @@ async def update_skills(
     else:
         skills_dir = STAGED_SKILLS_DIR
 
+    # Check if skills folder exists before queueing any work
+    if not skills_dir.exists():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Skills directory not found: {skills_dir}",
+        )
+
+    return await run_operation(
+        "update-skills",
+        lambda progress: run_update_skills(skills_dir, progress),
+        sync,
+        response,
+    )
+
+
+def run_update_skills(skills_dir: Path, progress: ProgressCallback = _no_progress) -> OperationResponse:
+    """Incrementally re-ingest the skills in a directory (blocking)."""
     logger.info("=" * 60)
     logger.info(f"UPDATE-SKILLS - Starting ingestion from {skills_dir}")
     logger.info("=" * 60)
@@ -344,13 +675,6 @@ async def update_skills(
     details = OperationDetails()
 
     try:
-        # Check if skills folder exists
-        if not skills_dir.exists():
-            raise HTTPException(
-                status_code=400,
-                detail=f"Skills directory not found: {skills_dir}",
-            )
-
         # Get all subdirectories (each is a skill)
         skill_dirs = [
             d for d in skills_dir.iterdir()
@@ -371,44 +695,37 @@ async def update_skills(
 
         # Import ingestion functions
         sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
-        from ingest_skills import (
-            create_skill_document,
-            index_skill_files,
-            parse_skill_metadata,
-        )
+        from ingest_skills import sync_skill
 
         logger.info("Connecting to Elasticsearch...")
         es = get_es_client()
 
         skills_failed = []
+        progress(0, total_skills)
 
         for i, skill_dir in enumerate(skill_dirs, 1):
             skill_name = skill_dir.name
             logger.info(f"[{i}/{total_skills}] Processing skill: {skill_name}")
 
             try:
-                # Parse metadata
-                metadata = parse_skill_metadata(skill_dir)
-                logger.info(f"  Parsed metadata for: {metadata.get('title', skill_name)}")
-
-                # Create and index skill document
-                doc = create_skill_document(metadata)
-                es.index(
-                    index="agent_skills",
-                    id=metadata["skill_id"],
-                    document=doc,
-                )
-                logger.info(f"  Indexed skill document")
-
-                # Index skill files
-                files_count = index_skill_files(
+                result = sync_skill(
                     skill_dir=skill_dir,
-                    skill_id=metadata["skill_id"],
                     es_client=es,
-                    index_name="agent_skill_files",
+                    index_name="agent_skills",
+                    files_index_name="agent_skill_files",
+                )
+
+                if result["status"] == "unchanged":
+                    details.skills_unchanged.append(skill_name)
+                    logger.info(f"  = Unchanged, skipped: {skill_name}")
+                    continue
+
+                details.files_indexed += result["files_indexed"]
+                details.files_deleted += result["files_deleted"]
+                logger.info(
+                    f"  Indexed {result['files_indexed']} files, deleted {result['files_deleted']}, "
+                    f"unchanged {result['files_unchanged']}"
                 )
-                details.files_indexed += files_count
-                logger.info(f"  Indexed {files_count} files")
 
                 details.skills_created.append(skill_name)
                 logger.info(f"  ✓ Successfully ingested: {skill_name}")
@@ -416,6 +733,8 @@ async def update_skills(
             except Exception as e:
                 logger.error(f"  ✗ Failed to ingest {skill_name}: {str(e)}")
                 skills_failed.append(f"{skill_name}: {str(e)}")
+            finally:
+                progress(i, total_skills)
 
         # Refresh indexes
         logger.info("Refreshing indexes...")
@@ -423,16 +742,25 @@ async def update_skills(
         es.indices.refresh(index="agent_skill_files")
 
         # Build response
-        summary = f"Ingested {len(details.skills_created)} skills, {details.files_indexed} files"
-        message = f"Update complete. Skills ingested: {len(details.skills_created)}. Files: {details.files_indexed}."
+        summary = (
+            f"Ingested {len(details.skills_created)} skills, {details.files_indexed} files "
+            f"({len(details.skills_unchanged)} skills unchanged, {details.files_deleted} files deleted)"
+        )
+        message = (
+            f"Update complete. Skills ingested: {len(details.skills_created)}. "
+            f"Unchanged: {len(details.skills_unchanged)}. "
+            f"Files: {details.files_indexed}. Files deleted: {details.files_deleted}."
+        )
         if skills_failed:
             message += f" Failed: {len(skills_failed)} - {skills_failed}"
 
         logger.info("=" * 60)
         logger.info(f"UPDATE-SKILLS - Completed")
         logger.info(f"  Skills ingested: {len(details.skills_created)}")
+        logger.info(f"  Skills unchanged: {len(details.skills_unchanged)}")
         logger.info(f"  Skills failed: {len(skills_failed)}")
         logger.info(f"  Files indexed: {details.files_indexed}")
+        logger.info(f"  Files deleted: {details.files_deleted}")
         logger.info("=" * 60)
 
         return OperationResponse(
@@ -448,9 +776,10 @@ async def update_skills(
 
 
 @app.post("/api/v1/ingest/folder", response_model=IngestResponse)
-async def ingest_folder(request: IngestRequest, _api_key: str = Depends(get_api_key)):
+def ingest_folder(request: IngestRequest, _api_key: str = Depends(get_api_key)):
     """
     Load data from a specific production-skills subfolder.
+    Declared as a plain function so FastAPI runs it in its threadpool.
     """
     folder_name = request.folder_name
     target_path = PRODUCTION_SKILLS_DIR / folder_name
@@ -527,6 +856,78 @@ async def ingest_folder(request: IngestRequest, _api_key: str = Depends(get_api_
         raise HTTPException(status_code=500, detail=f"Ingestion failed: {str(e)}")
 
 
+@app.post("/api/v1/skills/{skill_name}/batch")
+async def run_skill_batch(
+    skill_name: str,
+    request: Request,
+    entry_point: Optional[str] = Query(None, description="'function' or 'module:function' (default: detected)"),
+    processes: int = Query(1, ge=0, description="Worker processes (default 1 runs in-process; capped at the CPU count)"),
+    chunk_size: int = Query(100, ge=1, description="Records sent to a worker at a time"),
+    _api_key: str = Depends(get_api_key),
+):
+    """
+    Run a production skill's entry point over a batch of inputs.
+    The request body is JSONL (one object of keyword arguments per line); the
+    response streams one JSONL result per input line, in order. Records that
+    fail produce {"error", "error_type", "record"} lines instead of aborting.
+    """
+    from skill_runtime.batch import read_jsonl, resolve_entry_point, run_batch, to_jsonl
+
+    skill_dir = PRODUCTION_SKILLS_DIR / skill_name
+    if skill_dir.resolve().parent != PRODUCTION_SKILLS_DIR.resolve() or not skill_dir.is_dir():
+        raise HTTPException(status_code=404, detail=f"Skill '{skill_name}' not found in production-skills.")
+
+    try:
+        module_path, function_name = resolve_entry_point(skill_dir, entry_point)
+    except (FileNotFoundError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Spool the body as it arrives rather than buffering it whole; the
+    # streaming response cannot read the request once it has started.
+    body = tempfile.SpooledTemporaryFile(max_size=BATCH_SPOOL_BYTES)
+    async for chunk in request.stream():
+        body.write(chunk)
+    body.seek(0)
+    # Each request gets its own pool, so never start more workers than cores
+    processes = min(processes, os.cpu_count() or 1)
+    logger.info(f"BATCH - Running {skill_name} ({module_path.name}:{function_name})")
+
+    def results():
+        with body:
+            for result in run_batch(
+                skill_dir,
+                read_jsonl(body),
+                entry_point=f"{module_path.stem}:{function_name}",
+                processes=processes,
+                chunk_size=chunk_size,
+            ):
+                yield to_jsonl(result)
+
+    # Starlette iterates sync generators on its threadpool, keeping the event loop free
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@app.get("/api/v1/metrics/es-pool")
+async def es_pool_metrics(_api_key: str = Depends(get_api_key)):
+    """Connection pool utilization of the shared Elasticsearch client."""
+    return get_es_pool_metrics()
+
+
+@app.get("/api/v1/jobs", response_model=List[JobStatus])
+async def list_jobs(_api_key: str = Depends(get_api_key)):
+    """List tracked background jobs, newest first."""
+    return jobs.list()
+
+
+@app.get("/api/v1/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str, _api_key: str = Depends(get_api_key)):
+    """Return the status, progress and (once finished) result of a background job."""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Snapshot Compiler for Agent Skills
+Compiles each skill's CSV reference data into a typed, memory-mappable
+reference.snapshot file stored next to its SKILL.md.
+
+Run after checking out or editing skills; the skills fall back to parsing
+their CSVs whenever a snapshot is missing or out of date.
+"""
+
+import argparse
+import ast
+import importlib.util
+import inspect
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from skill_runtime.refdata import record_loads  # noqa: E402
+from skill_runtime.snapshot import SNAPSHOT_FILENAME, write_snapshot  # noqa: E402
+
+
+def load_skill_modules(skill_dir: Path) -> List:
+    """
+    Import every Python module in a skill directory.
+
+    Args:
+        skill_dir: Path to skill directory
+
+    Returns:
+        List of imported module objects
+    """
+    modules = []
+    sys.path.insert(0, str(skill_dir))
+    try:
+        for py_file in sorted(skill_dir.glob('*.py')):
+            module_name = f"_snapshot_{skill_dir.name.replace('-', '_')}_{py_file.stem}"
+            spec = importlib.util.spec_from_file_location(module_name, py_file)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            modules.append(module)
+    finally:
+        sys.path.remove(str(skill_dir))
+    return modules
+
+
+def cached_loaders(module) -> Dict[str, Callable[..., Any]]:
+    """Module-level loaders wrapped by cached_reference_loader, by name."""
+    return {
+        name: func for name, func in inspect.getmembers(module, inspect.isfunction)
+        if getattr(func, 'is_cached_reference_loader', False) and func.__module__ == module.__name__
+    }
+
+
+def loader_calls(module, loaders: Dict[str, Callable[..., Any]]) -> Set[Tuple[str, Tuple, Tuple]]:
+    """
+    Find the cached loader calls a skill makes, as (name, args, kwargs).
+
+    Calls whose arguments are all literals (``load_csv_as_dict("tiers.csv")``)
+    are read from the module source; loaders without required arguments are
+    called once as well. Calls with computed arguments are left out and keep
+    reading their CSVs at run time.
+    """
+    calls = set()
+    for name, func in loaders.items():
+        required = [
+            p for p in inspect.signature(func).parameters.values()
+            if p.default is inspect.Parameter.empty
+            and p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY)
+        ]
+        if not required:
+            calls.add((name, (), ()))
+
+    tree = ast.parse(Path(module.__file__).read_text())
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)):
+            continue
+        if node.func.id not in loaders:
+            continue
+        try:
+            args = tuple(ast.literal_eval(arg) for arg in node.args)
+            kwargs = tuple(sorted((kw.arg, ast.literal_eval(kw.value)) for kw in node.keywords))
+        except (ValueError, TypeError, SyntaxError):
+            continue
+        if any(kw is None for kw, _ in kwargs):
+            continue
+        calls.add((node.func.id, args, kwargs))
+    return calls
+
+
+def compile_skill(skill_dir: Path) -> int:
+    """
+    Compile one skill's reference data into a snapshot.
+
+    Only loaders wrapped by ``cached_reference_loader`` are called, once per
+    literal call found in the skill's source, while the loads are recorded.
+    Other loaders in the skill (its own JSON readers, ``load_<skill>_config()``
+    entry points) are never run.
+
+    Args:
+        skill_dir: Path to skill directory
+
+    Returns:
+        Number of loader results written (0 if the skill has no cached loaders)
+
+    Raises:
+        OSError: If a loader cannot read its reference file
+    """
+    records = []
+    with record_loads() as recorded:
+        for module in load_skill_modules(skill_dir):
+            loaders = cached_loaders(module)
+            for name, args, kwargs in sorted(loader_calls(module, loaders), key=repr):
+                loaders[name](*args, **dict(kwargs))
+        records = [
+            (key, fingerprint, value)
+            for recorded_dir, key, fingerprint, value in recorded
+            if recorded_dir == skill_dir.resolve()
+        ]
+
+    if not records:
+        return 0
+
+    write_snapshot(skill_dir, records)
+    return len({key for key, _, _ in records})
+
+
+def compile_snapshots(skills_dir: Path) -> Dict[str, int]:
+    """
+    Compile snapshots for every skill in a directory.
+
+    Args:
+        skills_dir: Directory containing one subdirectory per skill
+
+    Returns:
+        Dictionary with compiled, skipped and errors counts
+    """
+    if not skills_dir.exists():
+        raise FileNotFoundError(f"Skills directory not found: {skills_dir}")
+
+    skill_dirs = sorted(
+        d for d in skills_dir.iterdir()
+        if d.is_dir() and not d.name.startswith('.') and (d / "SKILL.md").exists()
+    )
+    print(f"Compiling reference snapshots for {len(skill_dirs)} skills...")
+
+    stats = {"compiled": 0, "skipped": 0, "errors": 0}
+    for skill_dir in skill_dirs:
+        try:
+            entries = compile_skill(skill_dir)
+        except OSError as e:
+            # Missing or unreadable reference file: the skill keeps loading at run time
+            print(f"  - {skill_dir.name}: skipped ({e})")
+            stats["skipped"] += 1
+            continue
+        except Exception as e:
+            print(f"  ✗ {skill_dir.name}: {e}")
+            stats["errors"] += 1
+            continue
+
+        if entries:
+            print(f"  ✓ {skill_dir.name}: {entries} tables")
+            stats["compiled"] += 1
+        else:
+            stats["skipped"] += 1
+
+    print(f"\n{'='*60}")
+    print(f"Snapshots: {stats['compiled']} compiled, {stats['skipped']} skipped, {stats['errors']} errors")
+    print(f"{'='*60}")
+    return stats
+
+
+def clean_snapshots(skills_dir: Path) -> int:
+    """Delete all compiled snapshots under a skills directory."""
+    removed = 0
+    for snapshot_path in skills_dir.glob(f"*/{SNAPSHOT_FILENAME}"):
+        snapshot_path.unlink()
+        removed += 1
+    print(f"Removed {removed} snapshots.")
+    return removed
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Compile skill CSV reference data into memory-mappable snapshots"
+    )
+    parser.add_argument(
+        "--skills-dir",
+        default=str(PROJECT_ROOT / "skills" / "production-skills"),
+        help="Directory containing skill folders (default: skills/production-skills)"
+    )
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="Remove existing snapshots instead of compiling"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    skills_dir = Path(args.skills_dir)
+
+    if args.clean:
+        clean_snapshots(skills_dir)
+        return
+
+    stats = compile_snapshots(skills_dir)
+    if stats["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,17 @@ Uses semantic_text with automatic inference for embeddings
 """
 
 import argparse
+import hashlib
 import json
 import os
+import queue
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime
-from elasticsearch import Elasticsearch
+from elasticsearch import Elasticsearch, helpers
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -229,12 +233,12 @@ def collect_skill_files(
     operations = []
 
     for file_path in skill_dir.rglob('*'):
-        # Skip directories, __pycache__, and .pyc files
+        # Skip directories, __pycache__, .pyc files and compiled reference snapshots
         if not file_path.is_file():
             continue
         if '__pycache__' in str(file_path):
             continue
-        if file_path.suffix == '.pyc':
+        if file_path.suffix in ('.pyc', '.snapshot'):
             continue
 
         try:
@@ -249,6 +253,7 @@ def collect_skill_files(
                 "file_type": file_path.suffix[1:] if file_path.suffix else "unknown",
                 "file_content": file_content,
                 "file_size_bytes": file_path.stat().st_size,
+                "content_hash": hashlib.sha256(file_content.encode('utf-8')).hexdigest(),
                 "created_at": datetime.utcnow().isoformat()
             }
 
@@ -268,6 +273,177 @@ def collect_skill_files(
     return operations
 
 
+def compute_skill_hash(file_hashes: Dict[str, str]) -> str:
+    """
+    Compute the Merkle root of a skill's files.
+
+    Leaves are sha256(path + NUL + file hash) in path order; pairs of nodes are
+    hashed together level by level (an odd node is carried up unchanged).
+    Any added, removed, renamed or edited file changes the root.
+
+    Args:
+        file_hashes: Mapping of relative file path to sha256 content hash
+
+    Returns:
+        Hex-encoded root hash (hash of the empty string for an empty skill)
+    """
+    level = [
+        hashlib.sha256(f"{path}\0{file_hash}".encode('utf-8')).digest()
+        for path, file_hash in sorted(file_hashes.items())
+    ]
+    if not level:
+        return hashlib.sha256(b"").hexdigest()
+
+    while len(level) > 1:
+        next_level = [
+            hashlib.sha256(level[i] + level[i + 1]).digest()
+            for i in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2:
+            next_level.append(level[-1])
+        level = next_level
+
+    return level[0].hex()
+
+
+def build_skill_documents(
+    skill_dir: Path,
+    files_index_name: str = "agent_skill_files"
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    Build the skill document and its file documents, stamped with content hashes.
+
+    Args:
+        skill_dir: Path to skill directory
+        files_index_name: Target index name for skill files
+
+    Returns:
+        Tuple of (skill document, {file document id: file document})
+    """
+    metadata = parse_skill_metadata(skill_dir)
+    doc = create_skill_document(metadata)
+
+    operations = collect_skill_files(skill_dir, metadata["skill_id"], files_index_name)
+    file_docs = {
+        action["index"]["_id"]: file_doc
+        for action, file_doc in zip(operations[::2], operations[1::2])
+    }
+
+    doc["content_hash"] = compute_skill_hash(
+        {file_doc["file_path"]: file_doc["content_hash"] for file_doc in file_docs.values()}
+    )
+    return doc, file_docs
+
+
+def get_indexed_file_hashes(
+    es_client: Elasticsearch,
+    skill_id: str,
+    files_index_name: str = "agent_skill_files"
+) -> Dict[str, Optional[str]]:
+    """
+    Fetch the content hashes of a skill's files currently in Elasticsearch.
+
+    Args:
+        es_client: Elasticsearch client
+        skill_id: Skill identifier
+        files_index_name: Files index name
+
+    Returns:
+        Mapping of file document id to stored content hash (None for documents
+        indexed before hashes were recorded)
+    """
+    if not es_client.indices.exists(index=files_index_name):
+        return {}
+
+    response = es_client.search(
+        index=files_index_name,
+        query={"term": {"skill_id": skill_id}},
+        source=["content_hash"],
+        size=10000,
+    )
+    return {
+        hit["_id"]: hit.get("_source", {}).get("content_hash")
+        for hit in response["hits"]["hits"]
+    }
+
+
+def sync_skill(
+    skill_dir: Path,
+    es_client: Elasticsearch,
+    index_name: str = "agent_skills",
+    files_index_name: str = "agent_skill_files"
+) -> Dict[str, Any]:
+    """
+    Incrementally re-ingest one skill using content hashes.
+
+    The skill document stores the Merkle root of its files. If the root is
+    unchanged nothing is sent. Otherwise only new or edited files are indexed
+    and files that no longer exist are deleted. The skill document is written
+    last, so an interrupted sync is retried on the next run.
+
+    Args:
+        skill_dir: Path to skill directory
+        es_client: Elasticsearch client
+        index_name: Target index name for metadata
+        files_index_name: Target index name for skill files
+
+    Returns:
+        Dictionary with skill_id, status (created/updated/unchanged),
+        files_indexed, files_deleted and files_unchanged
+    """
+    doc, file_docs = build_skill_documents(skill_dir, files_index_name)
+    skill_id = doc["skill_id"]
+    result = {
+        "skill_id": skill_id,
+        "status": "unchanged",
+        "files_indexed": 0,
+        "files_deleted": 0,
+        "files_unchanged": len(file_docs),
+    }
+
+    existing_doc = None
+    if es_client.indices.exists(index=index_name):
+        response = es_client.options(ignore_status=404).get(
+            index=index_name, id=skill_id, source_includes=["content_hash"]
+        )
+        if response.get("found"):
+            existing_doc = response.get("_source", {})
+
+    if existing_doc and existing_doc.get("content_hash") == doc["content_hash"]:
+        return result
+
+    indexed_hashes = get_indexed_file_hashes(es_client, skill_id, files_index_name)
+    changed = [
+        doc_id for doc_id, file_doc in file_docs.items()
+        if indexed_hashes.get(doc_id) != file_doc["content_hash"]
+    ]
+    removed = [doc_id for doc_id in indexed_hashes if doc_id not in file_docs]
+
+    operations = []
+    for doc_id in changed:
+        operations.append({"index": {"_index": files_index_name, "_id": doc_id}})
+        operations.append(file_docs[doc_id])
+    for doc_id in removed:
+        operations.append({"delete": {"_index": files_index_name, "_id": doc_id}})
+
+    if operations:
+        response = es_client.bulk(operations=operations, refresh=False)
+        for item in response.get("items", []):
+            op_type, outcome = next(iter(item.items()))
+            if outcome.get("error"):
+                raise Exception(f"Failed to {op_type} {outcome.get('_id')}: {outcome['error']}")
+            if op_type == "index":
+                result["files_indexed"] += 1
+            elif op_type == "delete":
+                result["files_deleted"] += 1
+
+    es_client.index(index=index_name, id=skill_id, document=doc)
+
+    result["status"] = "updated" if existing_doc is not None else "created"
+    result["files_unchanged"] = len(file_docs) - len(changed)
+    return result
+
+
 def index_skill_files(
     skill_dir: Path,
     skill_id: str,
@@ -300,22 +476,72 @@ def index_skill_files(
     return files_indexed
 
 
+def iter_skill_actions(
+    skill_dir: Path,
+    index_name: str = "agent_skills",
+    files_index_name: str = "agent_skill_files"
+) -> List[Dict[str, Any]]:
+    """
+    Read one skill directory and build its bulk helper actions.
+
+    Args:
+        skill_dir: Path to skill directory
+        index_name: Target index name for metadata
+        files_index_name: Target index name for skill files
+
+    Returns:
+        List of actions (skill document first, then one per file) in the
+        format accepted by elasticsearch.helpers
+    """
+    doc, file_docs = build_skill_documents(skill_dir, files_index_name)
+
+    actions = [{"_index": index_name, "_id": doc["skill_id"], "_source": doc}]
+    for doc_id, file_doc in file_docs.items():
+        actions.append({"_index": files_index_name, "_id": doc_id, "_source": file_doc})
+
+    return actions
+
+
 def ingest_skills(
     skills_dir: Path,
     es_client: Elasticsearch,
     index_name: str = "agent_skills",
     files_index_name: str = "agent_skill_files",
-    batch_size: int = 100
-) -> None:
+    batch_size: int = 500,
+    max_batch_bytes: int = 10 * 1024 * 1024,
+    reader_threads: int = 8,
+    sender_threads: int = 4,
+    queue_size: int = 1000,
+    max_retries: int = 3,
+    progress_callback: Optional[Callable[[int, int], None]] = None
+) -> Dict[str, int]:
     """
-    Main ingestion function. Uses bulk API for efficient batch indexing.
+    Main ingestion function. Runs a three-stage pipeline:
+
+    1. Reader threads parse skill directories and read their files in parallel.
+    2. Actions flow through a bounded queue; when senders fall behind, readers
+       block (backpressure) instead of buffering the whole corpus in memory.
+    3. Sender threads each run ``helpers.streaming_bulk``, which cuts requests
+       at batch_size documents or max_batch_bytes, whichever comes first, and
+       retries only the items Elasticsearch rejected as retryable (429/5xx),
+       with exponential backoff.
 
     Args:
         skills_dir: Path to sample_skills directory
         es_client: Elasticsearch client
         index_name: Target index name for metadata
         files_index_name: Target index name for skill files
-        batch_size: Number of operations per bulk request
+        batch_size: Maximum documents per bulk request
+        max_batch_bytes: Maximum serialized size of a bulk request
+        reader_threads: Number of parallel skill directory readers
+        sender_threads: Number of concurrent bulk senders
+        queue_size: Maximum actions buffered between readers and senders
+        max_retries: Retries per rejected document before it counts as failed
+        progress_callback: Optional callable invoked as (skills_read, total_skills)
+            each time a reader finishes queueing a skill
+
+    Returns:
+        Dictionary with skills_indexed, files_indexed, errors and skill_errors
     """
     if not skills_dir.exists():
         raise FileNotFoundError(f"Skills directory not found: {skills_dir}")
@@ -323,84 +549,94 @@ def ingest_skills(
     # Get all subdirectories (each is a skill)
     skill_dirs = [d for d in skills_dir.iterdir() if d.is_dir() and not d.name.startswith('.')]
 
+    stats = {"skills_indexed": 0, "files_indexed": 0, "errors": 0, "skill_errors": 0}
+
     if not skill_dirs:
         print("No skills found in directory.")
-        return
+        return stats
 
     print(f"Found {len(skill_dirs)} skills to ingest.")
-    print("Collecting documents for bulk indexing...")
-
-    # Collect all skill metadata operations
-    skill_operations = []
-    # Collect all file operations
-    file_operations = []
+    print(
+        f"Pipelined bulk indexing: {reader_threads} readers, {sender_threads} senders, "
+        f"batches of up to {batch_size} docs / {max_batch_bytes // 1024} KiB..."
+    )
 
-    ingested = 0
-    total_files = 0
-    errors = 0
+    action_queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+    stats_lock = threading.Lock()
+    done = object()
+    skills_read = 0
 
-    for skill_dir in skill_dirs:
+    def read_skill(skill_dir: Path) -> None:
+        nonlocal skills_read
         try:
-            # Parse metadata
-            metadata = parse_skill_metadata(skill_dir)
-
-            # Create document
-            doc = create_skill_document(metadata)
-
-            # Add bulk operation for skill metadata
-            skill_operations.append({"index": {"_index": index_name, "_id": metadata["skill_id"]}})
-            skill_operations.append(doc)
-
-            # Collect all file operations for this skill
-            file_ops = collect_skill_files(skill_dir, metadata["skill_id"], files_index_name)
-            file_operations.extend(file_ops)
-            total_files += len(file_ops) // 2  # Each file has 2 entries (action + doc)
-
-            ingested += 1
-
-            # Progress indicator
-            if ingested % 10 == 0:
-                print(f"  Collected {ingested}/{len(skill_dirs)} skills...")
-
+            actions = iter_skill_actions(skill_dir, index_name, files_index_name)
         except Exception as e:
             print(f"  ✗ Error processing {skill_dir.name}: {e}")
-            errors += 1
-
-    print(f"\nCollected {ingested} skills and {total_files} files.")
-
-    # Bulk index skill metadata
-    if skill_operations:
-        print(f"Bulk indexing {ingested} skill documents...")
-        response = es_client.bulk(operations=skill_operations, refresh=False)
-        skill_errors = sum(1 for item in response.get("items", []) if item.get("index", {}).get("error"))
-        if skill_errors:
-            print(f"  Warning: {skill_errors} skill documents had errors")
-        print(f"  ✓ Indexed {ingested - skill_errors} skill documents")
-
-    # Bulk index files in batches (to avoid memory issues with large payloads)
-    if file_operations:
-        print(f"Bulk indexing {total_files} file documents in batches of {batch_size}...")
-        files_indexed = 0
-        files_errors = 0
-
-        # Process in batches
-        for i in range(0, len(file_operations), batch_size * 2):  # *2 because each doc has action + body
-            batch = file_operations[i:i + batch_size * 2]
-            response = es_client.bulk(operations=batch, refresh=False)
-
-            batch_success = sum(1 for item in response.get("items", []) if "index" in item and item["index"].get("status") in [200, 201])
-            batch_errors = sum(1 for item in response.get("items", []) if item.get("index", {}).get("error"))
-
-            files_indexed += batch_success
-            files_errors += batch_errors
-
-            # Progress indicator
-            progress = min(i + batch_size * 2, len(file_operations)) // 2
-            print(f"  Progress: {progress}/{total_files} files...")
-
-        print(f"  ✓ Indexed {files_indexed} file documents")
-        if files_errors:
-            print(f"  Warning: {files_errors} file documents had errors")
+            with stats_lock:
+                stats["skill_errors"] += 1
+            actions = []
+        for action in actions:
+            action_queue.put(action)
+        if progress_callback:
+            with stats_lock:
+                skills_read += 1
+                progress_callback(skills_read, len(skill_dirs))
+
+    def queued_actions():
+        while True:
+            action = action_queue.get()
+            if action is done:
+                return
+            yield action
+
+    def send_bulk() -> None:
+        actions = queued_actions()
+        try:
+            for ok, item in helpers.streaming_bulk(
+                es_client,
+                actions,
+                chunk_size=batch_size,
+                max_chunk_bytes=max_batch_bytes,
+                max_retries=max_retries,
+                retry_on_status=(429, 502, 503, 504),
+                raise_on_error=False,
+                raise_on_exception=False,
+            ):
+                result = next(iter(item.values()))
+                with stats_lock:
+                    if not ok:
+                        stats["errors"] += 1
+                        print(f"  ✗ Failed to index {result.get('_id')}: {result.get('error', result.get('status'))}")
+                    elif result.get("_index") == index_name:
+                        stats["skills_indexed"] += 1
+                    else:
+                        stats["files_indexed"] += 1
+                        if stats["files_indexed"] % 100 == 0:
+                            print(f"  Progress: {stats['files_indexed']} files...")
+        except Exception as e:
+            print(f"  ✗ Bulk sender failed: {e}")
+            # Keep draining so readers blocked on the queue can finish
+            dropped = sum(1 for _ in actions)
+            with stats_lock:
+                stats["errors"] += dropped + 1
+
+    senders = [threading.Thread(target=send_bulk, daemon=True) for _ in range(sender_threads)]
+    for sender in senders:
+        sender.start()
+
+    try:
+        with ThreadPoolExecutor(max_workers=reader_threads) as readers:
+            list(readers.map(read_skill, skill_dirs))
+    finally:
+        for _ in senders:
+            action_queue.put(done)
+        for sender in senders:
+            sender.join()
+
+    print(f"  ✓ Indexed {stats['skills_indexed']} skill documents")
+    print(f"  ✓ Indexed {stats['files_indexed']} file documents")
+    if stats["errors"]:
+        print(f"  Warning: {stats['errors']} documents had errors")
 
     # Final refresh to make documents searchable
     print("Refreshing indices...")
@@ -408,20 +644,49 @@ def ingest_skills(
     es_client.indices.refresh(index=files_index_name)
 
     print(f"\n{'='*60}")
-    print(f"Ingestion complete: {ingested} skills, {total_files} files, {errors} errors")
+    print(
+        f"Ingestion complete: {stats['skills_indexed']} skills, {stats['files_indexed']} files, "
+        f"{stats['errors'] + stats['skill_errors']} errors"
+    )
     print(f"{'='*60}")
 
+    return stats
+
 
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
         description="Ingest agent skills into Elasticsearch"
     )
+    parser.add_argument(
+        "skills_dir",
+        nargs="?",
+        default=None,
+        help="Directory containing skill folders (default: sample_skills)"
+    )
     parser.add_argument(
         "--recreate",
         action="store_true",
         help="Delete and recreate indices before ingesting (use when index settings change)"
     )
+    parser.add_argument(
+        "--reader-threads",
+        type=int,
+        default=8,
+        help="Number of parallel skill directory readers (default: 8)"
+    )
+    parser.add_argument(
+        "--sender-threads",
+        type=int,
+        default=4,
+        help="Number of concurrent bulk request senders (default: 4)"
+    )
+    parser.add_argument(
+        "--max-batch-bytes",
+        type=int,
+        default=10 * 1024 * 1024,
+        help="Maximum size of a single bulk request in bytes (default: 10 MiB)"
+    )
     return parser.parse_args()
 
 
@@ -440,7 +705,7 @@ def main():
 
     # Setup paths
     project_root = Path(__file__).parent.parent
-    skills_dir = project_root / "sample_skills"
+    skills_dir = Path(args.skills_dir) if args.skills_dir else project_root / "sample_skills"
     config_dir = project_root / "config"
 
     # Initialize Elasticsearch client
@@ -465,7 +730,15 @@ def main():
     ensure_files_index(es, "agent_skill_files", config_dir, recreate=args.recreate)
 
     # Ingest skills and files
-    ingest_skills(skills_dir, es, "agent_skills", "agent_skill_files")
+    ingest_skills(
+        skills_dir,
+        es,
+        "agent_skills",
+        "agent_skill_files",
+        max_batch_bytes=args.max_batch_bytes,
+        reader_threads=args.reader_threads,
+        sender_threads=args.sender_threads,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Batch Runner for Agent Skills
+Applies a skill's entry point to every record of a JSONL file and writes one
+JSONL result per input record, in order.
+
+Each input line is a JSON object of keyword arguments for the entry point.
+The skill is imported once per worker process, so its reference data is
+loaded once rather than on every record.
+
+Example:
+    python scripts/run_skill_batch.py validate-aml-transaction \\
+        --input transactions.jsonl --output alerts.jsonl --processes 8
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from skill_runtime.batch import (  # noqa: E402
+    DEFAULT_CHUNK_SIZE,
+    read_jsonl,
+    resolve_entry_point,
+    run_batch,
+    to_jsonl,
+)
+
+
+def resolve_skill_dir(skill: str, skills_dir: Path) -> Path:
+    """Accept either a skill folder name or a path to a skill directory."""
+    candidate = Path(skill)
+    if candidate.is_dir():
+        return candidate
+    return skills_dir / skill
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Run a skill's entry point over a JSONL file of inputs"
+    )
+    parser.add_argument(
+        "skill",
+        help="Skill folder name (e.g. validate-aml-transaction) or path to a skill directory"
+    )
+    parser.add_argument(
+        "--input",
+        default="-",
+        help="JSONL input file, one object of keyword arguments per line (default: stdin)"
+    )
+    parser.add_argument(
+        "--output",
+        default="-",
+        help="JSONL output file (default: stdout)"
+    )
+    parser.add_argument(
+        "--entry-point",
+        default=None,
+        help="Function to call, as 'function' or 'module:function' (default: detected from the skill)"
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Worker processes (default: CPU count; 1 runs in-process)"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Records sent to a worker at a time (default: {DEFAULT_CHUNK_SIZE})"
+    )
+    parser.add_argument(
+        "--skills-dir",
+        default=str(PROJECT_ROOT / "skills" / "production-skills"),
+        help="Directory containing skill folders (default: skills/production-skills)"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    skill_dir = resolve_skill_dir(args.skill, Path(args.skills_dir))
+
+    try:
+        module_path, function_name = resolve_entry_point(skill_dir, args.entry_point)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Running {module_path.name}:{function_name} for {skill_dir.name}...", file=sys.stderr)
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    records = 0
+    errors = 0
+    start = time.perf_counter()
+    try:
+        for result in run_batch(
+            skill_dir,
+            read_jsonl(source),
+            entry_point=f"{module_path.stem}:{function_name}",
+            processes=args.processes,
+            chunk_size=args.chunk_size,
+        ):
+            records += 1
+            if isinstance(result, dict) and "error" in result and "record" in result:
+                errors += 1
+            sink.write(to_jsonl(result))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    elapsed = time.perf_counter() - start
+    rate = records / elapsed if elapsed > 0 else 0.0
+    print(f"Processed {records} records ({errors} errors) in {elapsed:.1f}s, {rate:.0f} records/s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
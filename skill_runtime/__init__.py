@@ -0,0 +1,8 @@
+"""
+Shared runtime support for agent skills.
+
+Skills stay self-contained so they can be fetched from Elasticsearch and run
+on their own. When this package is importable (the project is installed or
+run from the repository root), skills pick up shared services from it, such
+as the process-wide reference-data cache in ``skill_runtime.refdata``.
+"""
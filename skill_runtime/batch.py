@@ -0,0 +1,270 @@
+"""
+Batch execution of a skill's entry point over many inputs.
+
+Skills expose a single-record entry point (``validate_aml_transaction``,
+``calculate_premium``, ...) that is normally called once per request. The
+batch runner imports the skill once per worker process, so its reference
+data is loaded once (see ``skill_runtime.refdata``), and then applies the
+entry point to a stream of keyword-argument records, fanned out to a process
+pool in chunks. Results come back in input order.
+
+Usage::
+
+    from skill_runtime.batch import run_batch
+
+    for result in run_batch(skill_dir, records, processes=4, chunk_size=500):
+        ...
+
+The entry point is the function the skill's ``__main__`` block demonstrates,
+unless one is named explicitly as ``function`` or ``module:function``.
+"""
+
+import ast
+import importlib.util
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Default number of records handed to a worker at a time
+DEFAULT_CHUNK_SIZE = 100
+
+# Per-process state set up by the pool initializer
+_worker_func: Optional[Callable[..., Any]] = None
+
+
+# Helpers a demo block calls that are never the record-level entry point
+_NON_ENTRY_PREFIXES = ('main', 'load_', 'parse_', 'print_', 'format_')
+
+
+def _called_functions(node: ast.AST, defined: Dict[str, ast.FunctionDef]) -> List[str]:
+    """Module-level functions called inside a node, in source order."""
+    calls = []
+    for child in ast.walk(node):
+        if (
+            isinstance(child, ast.Call)
+            and isinstance(child.func, ast.Name)
+            and child.func.id in defined
+            and child.func.id not in calls
+        ):
+            calls.append(child.func.id)
+    return calls
+
+
+def _main_block_calls(tree: ast.Module) -> List[str]:
+    """
+    Candidate entry points: functions called in the ``__main__`` block.
+
+    CLI-style skills call a ``main()`` wrapper there; in that case the
+    functions ``main()`` calls are used instead.
+    """
+    defined = {node.name: node for node in tree.body if isinstance(node, ast.FunctionDef)}
+    calls: List[str] = []
+    for node in tree.body:
+        test = getattr(node, 'test', None)
+        if (
+            isinstance(node, ast.If)
+            and isinstance(test, ast.Compare)
+            and isinstance(test.left, ast.Name)
+            and test.left.id == '__name__'
+        ):
+            calls.extend(name for name in _called_functions(node, defined) if name not in calls)
+
+    if 'main' in calls:
+        calls.extend(name for name in _called_functions(defined['main'], defined) if name not in calls)
+    return [name for name in calls if not name.startswith(_NON_ENTRY_PREFIXES)]
+
+
+def resolve_entry_point(skill_dir: Path, entry_point: Optional[str] = None) -> Tuple[Path, str]:
+    """
+    Find the module and function to run for a skill.
+
+    Args:
+        skill_dir: Path to skill directory
+        entry_point: Optional ``function`` or ``module:function`` override
+
+    Returns:
+        Tuple of (module path, function name)
+
+    Raises:
+        FileNotFoundError: If the skill directory or named module does not exist
+        ValueError: If no entry point can be determined
+    """
+    skill_dir = Path(skill_dir)
+    if not skill_dir.is_dir():
+        raise FileNotFoundError(f"Skill directory not found: {skill_dir}")
+
+    module_name, _, function_name = (entry_point or '').rpartition(':')
+    if module_name:
+        modules = [skill_dir / f"{module_name}.py"]
+        if not modules[0].exists():
+            raise FileNotFoundError(f"Module not found: {modules[0]}")
+    else:
+        modules = sorted(p for p in skill_dir.glob('*.py') if not p.name.startswith('test_'))
+
+    for module_path in modules:
+        tree = ast.parse(module_path.read_text(encoding='utf-8'))
+        if function_name:
+            names = {node.name for node in tree.body if isinstance(node, ast.FunctionDef)}
+            if function_name in names:
+                return module_path, function_name
+            continue
+        calls = _main_block_calls(tree)
+        if calls:
+            return module_path, calls[0]
+
+    if function_name:
+        raise ValueError(f"Entry point '{entry_point}' not found in {skill_dir.name}")
+    raise ValueError(
+        f"Cannot determine the entry point of {skill_dir.name}; pass one as 'module:function'"
+    )
+
+
+def load_entry_point(module_path: Path, function_name: str) -> Callable[..., Any]:
+    """
+    Import a skill module and return its entry point.
+
+    The skill directory is put on sys.path so modules that import siblings
+    keep working.
+
+    Args:
+        module_path: Path to the skill module
+        function_name: Name of the entry point function
+
+    Returns:
+        The entry point callable
+    """
+    module_path = Path(module_path).resolve()
+    skill_dir = str(module_path.parent)
+    if skill_dir not in sys.path:
+        sys.path.insert(0, skill_dir)
+
+    module_name = f"_batch_{module_path.parent.name.replace('-', '_')}_{module_path.stem}"
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, module_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[module_name] = module
+    return getattr(module, function_name)
+
+
+class InvalidRecord:
+    """Stands in for an input line that could not be parsed."""
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+def _apply(func: Callable[..., Any], position: int, record: Any) -> Dict[str, Any]:
+    """Run the entry point on one record, turning failures into error results."""
+    if isinstance(record, InvalidRecord):
+        return {"error": f"Invalid JSON: {record.message}", "error_type": "JSONDecodeError", "record": position}
+    if not isinstance(record, dict):
+        return {"error": "Input record must be a JSON object of keyword arguments",
+                "error_type": "TypeError", "record": position}
+    try:
+        return func(**record)
+    except Exception as e:
+        return {"error": str(e), "error_type": type(e).__name__, "record": position}
+
+
+def _init_worker(module_path: str, function_name: str) -> None:
+    """Pool initializer: import the skill once per worker process."""
+    global _worker_func
+    _worker_func = load_entry_point(Path(module_path), function_name)
+
+
+def _run_chunk(chunk: List[Tuple[int, Any]]) -> List[Dict[str, Any]]:
+    """Apply the worker's entry point to a chunk of (position, record) pairs."""
+    return [_apply(_worker_func, position, record) for position, record in chunk]
+
+
+def _chunks(records: Iterable[Tuple[int, Any]], chunk_size: int) -> Iterator[List[Tuple[int, Any]]]:
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(
+    skill_dir: Path,
+    records: Iterable[Any],
+    entry_point: Optional[str] = None,
+    processes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """
+    Apply a skill's entry point to every record, in input order.
+
+    Records are keyword-argument dictionaries. A record that raises yields
+    ``{"error": ..., "error_type": ..., "record": n}`` (n is the 1-based
+    position in the input) instead of stopping the batch. At most two chunks
+    per worker are in flight, so arbitrarily long input streams run in
+    bounded memory.
+
+    Args:
+        skill_dir: Path to skill directory
+        records: Iterable of keyword-argument dictionaries
+        entry_point: Optional ``function`` or ``module:function`` override
+        processes: Worker processes (default: CPU count); 0 or 1 runs in-process
+        chunk_size: Records sent to a worker at a time
+
+    Returns:
+        Iterator of results, one per input record
+    """
+    module_path, function_name = resolve_entry_point(skill_dir, entry_point)
+    numbered = enumerate(records, 1)
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if processes <= 1:
+        func = load_entry_point(module_path, function_name)
+        for position, record in numbered:
+            yield _apply(func, position, record)
+        return
+
+    # spawn keeps workers independent of the parent's threads (e.g. the API server)
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(str(module_path), function_name),
+    ) as pool:
+        pending = deque()
+        for chunk in _chunks(numbered, chunk_size):
+            pending.append(pool.submit(_run_chunk, chunk))
+            if len(pending) >= processes * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def read_jsonl(lines: Iterable[Union[str, bytes]]) -> Iterator[Any]:
+    """
+    Parse JSONL input into records.
+
+    Blank lines are skipped. A line that is not valid JSON becomes an
+    :class:`InvalidRecord`, so it still produces an (error) output line.
+    """
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield InvalidRecord(str(e))
+
+
+def to_jsonl(result: Any) -> str:
+    """Serialize one result as a JSONL line (non-JSON values are stringified)."""
+    return json.dumps(result, default=str) + '\n'
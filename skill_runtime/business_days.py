@@ -0,0 +1,237 @@
+"""
+Holiday-aware business-day calendars for date-driven skills.
+
+A calendar is compiled once from a weekend definition and a holiday list into
+two integer arrays over a range of years: the ordinals of every business day,
+and for each calendar day the number of business days before it. T+N
+arithmetic, business-day counts and date rolling are then array lookups
+instead of day-by-day loops, and a whole blotter of dates can be shifted in
+one call.
+
+Holiday tables belong to the skill that uses them (settlement markets, lease
+jurisdictions, filing authorities); this module only needs the dates::
+
+    from skill_runtime.business_days import BusinessCalendar, calendars_from_rows
+
+    calendars = calendars_from_rows(load_csv_as_list("market_holidays.csv"))
+    calendars["US"].add_business_days("2026-11-25", 1)    # date(2026, 11, 27)
+
+Dates outside the compiled range extend it automatically; years not covered
+by the holiday table only skip weekends.
+"""
+
+from array import array
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+DateLike = Union[date, datetime, str]
+
+WEEKEND = (5, 6)  # Saturday, Sunday
+
+ROLL_CONVENTIONS = ("following", "preceding", "modified_following", "modified_preceding")
+
+
+def to_date(value: DateLike) -> date:
+    """Convert a date, datetime or ISO string (YYYY-MM-DD...) to a date."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+class BusinessCalendar:
+    """
+    Business-day calendar compiled to ordinal arrays.
+
+    Args:
+        holidays: Non-business dates (weekend dates are allowed and ignored)
+        weekend: Weekday numbers that are never business days (Monday = 0)
+        first_year: First year to compile (default: earliest holiday year - 1)
+        last_year: Last year to compile (default: latest holiday year + 1)
+    """
+
+    def __init__(
+        self,
+        holidays: Iterable[DateLike] = (),
+        weekend: Sequence[int] = WEEKEND,
+        first_year: Optional[int] = None,
+        last_year: Optional[int] = None
+    ):
+        self.holidays = frozenset(to_date(d) for d in holidays)
+        self.weekend = frozenset(weekend)
+        if len(self.weekend) >= 7:
+            raise ValueError("weekend must leave at least one business day")
+
+        years = [d.year for d in self.holidays] or [date.today().year]
+        self._compile(
+            first_year if first_year is not None else min(years) - 1,
+            last_year if last_year is not None else max(years) + 1,
+        )
+
+    def _compile(self, first_year: int, last_year: int) -> None:
+        """Build the ordinal arrays for [first_year, last_year]."""
+        holiday_ordinals = {d.toordinal() for d in self.holidays}
+        start = date(first_year, 1, 1).toordinal()
+        end = date(last_year, 12, 31).toordinal()
+
+        business = array('l')
+        before = array('l', [0])  # before[i]: business days earlier than start + i
+        weekday = date.fromordinal(start).weekday()
+        for ordinal in range(start, end + 1):
+            if weekday not in self.weekend and ordinal not in holiday_ordinals:
+                business.append(ordinal)
+            before.append(len(business))
+            weekday = (weekday + 1) % 7
+
+        self.first_year, self.last_year = first_year, last_year
+        self._start, self._end = start, end
+        self._business = business
+        self._before = before
+
+    def _position(self, day: date, margin_days: int = 0) -> int:
+        """Offset of a date in the compiled range, extending the range if needed."""
+        ordinal = day.toordinal()
+        # Room for margin_days business days on both sides, even if only one
+        # day a week were a business day, plus two weeks of slack
+        span = margin_days * 7 + 14
+        if ordinal - span < self._start or ordinal + span > self._end:
+            first = min(self.first_year, date.fromordinal(max(ordinal - span, 1)).year)
+            last = max(self.last_year, date.fromordinal(ordinal + span).year)
+            self._compile(first, last)
+        return ordinal - self._start
+
+    def is_business_day(self, value: DateLike) -> bool:
+        """Whether a date is a business day."""
+        day = to_date(value)
+        position = self._position(day)
+        return self._before[position + 1] > self._before[position]
+
+    def add_business_days(self, value: DateLike, days: int) -> date:
+        """
+        Shift a date by a number of business days (T+N).
+
+        Counting starts after (or, for negative days, before) the given date,
+        so T+1 from a Friday or a holiday is the next business day. T+0
+        returns the date unchanged.
+
+        Args:
+            value: Start date
+            days: Business days to add; negative moves backwards
+
+        Returns:
+            Shifted date
+        """
+        day = to_date(value)
+        if days == 0:
+            return day
+        position = self._position(day, abs(days))
+        if days > 0:
+            index = self._before[position + 1] + days - 1
+        else:
+            index = self._before[position] + days
+        return date.fromordinal(self._business[index])
+
+    def add_business_days_batch(
+        self,
+        values: Sequence[DateLike],
+        days: Union[int, Sequence[int]]
+    ) -> List[date]:
+        """
+        Shift many dates by business days in one call.
+
+        Args:
+            values: Start dates
+            days: Business days to add, one for all dates or one per date
+
+        Returns:
+            Shifted dates, in input order
+        """
+        if isinstance(days, int):
+            days = [days] * len(values)
+        if len(days) != len(values):
+            raise ValueError("values and days must have the same length")
+
+        parsed = [to_date(v) for v in values]
+        if not parsed:
+            return []
+        # Size the range once for the whole batch, then index directly
+        widest = max(abs(n) for n in days)
+        self._position(min(parsed), widest)
+        self._position(max(parsed), widest)
+
+        start, before, business = self._start, self._before, self._business
+        shifted = []
+        for day, n in zip(parsed, days):
+            position = day.toordinal() - start
+            if n == 0:
+                shifted.append(day)
+            elif n > 0:
+                shifted.append(date.fromordinal(business[before[position + 1] + n - 1]))
+            else:
+                shifted.append(date.fromordinal(business[before[position] + n]))
+        return shifted
+
+    def business_days_between(self, start: DateLike, end: DateLike) -> int:
+        """
+        Business days after start up to and including end.
+
+        Negative when end is before start, so
+        add_business_days(start, business_days_between(start, end)) lands on
+        end whenever end is a business day.
+        """
+        first, last = to_date(start), to_date(end)
+        # Size the range for both dates before taking offsets from it
+        self._position(first)
+        self._position(last)
+        first_position = first.toordinal() - self._start
+        last_position = last.toordinal() - self._start
+        return self._before[last_position + 1] - self._before[first_position + 1]
+
+    def roll(self, value: DateLike, convention: str = "following") -> date:
+        """
+        Move a non-business date to a business day.
+
+        Args:
+            value: Date to roll
+            convention: following, preceding, modified_following (following
+                unless that changes month) or modified_preceding
+
+        Returns:
+            The date itself if it is a business day, otherwise the rolled date
+        """
+        if convention not in ROLL_CONVENTIONS:
+            raise ValueError(f"Unknown roll convention '{convention}'")
+        day = to_date(value)
+        if self.is_business_day(day):
+            return day
+
+        forward = convention in ("following", "modified_following")
+        rolled = self.add_business_days(day, 1 if forward else -1)
+        if convention.startswith("modified") and rolled.month != day.month:
+            rolled = self.add_business_days(day, -1 if forward else 1)
+        return rolled
+
+
+def calendars_from_rows(
+    rows: Iterable[Dict],
+    market_column: str = "market",
+    date_column: str = "date",
+    weekend: Sequence[int] = WEEKEND
+) -> Dict[str, BusinessCalendar]:
+    """
+    Compile one calendar per market from holiday table rows.
+
+    Args:
+        rows: Holiday rows, e.g. from a skill's load_csv_as_list
+        market_column: Column naming the market or jurisdiction
+        date_column: Column holding the holiday date
+        weekend: Weekday numbers that are never business days
+
+    Returns:
+        Market -> compiled calendar
+    """
+    holidays: Dict[str, List[DateLike]] = {}
+    for row in rows:
+        holidays.setdefault(str(row[market_column]), []).append(row[date_column])
+    return {market: BusinessCalendar(dates, weekend) for market, dates in holidays.items()}
@@ -0,0 +1,301 @@
+"""
+Shared cash-flow math for ROI-style skills.
+
+NPV, IRR and XIRR with a guarded solver: the rate is first bracketed by a
+sign change of NPV, then refined with Newton steps that fall back to
+bisection whenever a step would leave the bracket or stops converging.
+Unlike a bare Newton-Raphson loop this cannot diverge or stall, and it
+returns None when the cash flows have no IRR at all.
+
+NPV and its derivative are evaluated together with Horner's rule in the
+discount factor v = 1 / (1 + r), so each evaluation is a single pass with no
+per-term exponentiation.
+
+Usage inside a skill module::
+
+    try:
+        from skill_runtime.cashflow import irr, npv
+    except ImportError:  # standalone copy without the shared runtime
+        ...  # local fallback
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+DateLike = Union[date, datetime, str]
+
+# Rates probed for a sign change of NPV when bracketing a root
+BRACKET_RATES = (
+    -0.99, -0.95, -0.9, -0.75, -0.5, -0.3, -0.2, -0.1, -0.05, 0.0, 0.02, 0.05,
+    0.1, 0.15, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0, 100.0,
+)
+
+
+def npv(rate: float, cash_flows: Sequence[float]) -> float:
+    """
+    Net present value of periodic cash flows (the first flow is at t=0).
+
+    Args:
+        rate: Discount rate per period
+        cash_flows: Cash flows for periods 0, 1, 2, ...
+
+    Returns:
+        Net present value
+    """
+    v = 1.0 / (1.0 + rate)
+    total = 0.0
+    for cf in reversed(cash_flows):
+        total = total * v + cf
+    return total
+
+
+def npv_with_derivative(rate: float, cash_flows: Sequence[float]) -> Tuple[float, float]:
+    """
+    NPV and dNPV/drate of periodic cash flows in one Horner pass.
+
+    Returns:
+        Tuple of (npv, derivative)
+    """
+    v = 1.0 / (1.0 + rate)
+    value = 0.0
+    dvalue = 0.0
+    for cf in reversed(cash_flows):
+        dvalue = dvalue * v + value
+        value = value * v + cf
+    # d/dr of sum(cf_t v^t) = dP/dv * dv/dr, with dv/dr = -v^2
+    return value, -dvalue * v * v
+
+
+def _find_bracket(
+    func: Callable[[float], Tuple[float, float]],
+    guess: float
+) -> Optional[Tuple[float, float, float, float]]:
+    """Probe rates where NPV is zero or changes sign, choosing the one nearest the guess."""
+    probes = sorted(set(BRACKET_RATES) | {guess})
+    values = []
+    for rate in probes:
+        try:
+            values.append(func(rate)[0])
+        except (OverflowError, ZeroDivisionError):
+            values.append(math.nan)
+
+    def distance(rate: float) -> float:
+        # Measured on discount factors, so -95% is not "closer" to 10% than 200%
+        return abs(1.0 / (1.0 + rate) - 1.0 / (1.0 + guess))
+
+    candidates = []
+    for i, rate in enumerate(probes):
+        if values[i] == 0:
+            candidates.append((distance(rate), rate, rate, 0.0, 0.0))
+    for i in range(len(probes) - 1):
+        lo, hi = probes[i], probes[i + 1]
+        f_lo, f_hi = values[i], values[i + 1]
+        if math.isnan(f_lo) or math.isnan(f_hi):
+            continue
+        if f_lo * f_hi < 0:
+            gap = 0.0 if lo <= guess <= hi else min(distance(lo), distance(hi))
+            candidates.append((gap, lo, hi, f_lo, f_hi))
+    if not candidates:
+        return None
+    _, lo, hi, f_lo, f_hi = min(candidates)
+    return lo, hi, f_lo, f_hi
+
+
+def solve_rate(
+    func: Callable[[float], Tuple[float, float]],
+    guess: float = 0.1,
+    tolerance: float = 1e-10,
+    max_iterations: int = 100
+) -> Optional[float]:
+    """
+    Find a root of an NPV-like function with a bracketed, guarded Newton method.
+
+    Args:
+        func: Returns (value, derivative) at a rate
+        guess: Starting rate; with several roots the one nearest it is returned
+        tolerance: Convergence tolerance on the rate
+        max_iterations: Iteration cap (bisection guarantees progress)
+
+    Returns:
+        Rate where func is zero, or None if there is no sign change to bracket
+    """
+    bracket = _find_bracket(func, guess)
+    if bracket is None:
+        return None
+    lo, hi, f_lo, f_hi = bracket
+    if lo == hi:
+        return lo
+
+    # Orient so that func(lo) < 0 < func(hi)
+    if f_lo > 0:
+        lo, hi = hi, lo
+
+    rate = guess if min(lo, hi) < guess < max(lo, hi) else 0.5 * (lo + hi)
+    previous_step = abs(hi - lo)
+    step = previous_step
+    value, derivative = func(rate)
+
+    for _ in range(max_iterations):
+        newton_leaves_bracket = (
+            derivative == 0
+            or ((rate - hi) * derivative - value) * ((rate - lo) * derivative - value) > 0
+        )
+        if newton_leaves_bracket or abs(2 * value) > abs(previous_step * derivative):
+            # Bisect when Newton would jump out of the bracket or is converging slowly
+            previous_step = step
+            step = 0.5 * (hi - lo)
+            rate = lo + step
+        else:
+            previous_step = step
+            step = value / derivative
+            rate -= step
+
+        if abs(step) < tolerance:
+            return rate
+
+        value, derivative = func(rate)
+        if value < 0:
+            lo = rate
+        else:
+            hi = rate
+
+    return rate
+
+
+def irr(
+    cash_flows: Sequence[float],
+    guess: float = 0.1,
+    tolerance: float = 1e-10,
+    max_iterations: int = 100
+) -> Optional[float]:
+    """
+    Internal rate of return of periodic cash flows.
+
+    Args:
+        cash_flows: Cash flows for periods 0, 1, 2, ...
+        guess: Starting rate; with several IRRs the one nearest it is returned
+        tolerance: Convergence tolerance on the rate
+        max_iterations: Iteration cap
+
+    Returns:
+        IRR per period, or None if the flows never change sign (no IRR)
+    """
+    if len(cash_flows) < 2:
+        return None
+    if not (any(cf > 0 for cf in cash_flows) and any(cf < 0 for cf in cash_flows)):
+        return None
+    flows = list(cash_flows)
+    return solve_rate(lambda r: npv_with_derivative(r, flows), guess, tolerance, max_iterations)
+
+
+def _year_fractions(dates: Sequence[DateLike]) -> List[float]:
+    """Actual/365 year fractions of each date from the first one."""
+    parsed = [
+        date.fromisoformat(d[:10]) if isinstance(d, str)
+        else d.date() if isinstance(d, datetime)
+        else d
+        for d in dates
+    ]
+    start = parsed[0]
+    return [(d - start).days / 365.0 for d in parsed]
+
+
+def xnpv(rate: float, cash_flows: Sequence[float], dates: Sequence[DateLike]) -> float:
+    """
+    Net present value of dated cash flows (Actual/365 from the first date).
+
+    Args:
+        rate: Annual discount rate
+        cash_flows: Cash flow amounts
+        dates: Dates of the cash flows (date, datetime or ISO string)
+
+    Returns:
+        Net present value at the first date
+    """
+    base = 1.0 + rate
+    return sum(cf / base ** t for cf, t in zip(cash_flows, _year_fractions(dates)))
+
+
+def xirr(
+    cash_flows: Sequence[float],
+    dates: Sequence[DateLike],
+    guess: float = 0.1,
+    tolerance: float = 1e-10,
+    max_iterations: int = 100
+) -> Optional[float]:
+    """
+    Annualized internal rate of return of dated cash flows.
+
+    Args:
+        cash_flows: Cash flow amounts
+        dates: Dates of the cash flows (date, datetime or ISO string)
+        guess: Starting rate
+        tolerance: Convergence tolerance on the rate
+        max_iterations: Iteration cap
+
+    Returns:
+        Annual IRR, or None if the flows never change sign
+
+    Raises:
+        ValueError: If cash_flows and dates differ in length
+    """
+    if len(cash_flows) != len(dates):
+        raise ValueError("cash_flows and dates must have the same length")
+    if len(cash_flows) < 2:
+        return None
+    if not (any(cf > 0 for cf in cash_flows) and any(cf < 0 for cf in cash_flows)):
+        return None
+
+    flows = list(cash_flows)
+    years = _year_fractions(dates)
+
+    def value_and_derivative(rate: float) -> Tuple[float, float]:
+        base = 1.0 + rate
+        value = 0.0
+        derivative = 0.0
+        for cf, t in zip(flows, years):
+            discounted = cf * base ** -t
+            value += discounted
+            derivative -= t * discounted / base
+        return value, derivative
+
+    return solve_rate(value_and_derivative, guess, tolerance, max_iterations)
+
+
+def _irr_chunk(args: Tuple[List[Sequence[float]], float]) -> List[Optional[float]]:
+    chunk, guess = args
+    return [irr(flows, guess) for flows in chunk]
+
+
+def irr_batch(
+    cash_flow_sets: Sequence[Sequence[float]],
+    guess: float = 0.1,
+    processes: int = 1,
+    chunk_size: int = 1000
+) -> List[Optional[float]]:
+    """
+    Solve IRR for many cash-flow vectors, in input order.
+
+    Args:
+        cash_flow_sets: One cash-flow vector per project, lease or scenario
+        guess: Starting rate for every solve
+        processes: Worker processes; 1 solves in-process
+        chunk_size: Vectors sent to a worker at a time
+
+    Returns:
+        IRR (or None) for each vector
+    """
+    if processes <= 1 or len(cash_flow_sets) <= chunk_size:
+        return [irr(flows, guess) for flows in cash_flow_sets]
+
+    chunks = [
+        (list(cash_flow_sets[i:i + chunk_size]), guess)
+        for i in range(0, len(cash_flow_sets), chunk_size)
+    ]
+    results: List[Optional[float]] = []
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for chunk_result in pool.map(_irr_chunk, chunks):
+            results.extend(chunk_result)
+    return results
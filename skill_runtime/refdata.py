@@ -0,0 +1,259 @@
+"""
+Process-wide cache for skill reference data.
+
+Every skill ships its own CSV loaders (``load_csv_as_dict``,
+``load_csv_as_list``, ``load_parameters``, ``load_key_value_csv`` and the
+like) so that it keeps working when fetched from Elasticsearch on its own.
+Decorating those loaders with :func:`cached_reference_loader` makes each CSV
+parse once per process: the typed result is cached keyed by the loader, its
+arguments and the source file's mtime/size, and is reloaded automatically
+when the file changes on disk. If the skill has a compiled snapshot (see
+``skill_runtime.snapshot``), first loads are served from it instead of the CSV.
+
+Freshness is judged from mtime and size only; file contents are never read
+on a cache hit. An edit that keeps the file size and lands within the
+filesystem's mtime granularity of the previous write (a same-length value
+rewritten by a script in the same second on a coarse-timestamp filesystem)
+is therefore not detected, for this cache or for snapshot entries. Call
+:func:`clear_cache` or recompile the snapshot after such edits.
+
+Usage inside a skill module::
+
+    try:
+        from skill_runtime.refdata import cached_reference_loader
+    except ImportError:  # standalone copy without the shared runtime
+        def cached_reference_loader(func):
+            return func
+
+    @cached_reference_loader
+    def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
+        ...
+
+Objects compiled from that data (a search index, a route graph, business-day
+calendars) are cached the same way with :func:`cached_reference_object`.
+"""
+
+import contextlib
+import functools
+import inspect
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from skill_runtime.snapshot import MISSING, open_snapshot
+
+# File types treated as reference data when a loader takes no filename
+REFERENCE_SUFFIXES = ('.csv', '.json')
+
+Fingerprint = Tuple[Tuple[str, Optional[int], Optional[int]], ...]
+
+_lock = threading.Lock()
+_cache: Dict[Hashable, Tuple[Fingerprint, Any]] = {}
+_objects: Dict[Hashable, Tuple[Fingerprint, Any]] = {}
+_stats = {"hits": 0, "misses": 0, "reloads": 0, "snapshot_loads": 0}
+_recording: Optional[List[Tuple[Path, Hashable, Fingerprint, Any]]] = None
+
+
+def _watched_paths(skill_dir: Path, arguments: Dict[str, Any]) -> List[Path]:
+    """
+    Return the files whose changes invalidate a cached loader result.
+
+    Loaders that take a ``filename`` argument depend on that file only. Loaders
+    without one (``load_reference_data()``, ``load_decline_models()``, ...)
+    read fixed files, so every reference file in the skill directory is watched.
+    """
+    filename = arguments.get('filename')
+    if filename is not None:
+        return [skill_dir / filename]
+
+    try:
+        with os.scandir(skill_dir) as entries:
+            names = sorted(
+                entry.name for entry in entries
+                if entry.is_file() and entry.name.endswith(REFERENCE_SUFFIXES)
+            )
+    except OSError:
+        return []
+    return [skill_dir / name for name in names]
+
+
+def _fingerprint(paths: List[Path]) -> Fingerprint:
+    """
+    Build an mtime/size fingerprint for the given files (missing files allowed).
+
+    Files are identified by name only, so fingerprints stored in a snapshot
+    stay valid if the skill directory is moved as a whole.
+    """
+    result = []
+    for path in paths:
+        try:
+            stat = path.stat()
+            result.append((path.name, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            result.append((path.name, None, None))
+    return tuple(result)
+
+
+def _fresh_copy(value: Any) -> Any:
+    """
+    Copy the container structure of a cached value.
+
+    Skills treat loaded reference data as their own and occasionally mutate it
+    (``row.pop(...)``, ``config.update(...)``). Copying dicts and lists keeps the
+    cached value pristine at a fraction of the cost of re-parsing the CSV.
+    """
+    if isinstance(value, dict):
+        return {k: _fresh_copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fresh_copy(v) for v in value]
+    return value
+
+
+def cached_reference_loader(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Cache a skill's reference-data loader for the lifetime of the process.
+
+    Relative filenames are resolved against the directory of the module that
+    defines ``func``, matching the ``Path(__file__).parent / filename``
+    convention used by all skills.
+
+    Args:
+        func: Loader function defined at module level in a skill
+
+    Returns:
+        Wrapped loader returning a fresh copy of the cached result
+    """
+    signature = inspect.signature(func)
+    skill_dir = Path(inspect.getfile(func)).resolve().parent
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        try:
+            call_key = (func.__qualname__, tuple(sorted(bound.arguments.items())))
+            key = (str(skill_dir), call_key)
+            hash(key)
+        except TypeError:
+            # Unhashable arguments: nothing sensible to cache on
+            return func(*args, **kwargs)
+
+        fingerprint = _fingerprint(_watched_paths(skill_dir, bound.arguments))
+
+        if _recording is not None:
+            value = func(*args, **kwargs)
+            _recording.append((skill_dir, call_key, fingerprint, value))
+            return _fresh_copy(value)
+
+        with _lock:
+            entry = _cache.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                _stats["hits"] += 1
+                return _fresh_copy(entry[1])
+
+        value = MISSING
+        snapshot = open_snapshot(skill_dir)
+        if snapshot is not None:
+            value = snapshot.get(call_key, fingerprint)
+        from_snapshot = value is not MISSING
+        if not from_snapshot:
+            value = func(*args, **kwargs)
+
+        with _lock:
+            if entry is None:
+                _stats["misses"] += 1
+            else:
+                _stats["reloads"] += 1
+            if from_snapshot:
+                _stats["snapshot_loads"] += 1
+            _cache[key] = (fingerprint, value)
+
+        return _fresh_copy(value)
+
+    wrapper.skill_dir = skill_dir
+    wrapper.is_cached_reference_loader = True
+    return wrapper
+
+
+def cached_reference_object(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Cache an object built from a skill's reference data.
+
+    For compiled structures such as a grade index, a port graph or
+    business-day calendars. The builder runs again only when a reference
+    file it may have read changes, judged by the same fingerprint as
+    :func:`cached_reference_loader`. The built object is shared by all
+    callers rather than copied, so callers must treat it as read-only.
+
+    Args:
+        func: Builder function defined at module level in a skill
+
+    Returns:
+        Wrapped builder returning the cached object
+    """
+    signature = inspect.signature(func)
+    skill_dir = Path(inspect.getfile(func)).resolve().parent
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        try:
+            key = (str(skill_dir), func.__qualname__, tuple(sorted(bound.arguments.items())))
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+
+        fingerprint = _fingerprint(_watched_paths(skill_dir, bound.arguments))
+        with _lock:
+            entry = _objects.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                return entry[1]
+
+        value = func(*args, **kwargs)
+        with _lock:
+            _objects[key] = (fingerprint, value)
+        return value
+
+    wrapper.skill_dir = skill_dir
+    return wrapper
+
+
+def cache_info() -> Dict[str, int]:
+    """
+    Return reference-data cache counters.
+
+    Returns:
+        Dictionary with hits, misses (first loads), reloads (loads caused by
+        a changed source file), snapshot_loads (misses and reloads served from
+        a compiled snapshot) and the number of cached entries
+    """
+    with _lock:
+        return {**_stats, "entries": len(_cache)}
+
+
+def clear_cache() -> None:
+    """Drop all cached reference data and objects and reset the counters."""
+    with _lock:
+        _cache.clear()
+        _objects.clear()
+        for counter in _stats:
+            _stats[counter] = 0
+
+
+@contextlib.contextmanager
+def record_loads() -> Iterator[List[Tuple[Path, Hashable, Fingerprint, Any]]]:
+    """
+    Capture every cached loader call made inside the block.
+
+    Used by the snapshot compiler: loaders always read their CSVs while
+    recording, and each call is appended as (skill_dir, key, fingerprint, value).
+    """
+    global _recording
+    records: List[Tuple[Path, Hashable, Fingerprint, Any]] = []
+    previous, _recording = _recording, records
+    try:
+        yield records
+    finally:
+        _recording = previous
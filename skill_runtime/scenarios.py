@@ -0,0 +1,288 @@
+"""
+Scenario engine for skill sensitivity analyses.
+
+Evaluates a skill's core formula (a plain function of keyword arguments)
+across a parameter grid or across Monte Carlo draws from parameter
+distributions, and summarizes the results as percentile bands and a tornado
+ranking of which inputs move the output most.
+
+Distributions are given as dictionaries; a bare number fixes a parameter::
+
+    {
+        "unit_price": {"dist": "normal", "mean": 50, "std": 2.5},
+        "fixed_costs": {"dist": "triangular", "low": 180000, "mode": 200000, "high": 240000},
+        "volume": {"dist": "uniform", "low": 12000, "high": 18000},
+        "tax_rate": 0.25,
+    }
+
+Supported: normal (mean, std), lognormal (mu, sigma), uniform (low, high),
+triangular (low, mode, high) and choice (values). Draws are taken column by
+column from a seeded generator, so a given seed reproduces a run exactly.
+
+Usage::
+
+    from skill_runtime.scenarios import monte_carlo, tornado
+
+    result = monte_carlo(profit, base, distributions, draws=100000, seed=7)
+    result["outputs"]["profit"]["p5"], result["tornado"]
+"""
+
+import math
+import random
+from itertools import product
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+DEFAULT_DRAWS = 100000
+
+# Input percentiles used as the low/high ends of a Monte Carlo tornado
+TORNADO_PERCENTILES = (10, 90)
+
+
+def _draw_column(rng: random.Random, spec: Any, draws: int) -> List[Any]:
+    """Draw one parameter's column of values."""
+    if not isinstance(spec, dict):
+        return [spec] * draws
+
+    dist = spec.get("dist", "normal")
+    if dist == "normal":
+        mean, std = spec["mean"], spec["std"]
+        return [rng.gauss(mean, std) for _ in range(draws)]
+    if dist == "lognormal":
+        mu, sigma = spec["mu"], spec["sigma"]
+        return [rng.lognormvariate(mu, sigma) for _ in range(draws)]
+    if dist == "uniform":
+        low, high = spec["low"], spec["high"]
+        return [rng.uniform(low, high) for _ in range(draws)]
+    if dist == "triangular":
+        low, mode, high = spec["low"], spec["mode"], spec["high"]
+        return [rng.triangular(low, high, mode) for _ in range(draws)]
+    if dist == "choice":
+        values = list(spec["values"])
+        return [rng.choice(values) for _ in range(draws)]
+    raise ValueError(f"Unknown distribution '{dist}'")
+
+
+def sample(
+    distributions: Dict[str, Any],
+    draws: int = DEFAULT_DRAWS,
+    seed: Optional[int] = None
+) -> Dict[str, List[Any]]:
+    """
+    Draw Monte Carlo samples, one column per parameter.
+
+    Args:
+        distributions: Parameter name -> distribution spec or fixed value
+        draws: Number of draws
+        seed: Random seed for reproducible runs
+
+    Returns:
+        Parameter name -> list of drawn values
+
+    Raises:
+        ValueError: If a distribution type is unknown
+    """
+    rng = random.Random(seed)
+    return {name: _draw_column(rng, spec, draws) for name, spec in sorted(distributions.items())}
+
+
+def grid(axes: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Cartesian product of parameter values, in axis order.
+
+    Args:
+        axes: Parameter name -> values to try
+
+    Returns:
+        One parameter dictionary per grid point
+    """
+    names = list(axes)
+    return [dict(zip(names, values)) for values in product(*(axes[name] for name in names))]
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Percentile of already-sorted values with linear interpolation."""
+    if not sorted_values:
+        return math.nan
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def percentile_bands(
+    values: Sequence[Optional[float]],
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES
+) -> Dict[str, Any]:
+    """
+    Summarize an output distribution.
+
+    None values (scenarios where the formula is undefined, such as a negative
+    contribution margin) are left out of the statistics and counted.
+
+    Args:
+        values: Output of each scenario
+        percentiles: Percentiles to report
+
+    Returns:
+        Dictionary with mean, std, min, max, p<N> bands and the counts
+    """
+    feasible = sorted(v for v in values if v is not None)
+    count = len(feasible)
+    bands: Dict[str, Any] = {
+        "count": count,
+        "undefined": len(values) - count,
+    }
+    if not count:
+        return bands
+
+    mean = math.fsum(feasible) / count
+    variance = math.fsum((v - mean) ** 2 for v in feasible) / (count - 1) if count > 1 else 0.0
+    bands.update({
+        "mean": mean,
+        "std": math.sqrt(variance),
+        "min": feasible[0],
+        "max": feasible[-1],
+    })
+    for pct in percentiles:
+        bands[f"p{pct:g}"] = percentile(feasible, pct)
+    return bands
+
+
+def _outputs(result: Any) -> Dict[str, Optional[float]]:
+    """Normalize a model result to a dictionary of named outputs."""
+    if isinstance(result, dict):
+        return result
+    return {"value": result}
+
+
+def evaluate_grid(
+    model: Callable[..., Any],
+    base: Dict[str, Any],
+    axes: Dict[str, Sequence[Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate a model at every grid point.
+
+    Args:
+        model: Function of keyword arguments returning a number or a dict of numbers
+        base: Base-case parameters; grid values override them
+        axes: Parameter name -> values to try
+
+    Returns:
+        One dictionary per grid point with its parameters and outputs
+    """
+    results = []
+    for point in grid(axes):
+        results.append({**point, **_outputs(model(**{**base, **point}))})
+    return results
+
+
+def tornado(
+    model: Callable[..., Any],
+    base: Dict[str, Any],
+    ranges: Dict[str, Tuple[Any, Any]],
+    output: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    One-at-a-time sensitivity ranking.
+
+    Each parameter is moved to its low and high value with every other
+    parameter at base, and parameters are ranked by the resulting swing.
+
+    Args:
+        model: Function of keyword arguments returning a number or a dict of numbers
+        base: Base-case parameters
+        ranges: Parameter name -> (low, high)
+        output: Output to rank on when the model returns a dict (default: first)
+
+    Returns:
+        Rows sorted by swing, largest first
+    """
+    base_outputs = _outputs(model(**base))
+    key = output or next(iter(base_outputs))
+    base_value = base_outputs[key]
+
+    rows = []
+    for name, (low, high) in ranges.items():
+        at_low = _outputs(model(**{**base, name: low}))[key]
+        at_high = _outputs(model(**{**base, name: high}))[key]
+        if at_low is None or at_high is None:
+            swing = None
+        else:
+            swing = abs(at_high - at_low)
+        rows.append({
+            "parameter": name,
+            "low": low,
+            "high": high,
+            "output_at_low": at_low,
+            "output_at_high": at_high,
+            "base_output": base_value,
+            "swing": swing,
+        })
+    # Undefined swings rank first: the formula breaks inside the range
+    rows.sort(key=lambda row: math.inf if row["swing"] is None else row["swing"], reverse=True)
+    for rank, row in enumerate(rows, 1):
+        row["rank"] = rank
+    return rows
+
+
+def monte_carlo(
+    model: Callable[..., Any],
+    base: Dict[str, Any],
+    distributions: Dict[str, Any],
+    draws: int = DEFAULT_DRAWS,
+    seed: Optional[int] = None,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    tornado_output: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Evaluate a model across Monte Carlo draws.
+
+    Args:
+        model: Function of keyword arguments returning a number or a dict of numbers
+        base: Base-case parameters; sampled parameters override them
+        distributions: Parameter name -> distribution spec or fixed value
+        draws: Number of draws
+        seed: Random seed for reproducible runs
+        percentiles: Percentiles to report for each output
+        tornado_output: Output to rank inputs on (default: first output)
+
+    Returns:
+        Dictionary with percentile bands per output and a tornado ranking of
+        the sampled inputs between their 10th and 90th percentiles
+    """
+    columns = sample(distributions, draws, seed)
+    names = list(columns)
+    fixed = {k: v for k, v in base.items() if k not in columns}
+
+    collected: Dict[str, List[Optional[float]]] = {}
+    for values in zip(*(columns[name] for name in names)):
+        for key, value in _outputs(model(**fixed, **dict(zip(names, values)))).items():
+            collected.setdefault(key, []).append(value)
+
+    low_pct, high_pct = TORNADO_PERCENTILES
+    ranges = {}
+    for name, spec in distributions.items():
+        if isinstance(spec, dict) and spec.get("dist") != "choice":
+            ordered = sorted(columns[name])
+            ranges[name] = (percentile(ordered, low_pct), percentile(ordered, high_pct))
+
+    return {
+        "draws": draws,
+        "seed": seed,
+        "outputs": {key: percentile_bands(values, percentiles) for key, values in collected.items()},
+        "tornado": tornado(model, base, ranges, tornado_output) if ranges else [],
+    }
+
+
+def round_floats(value: Any, digits: int = 2) -> Any:
+    """Round every float in a (nested) scenario result for reporting."""
+    if isinstance(value, float):
+        return round(value, digits)
+    if isinstance(value, dict):
+        return {k: round_floats(v, digits) for k, v in value.items()}
+    if isinstance(value, list):
+        return [round_floats(v, digits) for v in value]
+    return value
@@ -0,0 +1,170 @@
+"""
+Compiled reference-data snapshots for skills.
+
+``scripts/compile_skill_snapshots.py`` runs each skill's cached loaders (those
+wrapped by ``cached_reference_loader``) once, offline, and writes every typed loader result into a single
+``reference.snapshot`` file next to the skill's SKILL.md. At runtime
+``skill_runtime.refdata`` consults the snapshot before parsing CSVs, so a
+worker that imports many skills maps one file per skill instead of parsing
+every CSV.
+
+Snapshots follow the same rules as ``.pyc`` files: values are stored with
+``marshal``, the header records the Python/marshal version that wrote them,
+and each entry carries the mtime/size fingerprint of the CSVs it was built
+from. Any mismatch means the entry is ignored and the loader falls back to the
+CSV. As with the in-process cache, a same-size edit within the mtime
+granularity of the compile is not detected (see ``skill_runtime.refdata``).
+
+File layout::
+
+    MAGIC (8 bytes) | header length (uint32 LE) | marshal(header) | payload
+
+where the header maps each entry key to ``(offset, length, fingerprint)``
+within the payload.
+"""
+
+import marshal
+import mmap
+import os
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+SNAPSHOT_FILENAME = "reference.snapshot"
+MAGIC = b"SKSNAP\x00\x01"
+_PREFIX = struct.Struct("<8sI")
+
+# Sentinel for "entry not usable", since None is a legitimate loader result
+MISSING = object()
+
+_lock = threading.Lock()
+_open_snapshots: Dict[str, Tuple[Tuple[int, int], Optional["Snapshot"]]] = {}
+
+
+def _runtime_tag() -> Tuple[int, int, int]:
+    """Identify the interpreter that can read a marshal payload."""
+    return (sys.version_info[0], sys.version_info[1], marshal.version)
+
+
+class Snapshot:
+    """
+    Read-only, memory-mapped view of a compiled skill snapshot.
+
+    Entries are unmarshalled lazily, so opening a snapshot costs one mmap and
+    one small header read regardless of how many tables it contains.
+    """
+
+    def __init__(self, path: Path):
+        """Map the snapshot file and parse its header."""
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, header_len = _PREFIX.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a skill snapshot: {path}")
+
+        header_end = _PREFIX.size + header_len
+        header = marshal.loads(self._mm[_PREFIX.size:header_end])
+        if tuple(header["runtime"]) != _runtime_tag():
+            raise ValueError(f"Snapshot {path} was written by another Python version")
+
+        self._payload_start = header_end
+        self._entries = header["entries"]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, fingerprint: Tuple) -> Any:
+        """
+        Return the stored value for a loader call.
+
+        Args:
+            key: Loader key (qualified name and bound arguments)
+            fingerprint: Current mtime/size fingerprint of the source files
+
+        Returns:
+            The stored value, or MISSING if absent or stale
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        offset, length, stored_fingerprint = entry
+        if tuple(stored_fingerprint) != fingerprint:
+            return MISSING
+        start = self._payload_start + offset
+        return marshal.loads(memoryview(self._mm)[start:start + length])
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._mm.close()
+
+
+def open_snapshot(skill_dir: Path) -> Optional[Snapshot]:
+    """
+    Return the snapshot for a skill directory, or None if there is no usable one.
+
+    Opened snapshots are shared per process and re-opened when the file is
+    recompiled.
+    """
+    path = skill_dir / SNAPSHOT_FILENAME
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    with _lock:
+        cached = _open_snapshots.get(str(path))
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        try:
+            snapshot = Snapshot(path)
+        except (OSError, ValueError, EOFError, KeyError, TypeError, struct.error):
+            snapshot = None
+        _open_snapshots[str(path)] = (version, snapshot)
+        return snapshot
+
+
+def write_snapshot(
+    skill_dir: Path,
+    records: Iterable[Tuple[Hashable, Tuple, Any]]
+) -> Path:
+    """
+    Write a snapshot file for a skill.
+
+    Args:
+        skill_dir: Skill directory (the snapshot is written next to SKILL.md)
+        records: (key, fingerprint, value) triples captured from the skill's loaders
+
+    Returns:
+        Path to the written snapshot
+
+    Raises:
+        ValueError: If a loader result contains types marshal cannot store
+    """
+    entries = {}
+    chunks = []
+    offset = 0
+    for key, fingerprint, value in records:
+        if key in entries:
+            continue
+        blob = marshal.dumps(value)
+        entries[key] = (offset, len(blob), fingerprint)
+        chunks.append(blob)
+        offset += len(blob)
+
+    header = marshal.dumps({"runtime": _runtime_tag(), "entries": entries})
+
+    path = skill_dir / SNAPSHOT_FILENAME
+    tmp_path = path.with_suffix(".snapshot.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, len(header)))
+        f.write(header)
+        for blob in chunks:
+            f.write(blob)
+    os.replace(tmp_path, path)
+    return path
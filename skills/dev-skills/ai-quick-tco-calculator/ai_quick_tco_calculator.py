@@ -2,7 +2,14 @@
 import csv
 from pathlib import Path
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
+
+@cached_reference_loader
 def load_reference_data():
     """Load all constants from CSV - no hardcoded values."""
     csv_path = Path(__file__).parent / "reference_data.csv"
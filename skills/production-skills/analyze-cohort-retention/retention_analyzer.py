@@ -8,11 +8,18 @@ retention curves, benchmarking, and LTV calculations.
 import csv
 import ast
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Optional, Sequence, Tuple, Union
 from math import exp, log
+from datetime import date, datetime, timedelta
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
 
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -44,6 +51,7 @@ def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[st
     return result
 
 
+@cached_reference_loader
 def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     """Load a CSV file and return as list of dictionaries."""
     csv_path = Path(__file__).parent / filename
@@ -74,6 +82,7 @@ def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     return result
 
 
+@cached_reference_loader
 def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
     """Load parameters CSV as key-value dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -99,6 +108,7 @@ def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
                     result[key] = value
     return result
 
+@cached_reference_loader
 def load_key_value_csv(filename: str) -> Dict[str, Any]:
     """Load a key-value CSV file as a flat dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -143,37 +153,250 @@ def load_retention_models() -> Dict[str, Any]:
     }
 
 
-def calculate_retention_rates(
-    cohort_data: Dict[str, List[int]]
-) -> Dict[str, Any]:
-    """Calculate retention rates from cohort data."""
-    retention_rates = {}
-    periods = sorted(cohort_data.keys())
+# Days since signup at each retention checkpoint; a cohort's counts list holds
+# the initial users followed by the users retained at each checkpoint
+CHECKPOINT_DAYS = (1, 7, 14, 30, 60, 90)
+CHECKPOINT_INDEX = {days: i + 1 for i, days in enumerate(CHECKPOINT_DAYS)}
 
-    for period in periods:
-        users = cohort_data[period]
-        if len(users) < 2:
-            continue
+BENCHMARK_PERIODS = ("day_1", "day_7", "day_30", "day_90")
+
+COHORT_PERIODS = ("daily", "weekly", "monthly")
 
-        initial_users = users[0]
-        period_rates = []
 
-        for i, active_users in enumerate(users):
-            if i == 0:
+class CohortMatrix:
+    """
+    Cohorts x checkpoints retention matrix.
+
+    Rows are cohorts in key order; column i holds each cohort's retention at
+    the i-th checkpoint (CHECKPOINT_DAYS), and a row stops where the cohort's
+    counts stop. Rates are computed once when the matrix is built, rounded to
+    four decimals as reported in retention_by_cohort, and every summary
+    (checkpoint averages, benchmark deltas, per-cohort churn and LTV) reads
+    whole columns instead of walking per-cohort curves.
+
+    Usage::
+
+        matrix = CohortMatrix(cohort_data)
+        matrix.column_average(30)
+        matrix.compare_to_benchmarks(industry_benchmarks["saas_b2b"])
+    """
+
+    def __init__(self, cohort_data: Dict[str, List[int]]):
+        # Cohorts need an initial count and at least one checkpoint
+        self.cohorts = [key for key in sorted(cohort_data) if len(cohort_data[key]) >= 2]
+        self.counts = [list(cohort_data[key]) for key in self.cohorts]
+        self.initial = [row[0] for row in self.counts]
+        self.rates = [
+            [round(active / row[0], 4) if row[0] > 0 else 0 for active in row[1:]]
+            for row in self.counts
+        ]
+        width = max((len(row) for row in self.rates), default=0)
+        self.columns = [
+            [row[i] for row in self.rates if len(row) > i] for i in range(width)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.cohorts)
+
+    def column(self, period_days: int) -> List[float]:
+        """Retention of every cohort that has reached a checkpoint."""
+        index = CHECKPOINT_INDEX.get(period_days)
+        if index is None or index > len(self.columns):
+            return []
+        return self.columns[index - 1]
+
+    def column_average(self, period_days: int) -> Optional[float]:
+        """Unweighted mean retention across cohorts at a checkpoint."""
+        rates = self.column(period_days)
+        return sum(rates) / len(rates) if rates else None
+
+    def retention_rates(self) -> Dict[str, Any]:
+        """Per-cohort retention curves (the calculate_retention_rates shape)."""
+        return {
+            cohort: {
+                "initial_users": initial,
+                "retention_curve": [
+                    {"period": i, "active_users": active, "retention_rate": rate}
+                    for i, (active, rate) in enumerate(zip(counts[1:], rates), 1)
+                ]
+            }
+            for cohort, initial, counts, rates in zip(self.cohorts, self.initial, self.counts, self.rates)
+        }
+
+    def compare_to_benchmarks(self, industry_bench: Dict[str, float]) -> List[Dict[str, Any]]:
+        """Average retention against benchmark rates at each benchmark checkpoint."""
+        comparisons = []
+        for period in BENCHMARK_PERIODS:
+            benchmark = industry_bench.get(period, 0)
+            period_days = int(period.split("_")[1])
+            avg_actual = self.column_average(period_days)
+            if avg_actual is None:
                 continue
-            rate = active_users / initial_users if initial_users > 0 else 0
-            period_rates.append({
-                "period": i,
-                "active_users": active_users,
-                "retention_rate": round(rate, 4)
+            vs_benchmark = avg_actual - benchmark
+            comparisons.append({
+                "period": period,
+                "period_days": period_days,
+                "benchmark": benchmark,
+                "actual": round(avg_actual, 4),
+                "vs_benchmark": round(vs_benchmark, 4),
+                "vs_benchmark_pct": round((vs_benchmark / benchmark) * 100, 1) if benchmark > 0 else 0
+            })
+        return comparisons
+
+    def churn_by_cohort(self, period_days: int = 30) -> List[Optional[float]]:
+        """Per-cohort churn (1 - retention) at a checkpoint; None if not reached."""
+        index = CHECKPOINT_INDEX.get(period_days)
+        if index is None:
+            return [None] * len(self.rates)
+        return [1 - row[index - 1] if len(row) >= index else None for row in self.rates]
+
+    def ltv_by_cohort(
+        self,
+        arpu: float,
+        gross_margin: float,
+        discount_rate: float,
+        period_days: int = 30
+    ) -> List[Dict[str, Any]]:
+        """
+        Lifetime value per cohort from its own churn at a checkpoint.
+
+        Args:
+            arpu: Average revenue per user per period
+            gross_margin: Gross margin fraction
+            discount_rate: Discount rate per period
+            period_days: Checkpoint whose churn is used (default: day 30, monthly)
+
+        Returns:
+            One row per cohort; LTV fields are None where churn is undefined
+        """
+        margin_per_customer = arpu * gross_margin
+        rows = []
+        for cohort, churn in zip(self.cohorts, self.churn_by_cohort(period_days)):
+            valid = churn is not None and churn > 0
+            rows.append({
+                "cohort": cohort,
+                "churn_rate": round(churn, 4) if churn is not None else None,
+                "simple_ltv": round(margin_per_customer / churn, 2) if valid else None,
+                "discounted_ltv": round(margin_per_customer / (discount_rate + churn), 2) if valid else None,
+                "expected_lifetime_months": round(1 / churn, 1) if valid else None
             })
+        return rows
+
+
+def _parse_date(value: Union[str, date, datetime], cache: Dict[Any, date]) -> date:
+    """Parse an event date, memoizing repeated values."""
+    parsed = cache.get(value)
+    if parsed is None:
+        if isinstance(value, datetime):
+            parsed = value.date()
+        elif isinstance(value, date):
+            parsed = value
+        else:
+            parsed = date.fromisoformat(str(value)[:10])
+        cache[value] = parsed
+    return parsed
+
+
+def cohort_key(signup: date, cohort_period: str = "monthly") -> str:
+    """Cohort label for a signup date: YYYY-MM, week-start YYYY-MM-DD or YYYY-MM-DD."""
+    if cohort_period == "monthly":
+        return f"{signup.year:04d}-{signup.month:02d}"
+    if cohort_period == "weekly":
+        return (signup - timedelta(days=signup.weekday())).isoformat()
+    if cohort_period == "daily":
+        return signup.isoformat()
+    raise ValueError(f"Unknown cohort period '{cohort_period}'")
+
+
+def build_cohort_data(
+    events: Iterable[Union[Tuple, Dict]],
+    cohort_period: str = "monthly",
+    as_of: Optional[Union[str, date]] = None,
+    checkpoint_days: Sequence[int] = CHECKPOINT_DAYS
+) -> Dict[str, List[int]]:
+    """
+    Build cohort counts directly from raw activity events.
 
-        retention_rates[period] = {
-            "initial_users": initial_users,
-            "retention_curve": period_rates
-        }
+    A user is retained at a checkpoint if they were active on or after that
+    many days from signup, so each user only needs their latest activity and
+    the stream is read once. A cohort's counts stop at the last checkpoint
+    that every user in the cohort has reached by as_of, so young cohorts are
+    not reported as churned.
+
+    Args:
+        events: (user_id, signup_date, activity_date) tuples or dicts with
+            those keys; a user's earliest signup date is used
+        cohort_period: daily, weekly or monthly cohorts
+        as_of: Observation date (default: latest activity date in the events)
+        checkpoint_days: Days since signup at each checkpoint
+
+    Returns:
+        Cohort label -> [initial users, retained at each checkpoint], the
+        cohort_data input of analyze_cohort_retention
+    """
+    if cohort_period not in COHORT_PERIODS:
+        raise ValueError(f"Unknown cohort period '{cohort_period}'")
+
+    parsed: Dict[Any, date] = {}
+    signups: Dict[Any, date] = {}
+    latest: Dict[Any, date] = {}
+    for event in events:
+        if isinstance(event, dict):
+            user_id, signup_value, activity_value = (
+                event["user_id"], event["signup_date"], event.get("activity_date")
+            )
+        else:
+            user_id, signup_value, activity_value = event
+        signup = _parse_date(signup_value, parsed)
+        known = signups.get(user_id)
+        if known is None or signup < known:
+            signups[user_id] = signup
+        if activity_value is not None:
+            activity = _parse_date(activity_value, parsed)
+            prior = latest.get(user_id)
+            if prior is None or activity > prior:
+                latest[user_id] = activity
+
+    if as_of is not None:
+        observed = _parse_date(as_of, parsed)
+    else:
+        observed = max(latest.values(), default=max(signups.values(), default=date.today()))
+
+    # Cohort label -> [initial, users whose last activity is >= each checkpoint]
+    checkpoints = sorted(checkpoint_days)
+    counts: Dict[str, List[int]] = {}
+    newest_signup: Dict[str, date] = {}
+    for user_id, signup in signups.items():
+        key = cohort_key(signup, cohort_period)
+        row = counts.get(key)
+        if row is None:
+            row = counts[key] = [0] * (len(checkpoints) + 1)
+        row[0] += 1
+        newest = newest_signup.get(key)
+        if newest is None or signup > newest:
+            newest_signup[key] = signup
+        last_active = latest.get(user_id)
+        if last_active is None:
+            continue
+        days_active = (last_active - signup).days
+        for i, days in enumerate(checkpoints, 1):
+            if days_active < days:
+                break
+            row[i] += 1
+
+    cohort_data = {}
+    for key in sorted(counts):
+        age = (observed - newest_signup[key]).days
+        reached = sum(1 for days in checkpoints if days <= age)
+        cohort_data[key] = counts[key][:reached + 1]
+    return cohort_data
 
-    return retention_rates
+
+def calculate_retention_rates(
+    cohort_data: Dict[str, List[int]]
+) -> Dict[str, Any]:
+    """Calculate retention rates from cohort data."""
+    return CohortMatrix(cohort_data).retention_rates()
 
 
 def calculate_period_retention(
@@ -182,8 +405,7 @@ def calculate_period_retention(
 ) -> Optional[float]:
     """Get retention rate for specific period."""
     # Map period days to curve index
-    period_map = {1: 1, 7: 2, 14: 3, 30: 4, 60: 5, 90: 6}
-    index = period_map.get(period_days)
+    index = CHECKPOINT_INDEX.get(period_days)
 
     if index is None or index > len(retention_curve):
         return None
@@ -192,40 +414,41 @@ def calculate_period_retention(
 
 
 def compare_to_benchmarks(
-    retention_rates: Dict,
+    retention_rates: Union[Dict, CohortMatrix],
     industry: str,
     benchmarks: Dict
 ) -> Dict[str, Any]:
-    """Compare retention to industry benchmarks."""
+    """Compare retention to industry benchmarks (per-cohort rates or a CohortMatrix)."""
     industry_bench = benchmarks.get(industry, {})
 
-    comparisons = []
-    periods = ["day_1", "day_7", "day_30", "day_90"]
-
-    for period in periods:
-        benchmark = industry_bench.get(period, 0)
-        period_days = int(period.split("_")[1])
-
-        # Calculate average actual retention across cohorts
-        actual_rates = []
-        for cohort_data in retention_rates.values():
-            curve = cohort_data.get("retention_curve", [])
-            rate = calculate_period_retention(curve, period_days)
-            if rate is not None:
-                actual_rates.append(rate)
-
-        if actual_rates:
-            avg_actual = sum(actual_rates) / len(actual_rates)
-            vs_benchmark = avg_actual - benchmark
-
-            comparisons.append({
-                "period": period,
-                "period_days": period_days,
-                "benchmark": benchmark,
-                "actual": round(avg_actual, 4),
-                "vs_benchmark": round(vs_benchmark, 4),
-                "vs_benchmark_pct": round((vs_benchmark / benchmark) * 100, 1) if benchmark > 0 else 0
-            })
+    if isinstance(retention_rates, CohortMatrix):
+        comparisons = retention_rates.compare_to_benchmarks(industry_bench)
+    else:
+        comparisons = []
+        for period in BENCHMARK_PERIODS:
+            benchmark = industry_bench.get(period, 0)
+            period_days = int(period.split("_")[1])
+
+            # Calculate average actual retention across cohorts
+            actual_rates = []
+            for cohort_data in retention_rates.values():
+                curve = cohort_data.get("retention_curve", [])
+                rate = calculate_period_retention(curve, period_days)
+                if rate is not None:
+                    actual_rates.append(rate)
+
+            if actual_rates:
+                avg_actual = sum(actual_rates) / len(actual_rates)
+                vs_benchmark = avg_actual - benchmark
+
+                comparisons.append({
+                    "period": period,
+                    "period_days": period_days,
+                    "benchmark": benchmark,
+                    "actual": round(avg_actual, 4),
+                    "vs_benchmark": round(vs_benchmark, 4),
+                    "vs_benchmark_pct": round((vs_benchmark / benchmark) * 100, 1) if benchmark > 0 else 0
+                })
 
     return {
         "industry": industry,
@@ -451,11 +674,12 @@ def analyze_cohort_retention(
     alert_thresholds = config.get("alert_thresholds", {})
 
     # Calculate retention rates
-    retention_rates = calculate_retention_rates(cohort_data)
+    matrix = CohortMatrix(cohort_data)
+    retention_rates = matrix.retention_rates()
 
     # Compare to benchmarks
     benchmark_comparison = compare_to_benchmarks(
-        retention_rates,
+        matrix,
         industry,
         industry_benchmarks
     )
@@ -474,13 +698,9 @@ def analyze_cohort_retention(
 
     # Calculate churn and LTV
     # Use average day 30 retention as base
-    d30_rates = []
-    for cohort in retention_rates.values():
-        curve = cohort.get("retention_curve", [])
-        if len(curve) >= 4:
-            d30_rates.append(curve[3]["retention_rate"])
-
-    avg_d30_retention = sum(d30_rates) / len(d30_rates) if d30_rates else 0.5
+    avg_d30_retention = matrix.column_average(30)
+    if avg_d30_retention is None:
+        avg_d30_retention = 0.5
 
     churn_analysis = calculate_churn_rate(avg_d30_retention, "monthly")
 
@@ -527,6 +747,53 @@ def analyze_cohort_retention(
     }
 
 
+def analyze_cohort_events(
+    analysis_id: str,
+    product_name: str,
+    industry: str,
+    events: Iterable[Union[Tuple, Dict]],
+    arpu: float,
+    gross_margin: float,
+    segmentation_dimension: Optional[str],
+    segment_values: Optional[List[str]],
+    analysis_date: str,
+    cohort_period: str = "monthly"
+) -> Dict[str, Any]:
+    """
+    Analyze cohort retention from raw activity events.
+
+    Builds the cohort counts with build_cohort_data, observing cohorts as of
+    analysis_date, and runs analyze_cohort_retention on them.
+
+    Args:
+        analysis_id: Analysis identifier
+        product_name: Product name
+        industry: Industry for benchmarking
+        events: (user_id, signup_date, activity_date) tuples or dicts
+        arpu: Average revenue per user (monthly)
+        gross_margin: Gross margin percentage
+        segmentation_dimension: Optional segmentation dimension
+        segment_values: Optional segment values to analyze
+        analysis_date: Analysis date
+        cohort_period: daily, weekly or monthly cohorts
+
+    Returns:
+        Cohort retention analysis results
+    """
+    cohort_data = build_cohort_data(events, cohort_period, as_of=analysis_date)
+    return analyze_cohort_retention(
+        analysis_id=analysis_id,
+        product_name=product_name,
+        industry=industry,
+        cohort_data=cohort_data,
+        arpu=arpu,
+        gross_margin=gross_margin,
+        segmentation_dimension=segmentation_dimension,
+        segment_values=segment_values,
+        analysis_date=analysis_date
+    )
+
+
 if __name__ == "__main__":
     import json
     result = analyze_cohort_retention(
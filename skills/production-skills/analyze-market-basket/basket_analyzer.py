@@ -6,12 +6,22 @@ analysis for retail merchandising optimization.
 """
 
 import csv
+import json
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from collections import defaultdict
+from typing import Dict, List, Any, Optional, Callable, Iterable, Iterator, Set, Tuple, Union
+from collections import Counter, defaultdict
+from itertools import combinations, islice
 
+TransactionSource = Union[str, Path, Callable[[], Iterable[Dict]], Iterable[Dict]]
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
+
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -35,6 +45,7 @@ def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[st
     return result
 
 
+@cached_reference_loader
 def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     """Load a CSV file and return as list of dictionaries."""
     csv_path = Path(__file__).parent / filename
@@ -57,6 +68,7 @@ def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     return result
 
 
+@cached_reference_loader
 def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
     """Load parameters CSV as key-value dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -82,6 +94,7 @@ def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
                     result[key] = value
     return result
 
+@cached_reference_loader
 def load_key_value_csv(filename: str) -> Dict[str, Any]:
     """Load a key-value CSV file as a flat dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -143,37 +156,141 @@ def calculate_support(
     return count / len(transaction_data)
 
 
-def find_frequent_itemsets(
-    transaction_data: List[Dict],
-    min_support: float
-) -> Dict[frozenset, float]:
-    """Find frequent itemsets using Apriori-like approach."""
-    # Get all unique items
-    all_items = set()
-    for txn in transaction_data:
-        all_items.update(txn.get("items", []))
+def encode_baskets(transaction_data: Iterable[Dict]) -> List[Tuple[str, ...]]:
+    """Convert transactions to de-duplicated, sorted item tuples (built once per analysis)."""
+    return [tuple(sorted(set(txn.get("items", [])))) for txn in transaction_data]
 
-    frequent = {}
 
-    # Find frequent 1-itemsets
-    for item in all_items:
-        itemset = frozenset([item])
-        support = calculate_support(transaction_data, itemset)
-        if support >= min_support:
-            frequent[itemset] = support
+def count_itemsets(
+    baskets: Iterable[Tuple[str, ...]],
+    size: int,
+    allowed_items: Optional[Set[str]] = None,
+    candidates: Optional[Set[Tuple[str, ...]]] = None
+) -> Counter:
+    """
+    Count occurrences of size-k itemsets in a single pass over the baskets.
 
-    # Find frequent 2-itemsets
-    items_list = list(all_items)
-    for i in range(len(items_list)):
-        for j in range(i + 1, len(items_list)):
-            itemset = frozenset([items_list[i], items_list[j]])
-            support = calculate_support(transaction_data, itemset)
-            if support >= min_support:
-                frequent[itemset] = support
+    Items outside allowed_items cannot be part of a frequent itemset and are
+    dropped from each basket before enumerating its k-subsets. When candidates
+    is given only those itemsets are counted.
+    """
+    counts = Counter()
+    for basket in baskets:
+        if allowed_items is not None:
+            basket = [item for item in basket if item in allowed_items]
+        if len(basket) < size:
+            continue
+        if size == 1:
+            counts.update(basket)
+            continue
+        subsets = combinations(basket, size)
+        if candidates is not None:
+            subsets = (subset for subset in subsets if subset in candidates)
+        counts.update(subsets)
+    return counts
+
+
+def generate_candidates(
+    frequent_prev: Iterable[Tuple[str, ...]],
+    size: int
+) -> Set[Tuple[str, ...]]:
+    """Apriori candidate generation: join (k-1)-itemsets sharing a prefix, prune by subsets."""
+    prev = sorted(frequent_prev)
+    prev_set = set(prev)
+    candidates = set()
+
+    by_prefix = defaultdict(list)
+    for itemset in prev:
+        by_prefix[itemset[:-1]].append(itemset[-1])
+
+    for prefix, tails in by_prefix.items():
+        for i in range(len(tails)):
+            for j in range(i + 1, len(tails)):
+                candidate = prefix + (tails[i], tails[j])
+                if all(
+                    candidate[:k] + candidate[k + 1:] in prev_set
+                    for k in range(size - 2)
+                ):
+                    candidates.add(candidate)
+    return candidates
+
+
+def mine_itemset_counts(
+    baskets_pass: Callable[[], Iterable[Tuple[str, ...]]],
+    total_transactions: int,
+    min_support: float,
+    max_itemset_size: int,
+    item_counts: Optional[Counter] = None,
+    chunk_size: Optional[int] = None
+) -> Dict[Tuple[str, ...], int]:
+    """
+    Level-wise frequent itemset mining with one counting pass per itemset size.
+
+    Args:
+        baskets_pass: Callable returning a fresh iterable of encoded baskets
+        total_transactions: Number of transactions (support denominator)
+        min_support: Minimum support threshold
+        max_itemset_size: Largest itemset size to mine
+        item_counts: Pre-computed 1-itemset counts (skips the first pass)
+        chunk_size: If set, count each chunk of baskets separately and merge
+            the partial counts
+
+    Returns:
+        Dictionary of sorted item tuple -> transaction count
+    """
+    if total_transactions == 0 or max_itemset_size < 1:
+        return {}
+
+    def is_frequent(count: int) -> bool:
+        return count / total_transactions >= min_support
+
+    if item_counts is None:
+        item_counts = count_itemsets(baskets_pass(), 1)
+
+    frequent = {(item,): count for item, count in item_counts.items() if is_frequent(count)}
+    level = list(frequent)
+    size = 2
+    while level and size <= max_itemset_size:
+        allowed_items = {item for itemset in level for item in itemset}
+        # Every pair of frequent items is a candidate, so pairs skip the lookup
+        candidates = generate_candidates(level, size) if size > 2 else None
+        if candidates is not None and not candidates:
+            break
+
+        if chunk_size:
+            counts = merge_itemset_counts(
+                count_itemsets(chunk, size, allowed_items, candidates)
+                for chunk in iter_chunks(baskets_pass(), chunk_size)
+            )
+        else:
+            counts = count_itemsets(baskets_pass(), size, allowed_items, candidates)
+        level = [itemset for itemset, count in counts.items() if is_frequent(count)]
+        for itemset in level:
+            frequent[itemset] = counts[itemset]
+        size += 1
 
     return frequent
 
 
+def find_frequent_itemsets(
+    transaction_data: List[Dict],
+    min_support: float,
+    max_itemset_size: int = 2
+) -> Dict[frozenset, float]:
+    """Find frequent itemsets up to max_itemset_size using Apriori counting passes."""
+    baskets = encode_baskets(transaction_data)
+    counts = mine_itemset_counts(
+        lambda: baskets,
+        len(baskets),
+        min_support,
+        max_itemset_size
+    )
+    return {
+        frozenset(itemset): count / len(baskets)
+        for itemset, count in counts.items()
+    }
+
+
 def generate_association_rules(
     frequent_itemsets: Dict[frozenset, float],
     transaction_data: List[Dict],
@@ -186,7 +303,7 @@ def generate_association_rules(
         if len(itemset) < 2:
             continue
 
-        items = list(itemset)
+        items = sorted(itemset)
         for i in range(len(items)):
             antecedent = frozenset([items[i]])
             consequent = frozenset(items[:i] + items[i+1:])
@@ -196,16 +313,18 @@ def generate_association_rules(
                 confidence = support / antecedent_support
 
                 if confidence >= min_confidence:
-                    # Calculate lift
-                    consequent_support = calculate_support(
-                        transaction_data,
-                        consequent
-                    )
+                    # Calculate lift (subsets of a frequent itemset are frequent too)
+                    consequent_support = frequent_itemsets.get(consequent)
+                    if consequent_support is None:
+                        consequent_support = calculate_support(
+                            transaction_data,
+                            consequent
+                        )
                     lift = confidence / consequent_support if consequent_support > 0 else 0
 
                     rules.append({
                         "antecedent": list(antecedent),
-                        "consequent": list(consequent),
+                        "consequent": items[:i] + items[i+1:],
                         "support": round(support, 4),
                         "confidence": round(confidence, 4),
                         "lift": round(lift, 2)
@@ -216,28 +335,22 @@ def generate_association_rules(
     return rules
 
 
-def find_product_pairs(
-    transaction_data: List[Dict],
+def build_product_pairs(
+    pair_counts: Dict[Tuple[str, ...], int],
+    total_transactions: int,
     min_support: float
 ) -> List[Dict]:
-    """Find frequently bought together product pairs."""
-    pair_counts = defaultdict(int)
-    total_txns = len(transaction_data)
-
-    for txn in transaction_data:
-        items = list(set(txn.get("items", [])))
-        for i in range(len(items)):
-            for j in range(i + 1, len(items)):
-                pair = tuple(sorted([items[i], items[j]]))
-                pair_counts[pair] += 1
-
+    """Build the top product pairs from 2-itemset co-occurrence counts."""
     pairs = []
     for pair, count in pair_counts.items():
-        support = count / total_txns if total_txns > 0 else 0
+        if len(pair) != 2:
+            continue
+        support = count / total_transactions if total_transactions > 0 else 0
         if support >= min_support:
+            product_1, product_2 = sorted(pair)
             pairs.append({
-                "product_1": pair[0],
-                "product_2": pair[1],
+                "product_1": product_1,
+                "product_2": product_2,
                 "co_occurrence_count": count,
                 "support": round(support, 4)
             })
@@ -247,6 +360,103 @@ def find_product_pairs(
     return pairs[:20]  # Top 20 pairs
 
 
+def find_product_pairs(
+    transaction_data: List[Dict],
+    min_support: float,
+    frequent_itemsets: Optional[Dict[frozenset, float]] = None
+) -> List[Dict]:
+    """Find frequently bought together product pairs."""
+    total_txns = len(transaction_data)
+    if frequent_itemsets is None:
+        frequent_itemsets = find_frequent_itemsets(transaction_data, min_support, 2)
+
+    pair_counts = {
+        tuple(itemset): round(support * total_txns)
+        for itemset, support in frequent_itemsets.items()
+        if len(itemset) == 2
+    }
+    return build_product_pairs(pair_counts, total_txns, min_support)
+
+
+def read_transactions_jsonl(path: Union[str, Path]) -> Iterator[Dict]:
+    """Stream transactions from a JSONL file with one {"txn_id", "items"} object per line."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def read_transactions_csv(
+    path: Union[str, Path],
+    txn_column: str = 'txn_id',
+    item_column: str = 'item'
+) -> Iterator[Dict]:
+    """
+    Stream transactions from a long-format CSV of txn_id,item rows.
+
+    Rows of one transaction must be contiguous (as in POS line-item exports);
+    only the current transaction is held in memory.
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        current_id = None
+        items: List[str] = []
+        for row in csv.DictReader(f):
+            txn_id = row[txn_column]
+            if txn_id != current_id:
+                if current_id is not None:
+                    yield {"txn_id": current_id, "items": items}
+                current_id = txn_id
+                items = []
+            items.append(row[item_column])
+        if current_id is not None:
+            yield {"txn_id": current_id, "items": items}
+
+
+def open_transaction_source(source: TransactionSource) -> Callable[[], Iterable[Dict]]:
+    """
+    Return a callable producing a fresh pass over the transactions.
+
+    Args:
+        source: Path to a .jsonl/.csv file, a callable returning an iterable,
+                or a re-iterable collection such as a list
+
+    Raises:
+        ValueError: If source is a one-shot iterator (mining needs several passes)
+    """
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if path.suffix.lower() == '.csv':
+            return lambda: read_transactions_csv(path)
+        return lambda: read_transactions_jsonl(path)
+    if callable(source):
+        return source
+    if iter(source) is source:
+        raise ValueError(
+            "transaction_source must be re-iterable; pass a file path or a callable "
+            "returning a new iterator for each pass"
+        )
+    return lambda: source
+
+
+def iter_chunks(iterable: Iterable, chunk_size: int) -> Iterator[List]:
+    """Yield consecutive lists of at most chunk_size elements."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def merge_itemset_counts(partial_counts: Iterable[Counter]) -> Counter:
+    """Merge itemset counts computed independently over chunks of transactions."""
+    total = Counter()
+    for partial in partial_counts:
+        total.update(partial)
+    return total
+
+
 def generate_recommendations(
     association_rules: List[Dict],
     product_pairs: List[Dict],
@@ -308,7 +518,8 @@ def analyze_basket(
     product_catalog: Dict,
     time_period: Dict,
     min_support: float,
-    min_confidence: float
+    min_confidence: float,
+    max_itemset_size: int = 2
 ) -> Dict[str, Any]:
     """
     Analyze market basket data.
@@ -326,6 +537,7 @@ def analyze_basket(
         time_period: Analysis time range
         min_support: Minimum support threshold
         min_confidence: Minimum confidence threshold
+        max_itemset_size: Largest itemset size to mine (2 = pairs)
 
     Returns:
         Market basket analysis results
@@ -335,7 +547,8 @@ def analyze_basket(
     # Find frequent itemsets
     frequent_itemsets = find_frequent_itemsets(
         transaction_data,
-        min_support
+        min_support,
+        max_itemset_size
     )
 
     # Generate association rules
@@ -348,7 +561,8 @@ def analyze_basket(
     # Find product pairs
     product_pairs = find_product_pairs(
         transaction_data,
-        min_support
+        min_support,
+        frequent_itemsets if max_itemset_size >= 2 else None
     )
 
     # Generate recommendations
@@ -376,6 +590,108 @@ def analyze_basket(
     }
 
 
+def analyze_basket_stream(
+    analysis_id: str,
+    transaction_source: TransactionSource,
+    product_catalog: Dict,
+    time_period: Dict,
+    min_support: float,
+    min_confidence: float,
+    max_itemset_size: int = 2,
+    chunk_size: int = 50000
+) -> Dict[str, Any]:
+    """
+    Analyze market basket data without materializing the transactions.
+
+    The first pass counts items and basket statistics; each further pass
+    counts one itemset size (pairs need two passes in total). Every pass
+    processes chunk_size transactions at a time and merges the partial counts,
+    so memory is bounded by the chunk and the candidate itemsets rather than
+    by the number of transactions.
+
+    Args:
+        analysis_id: Analysis identifier
+        transaction_source: Path to a JSONL ({"txn_id", "items"}) or CSV
+            (txn_id,item) file, or a callable returning a fresh iterable
+        product_catalog: Product information
+        time_period: Analysis time range
+        min_support: Minimum support threshold
+        min_confidence: Minimum confidence threshold
+        max_itemset_size: Largest itemset size to mine (2 = pairs)
+        chunk_size: Transactions counted per chunk
+
+    Returns:
+        Market basket analysis results (same shape as analyze_basket)
+    """
+    config = load_basket_config()
+    transactions_pass = open_transaction_source(transaction_source)
+
+    def baskets_pass() -> Iterator[Tuple[str, ...]]:
+        return (tuple(sorted(set(txn.get("items", [])))) for txn in transactions_pass())
+
+    # Pass 1: item counts and basket statistics
+    total_transactions = 0
+    total_basket_items = 0
+    partial_item_counts = []
+    for chunk in iter_chunks(transactions_pass(), chunk_size):
+        total_transactions += len(chunk)
+        total_basket_items += sum(len(txn.get("items", [])) for txn in chunk)
+        partial_item_counts.append(
+            count_itemsets((tuple(set(txn.get("items", []))) for txn in chunk), 1)
+        )
+    item_counts = merge_itemset_counts(partial_item_counts)
+
+    # Passes 2..k: one chunked counting pass per itemset size
+    itemset_counts = mine_itemset_counts(
+        baskets_pass,
+        total_transactions,
+        min_support,
+        max_itemset_size,
+        item_counts=item_counts,
+        chunk_size=chunk_size
+    )
+    frequent_itemsets = {
+        frozenset(itemset): count / total_transactions
+        for itemset, count in itemset_counts.items()
+    }
+
+    association_rules = generate_association_rules(frequent_itemsets, [], min_confidence)
+
+    if max_itemset_size >= 2:
+        pair_counts = {k: v for k, v in itemset_counts.items() if len(k) == 2}
+    else:
+        pair_counts = mine_itemset_counts(
+            baskets_pass, total_transactions, min_support, 2,
+            item_counts=item_counts, chunk_size=chunk_size
+        )
+    product_pairs = build_product_pairs(pair_counts, total_transactions, min_support)
+
+    recommendations = generate_recommendations(
+        association_rules,
+        product_pairs,
+        config
+    )
+
+    avg_basket_size = total_basket_items / total_transactions if total_transactions else 0
+    summary_stats = {
+        "total_transactions": total_transactions,
+        "unique_items": len(item_counts),
+        "avg_basket_size": round(avg_basket_size, 2),
+        "rules_generated": len(association_rules),
+        "pairs_identified": len(product_pairs)
+    }
+
+    return {
+        "analysis_id": analysis_id,
+        "time_period": time_period,
+        "association_rules": association_rules[:20],
+        "product_pairs": product_pairs,
+        "recommendations": recommendations,
+        "segment_insights": {},
+        "summary_stats": summary_stats
+    }
+
+
 if __name__ == "__main__":
     import json
     result = analyze_basket(
@@ -10,8 +10,14 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 import math
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
 
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -35,6 +41,7 @@ def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[st
     return result
 
 
+@cached_reference_loader
 def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     """Load a CSV file and return as list of dictionaries."""
     csv_path = Path(__file__).parent / filename
@@ -57,6 +64,7 @@ def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     return result
 
 
+@cached_reference_loader
 def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
     """Load parameters CSV as key-value dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -82,6 +90,7 @@ def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
                     result[key] = value
     return result
 
+@cached_reference_loader
 def load_key_value_csv(filename: str) -> Dict[str, Any]:
     """Load a key-value CSV file as a flat dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -11,7 +11,14 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 import math
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
+
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str) -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -11,7 +11,14 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
+
+@cached_reference_loader
 def load_decline_models() -> Dict[str, Any]:
     """Load decline curve model parameters."""
     models_path = Path(__file__).parent / "decline_models.csv"
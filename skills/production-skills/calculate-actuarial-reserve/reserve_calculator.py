@@ -6,11 +6,20 @@ IBNR estimation, and statutory requirements.
 """
 
 import csv
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
 
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -34,6 +43,7 @@ def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[st
     return result
 
 
+@cached_reference_loader
 def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     """Load a CSV file and return as list of dictionaries."""
     csv_path = Path(__file__).parent / filename
@@ -56,6 +66,7 @@ def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     return result
 
 
+@cached_reference_loader
 def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
     """Load parameters CSV as key-value dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -81,6 +92,7 @@ def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
                     result[key] = value
     return result
 
+@cached_reference_loader
 def load_key_value_csv(filename: str) -> Dict[str, Any]:
     """Load a key-value CSV file as a flat dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -125,9 +137,411 @@ def load_actuarial_tables() -> Dict[str, Any]:
     }
 
 
+# Age-to-age factor averages supported by LossTriangle.age_to_age
+LDF_SELECTIONS = ("volume_weighted", "simple", "medial")
+
+# Percentiles reported for simulated reserve distributions
+DISTRIBUTION_PERCENTILES = (50, 75, 90, 95, 99, 99.5)
+
+
+class LossTriangle:
+    """
+    Cumulative loss development triangle.
+
+    Rows are origin (accident) periods, oldest first; columns are development
+    ages. Rows may be ragged (the usual upper-left triangle) and any cell may
+    be None to mask a missing or excluded value; masked cells are left out
+    of factor selection, Mack variance and bootstrap residuals.
+    """
+
+    def __init__(self, rows: Sequence[Sequence[Optional[float]]]):
+        width = max((len(row) for row in rows), default=0)
+        self.cells: List[List[Optional[float]]] = [
+            [float(v) if v is not None else None for v in row] + [None] * (width - len(row))
+            for row in rows
+        ]
+        self.origins = len(self.cells)
+        self.ages = width
+
+    @classmethod
+    def from_incremental(cls, rows: Sequence[Sequence[Optional[float]]]) -> "LossTriangle":
+        """Build a cumulative triangle from incremental amounts."""
+        cumulative_rows = []
+        for row in rows:
+            total = 0.0
+            cumulative = []
+            for value in row:
+                if value is None:
+                    cumulative.append(None)
+                    continue
+                total += value
+                cumulative.append(total)
+            cumulative_rows.append(cumulative)
+        return cls(cumulative_rows)
+
+    def latest(self) -> List[Tuple[int, float]]:
+        """(age index, value) of each origin's latest observed cell; (-1, 0.0) if none."""
+        diagonal = []
+        for row in self.cells:
+            age = max((j for j, v in enumerate(row) if v is not None), default=-1)
+            diagonal.append((age, row[age] if age >= 0 else 0.0))
+        return diagonal
+
+    def link_pairs(self, age: int) -> List[Tuple[float, float]]:
+        """(value at age, value at age + 1) for origins observed at both ages."""
+        pairs = []
+        for row in self.cells:
+            prior, current = row[age], row[age + 1]
+            if prior is not None and current is not None and prior != 0:
+                pairs.append((prior, current))
+        return pairs
+
+    def age_to_age(self, selection: str = "volume_weighted") -> List[float]:
+        """
+        Selected age-to-age factors.
+
+        Args:
+            selection: volume_weighted (chain ladder), simple (mean of link
+                ratios) or medial (mean excluding the highest and lowest)
+
+        Returns:
+            One factor per development age transition (1.0 where no data)
+        """
+        if selection not in LDF_SELECTIONS:
+            raise ValueError(f"Unknown LDF selection '{selection}'; use one of {', '.join(LDF_SELECTIONS)}")
+
+        factors = []
+        for age in range(self.ages - 1):
+            pairs = self.link_pairs(age)
+            if not pairs:
+                factors.append(1.0)
+                continue
+            if selection == "volume_weighted":
+                prior_total = sum(prior for prior, _ in pairs)
+                factors.append(sum(current for _, current in pairs) / prior_total if prior_total else 1.0)
+                continue
+            ratios = sorted(current / prior for prior, current in pairs)
+            if selection == "medial" and len(ratios) > 2:
+                ratios = ratios[1:-1]
+            factors.append(sum(ratios) / len(ratios))
+        return factors
+
+    @staticmethod
+    def to_ultimate(factors: Sequence[float], tail: float = 1.0) -> List[float]:
+        """Cumulative development factors to ultimate for every age."""
+        cumulative = [tail]
+        for factor in reversed(factors):
+            cumulative.insert(0, cumulative[0] * factor)
+        return cumulative
+
+    def ultimates(self, factors: Sequence[float], tail: float = 1.0) -> List[float]:
+        """Projected ultimate loss for each origin."""
+        to_ultimate = self.to_ultimate(factors, tail)
+        return [value * to_ultimate[age] if age >= 0 else 0.0 for age, value in self.latest()]
+
+    def reserves(self, factors: Sequence[float], tail: float = 1.0) -> List[float]:
+        """Unpaid (ultimate minus latest) for each origin."""
+        return [
+            ultimate - value
+            for ultimate, (_, value) in zip(self.ultimates(factors, tail), self.latest())
+        ]
+
+    def _sigma_squared(self, factors: Sequence[float]) -> List[float]:
+        """Mack's sigma^2 per age, extrapolating ages with fewer than two link ratios."""
+        sigma2: List[Optional[float]] = []
+        for age, factor in enumerate(factors):
+            pairs = self.link_pairs(age)
+            if len(pairs) >= 2:
+                sigma2.append(
+                    sum(prior * (current / prior - factor) ** 2 for prior, current in pairs)
+                    / (len(pairs) - 1)
+                )
+            else:
+                sigma2.append(None)
+
+        for age, value in enumerate(sigma2):
+            if value is not None:
+                continue
+            if age >= 2 and sigma2[age - 1] is not None and sigma2[age - 2]:
+                previous, before = sigma2[age - 1], sigma2[age - 2]
+                sigma2[age] = min(previous ** 2 / before, previous, before)
+            elif age >= 1 and sigma2[age - 1] is not None:
+                sigma2[age] = sigma2[age - 1]
+            else:
+                sigma2[age] = 0.0
+        return sigma2
+
+    def mack(self) -> Dict[str, Any]:
+        """
+        Mack (1993) chain-ladder standard errors.
+
+        Uses volume-weighted factors (the chain ladder the Mack model
+        assumes) and no tail.
+
+        Returns:
+            Dictionary with reserves and standard errors by origin and in total
+        """
+        factors = self.age_to_age("volume_weighted")
+        sigma2 = self._sigma_squared(factors)
+        latest = self.latest()
+        ultimates = self.ultimates(factors)
+        link_totals = [sum(prior for prior, _ in self.link_pairs(age)) for age in range(self.ages - 1)]
+        # Parameter-risk weight of each age transition
+        weights = [
+            sigma2[k] / factors[k] ** 2 / link_totals[k] if link_totals[k] and factors[k] else 0.0
+            for k in range(self.ages - 1)
+        ]
+
+        mse = []
+        for (age, value), ultimate in zip(latest, ultimates):
+            total = 0.0
+            projected = value
+            for k in range(max(age, 0), self.ages - 1):
+                if projected and factors[k]:
+                    total += sigma2[k] / factors[k] ** 2 / projected
+                total += weights[k]
+                projected *= factors[k]
+            mse.append(ultimate ** 2 * total if age >= 0 else 0.0)
+
+        total_mse = sum(mse)
+        for i in range(self.origins):
+            for j in range(i + 1, self.origins):
+                start = max(latest[i][0], latest[j][0], 0)
+                covariance = sum(weights[start:])
+                total_mse += 2 * ultimates[i] * ultimates[j] * covariance
+
+        reserves = [u - v for u, (_, v) in zip(ultimates, latest)]
+        total_reserve = sum(reserves)
+        total_se = math.sqrt(max(total_mse, 0.0))
+        return {
+            "reserves": reserves,
+            "standard_errors": [math.sqrt(max(m, 0.0)) for m in mse],
+            "total_reserve": total_reserve,
+            "total_standard_error": total_se,
+            "coefficient_of_variation": total_se / total_reserve if total_reserve else None
+        }
+
+    def odp_bootstrap(
+        self,
+        simulations: int = 10000,
+        seed: Optional[int] = None
+    ) -> Optional[List[float]]:
+        """
+        Over-dispersed Poisson bootstrap of the total reserve.
+
+        England & Verrall: scaled Pearson residuals of the chain-ladder fit
+        are resampled into pseudo triangles, the chain ladder is refitted to
+        each, and gamma process variance is added to every projected
+        incremental cell.
+
+        Args:
+            simulations: Number of simulated reserve outcomes
+            seed: Random seed for reproducible runs
+
+        Returns:
+            Simulated total reserves, or None if the triangle has too few
+            cells to estimate the dispersion
+        """
+        factors = self.age_to_age("volume_weighted")
+        latest = self.latest()
+
+        # Fitted cumulative values, backed out from the latest diagonal
+        fitted = [[None] * self.ages for _ in range(self.origins)]
+        for i, (age, value) in enumerate(latest):
+            if age < 0:
+                continue
+            fitted[i][age] = value
+            for j in range(age - 1, -1, -1):
+                fitted[i][j] = fitted[i][j + 1] / factors[j] if factors[j] else fitted[i][j + 1]
+
+        # Observed incremental cells with their fitted means
+        cells = []
+        for i, row in enumerate(self.cells):
+            for j in range(self.ages):
+                if row[j] is None or fitted[i][j] is None:
+                    continue
+                if j == 0:
+                    actual, mean = row[0], fitted[i][0]
+                elif row[j - 1] is not None:
+                    actual, mean = row[j] - row[j - 1], fitted[i][j] - fitted[i][j - 1]
+                else:
+                    continue
+                cells.append((i, j, actual, mean))
+
+        parameters = self.origins + self.ages - 1
+        degrees_of_freedom = len(cells) - parameters
+        if degrees_of_freedom <= 0:
+            return None
+
+        residuals = [
+            (actual - mean) / math.sqrt(mean) if mean > 0 else 0.0
+            for _, _, actual, mean in cells
+        ]
+        phi = sum(r * r for r in residuals) / degrees_of_freedom
+        scale = math.sqrt(len(cells) / degrees_of_freedom)
+        # Corner cells fit exactly; their zero residuals carry no information
+        pool = [r * scale for r in residuals if abs(r) > 1e-12] or [0.0]
+
+        rng = random.Random(seed)
+        outcomes = []
+        for _ in range(simulations):
+            pseudo = [[None] * self.ages for _ in range(self.origins)]
+            for i, j, actual, mean in cells:
+                incremental = mean + rng.choice(pool) * math.sqrt(mean) if mean > 0 else actual
+                pseudo[i][j] = incremental if j == 0 else pseudo[i][j - 1] + incremental
+
+            pseudo_factors = []
+            for k in range(self.ages - 1):
+                prior_total = current_total = 0.0
+                for row in pseudo:
+                    if row[k] is not None and row[k + 1] is not None:
+                        prior_total += row[k]
+                        current_total += row[k + 1]
+                pseudo_factors.append(current_total / prior_total if prior_total > 0 else factors[k])
+
+            reserve = 0.0
+            for i, (age, _) in enumerate(latest):
+                if age < 0 or pseudo[i][age] is None:
+                    continue
+                projected = pseudo[i][age]
+                for k in range(age, self.ages - 1):
+                    mean = projected * (pseudo_factors[k] - 1)
+                    projected += mean
+                    if mean > 0 and phi > 0:
+                        reserve += rng.gammavariate(mean / phi, phi)
+                    else:
+                        reserve += mean
+            outcomes.append(reserve)
+        return outcomes
+
+
+def summarize_distribution(
+    outcomes: Sequence[float],
+    percentiles: Sequence[float] = DISTRIBUTION_PERCENTILES
+) -> Dict[str, float]:
+    """Mean, standard deviation and percentiles of simulated reserves."""
+    ordered = sorted(outcomes)
+    count = len(ordered)
+    mean = sum(ordered) / count
+    variance = sum((v - mean) ** 2 for v in ordered) / (count - 1) if count > 1 else 0.0
+    summary = {"simulations": count, "mean": round(mean, 2), "std": round(math.sqrt(variance), 2)}
+    for pct in percentiles:
+        position = (count - 1) * pct / 100
+        lower = int(position)
+        upper = min(lower + 1, count - 1)
+        value = ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+        summary[f"p{pct:g}"] = round(value, 2)
+    return summary
+
+
+def analyze_triangle(
+    rows: Sequence[Sequence[Optional[float]]],
+    ldf_selection: str = "volume_weighted",
+    simulations: int = 0,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Chain-ladder reserve analysis of one cumulative triangle.
+
+    Args:
+        rows: Cumulative triangle, origins oldest first (None masks a cell)
+        ldf_selection: volume_weighted, simple or medial
+        simulations: ODP bootstrap simulations (0 skips the bootstrap)
+        seed: Random seed for the bootstrap
+
+    Returns:
+        Factors, ultimates, reserves, Mack standard error and the bootstrap
+        reserve distribution; "outcomes" holds the raw simulated reserves
+    """
+    triangle = LossTriangle(rows)
+    factors = triangle.age_to_age(ldf_selection)
+    ultimates = triangle.ultimates(factors)
+    reserves = [u - v for u, (_, v) in zip(ultimates, triangle.latest())]
+    mack = triangle.mack()
+    outcomes = triangle.odp_bootstrap(simulations, seed) if simulations else None
+
+    return {
+        "ldf_selection": ldf_selection,
+        "age_to_age": [round(f, 4) for f in factors],
+        "to_ultimate": [round(f, 4) for f in triangle.to_ultimate(factors)],
+        "ultimate_by_origin": [round(u, 2) for u in ultimates],
+        "reserve_by_origin": [round(r, 2) for r in reserves],
+        "total_reserve": round(sum(reserves), 2),
+        "mack_standard_error": round(mack["total_standard_error"], 2),
+        "mack_cv": round(mack["coefficient_of_variation"], 4) if mack["coefficient_of_variation"] is not None else None,
+        "bootstrap": summarize_distribution(outcomes) if outcomes else None,
+        "outcomes": outcomes
+    }
+
+
+def _analyze_segment(args: Tuple[Dict, str, int, Optional[int]]) -> Dict[str, Any]:
+    segment, ldf_selection, simulations, seed = args
+    triangle = segment.get("triangle", [])
+    if segment.get("incremental"):
+        triangle = LossTriangle.from_incremental(triangle).cells
+    result = analyze_triangle(triangle, ldf_selection, simulations, seed)
+    result["segment_id"] = segment.get("segment_id")
+    return result
+
+
+def analyze_reserve_segments(
+    segments: List[Dict],
+    ldf_selection: str = "volume_weighted",
+    simulations: Optional[int] = None,
+    seed: Optional[int] = None,
+    processes: int = 1
+) -> Dict[str, Any]:
+    """
+    Reserve analysis for many lines of business or segments in one call.
+
+    Args:
+        segments: Each {"segment_id": ..., "triangle": rows, "incremental": bool}
+        ldf_selection: volume_weighted, simple or medial
+        simulations: Bootstrap simulations per segment (default from parameters)
+        seed: Base random seed; segment n uses seed + n
+        processes: Worker processes for the segments (1 runs in-process)
+
+    Returns:
+        Per-segment results and an aggregate distribution, summing segment
+        simulations draw by draw (segments treated as independent)
+    """
+    if simulations is None:
+        simulations = load_actuarial_tables().get("bootstrap_simulations", 10000)
+
+    jobs = [
+        (segment, ldf_selection, simulations, seed + n if seed is not None else None)
+        for n, segment in enumerate(segments)
+    ]
+    if processes > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_analyze_segment, jobs))
+    else:
+        results = [_analyze_segment(job) for job in jobs]
+
+    aggregate_outcomes = None
+    simulated = [r["outcomes"] for r in results if r["outcomes"]]
+    if simulated and len(simulated) == len(results):
+        aggregate_outcomes = [sum(draws) for draws in zip(*simulated)]
+    for result in results:
+        result.pop("outcomes")
+
+    total_reserve = sum(r["total_reserve"] for r in results)
+    return {
+        "segments": results,
+        "aggregate": {
+            "segment_count": len(results),
+            "total_reserve": round(total_reserve, 2),
+            # Independent segments: Mack variances add
+            "mack_standard_error": round(math.sqrt(sum(r["mack_standard_error"] ** 2 for r in results)), 2),
+            "bootstrap": summarize_distribution(aggregate_outcomes) if aggregate_outcomes else None
+        }
+    }
+
+
 def calculate_development_factors(
     loss_triangles: Dict,
-    method: str = "chain_ladder"
+    method: str = "chain_ladder",
+    ldf_selection: str = "volume_weighted"
 ) -> Dict[str, Any]:
     """Calculate loss development factors from triangles."""
     paid_triangle = loss_triangles.get("paid", [])
@@ -136,34 +550,17 @@ def calculate_development_factors(
     paid_ldfs = []
     incurred_ldfs = []
 
-    # Calculate paid LDFs using chain-ladder method
     if len(paid_triangle) >= 2:
-        for col in range(len(paid_triangle[0]) - 1):
-            sum_current = 0
-            sum_prior = 0
-            for row in range(len(paid_triangle) - col):
-                if col + 1 < len(paid_triangle[row]):
-                    sum_current += paid_triangle[row][col + 1]
-                    sum_prior += paid_triangle[row][col]
-            if sum_prior > 0:
-                paid_ldfs.append(round(sum_current / sum_prior, 3))
-
-    # Calculate incurred LDFs
+        paid_ldfs = [round(f, 3) for f in LossTriangle(paid_triangle).age_to_age(ldf_selection)]
+
     if len(incurred_triangle) >= 2:
-        for col in range(len(incurred_triangle[0]) - 1):
-            sum_current = 0
-            sum_prior = 0
-            for row in range(len(incurred_triangle) - col):
-                if col + 1 < len(incurred_triangle[row]):
-                    sum_current += incurred_triangle[row][col + 1]
-                    sum_prior += incurred_triangle[row][col]
-            if sum_prior > 0:
-                incurred_ldfs.append(round(sum_current / sum_prior, 3))
+        incurred_ldfs = [round(f, 3) for f in LossTriangle(incurred_triangle).age_to_age(ldf_selection)]
 
     return {
         "paid_ldfs": paid_ldfs,
         "incurred_ldfs": incurred_ldfs,
         "method": method,
+        "ldf_selection": ldf_selection,
         "paid_to_ultimate": calculate_cumulative_ldf(paid_ldfs),
         "incurred_to_ultimate": calculate_cumulative_ldf(incurred_ldfs)
     }
@@ -191,31 +588,26 @@ def estimate_ibnr(
     method_weights: Dict
 ) -> Dict[str, Any]:
     """Estimate IBNR using multiple methods."""
-    paid_triangle = loss_triangles.get("paid", [])
-    incurred_triangle = loss_triangles.get("incurred", [])
+    paid_triangle = LossTriangle(loss_triangles.get("paid", []))
+    incurred_triangle = LossTriangle(loss_triangles.get("incurred", []))
 
     paid_ldfs = development_factors.get("paid_to_ultimate", [])
     incurred_ldfs = development_factors.get("incurred_to_ultimate", [])
 
-    paid_ultimate = []
-    incurred_ultimate = []
-
-    # Calculate ultimate losses by accident year
-    for i, row in enumerate(paid_triangle):
-        if i < len(paid_ldfs):
-            current_paid = row[-1] if row else 0
-            ultimate = current_paid * paid_ldfs[i]
-            paid_ultimate.append(round(ultimate, 2))
-
-    for i, row in enumerate(incurred_triangle):
-        if i < len(incurred_ldfs):
-            current_incurred = row[-1] if row else 0
-            ultimate = current_incurred * incurred_ldfs[i]
-            incurred_ultimate.append(round(ultimate, 2))
+    # Ultimate losses by accident year: latest value times the factor to
+    # ultimate for that year's development age
+    paid_ultimate = [
+        round(value * (paid_ldfs[age] if age < len(paid_ldfs) else 1.0), 2)
+        for age, value in paid_triangle.latest()
+    ]
+    incurred_ultimate = [
+        round(value * (incurred_ldfs[age] if age < len(incurred_ldfs) else 1.0), 2)
+        for age, value in incurred_triangle.latest()
+    ]
 
     # Calculate IBNR
-    total_paid = sum(row[-1] for row in paid_triangle if row)
-    total_incurred = sum(row[-1] for row in incurred_triangle if row)
+    total_paid = sum(value for _, value in paid_triangle.latest())
+    total_incurred = sum(value for _, value in incurred_triangle.latest())
 
     paid_ibnr = sum(paid_ultimate) - total_paid
     incurred_ibnr = sum(incurred_ultimate) - total_incurred
@@ -292,7 +684,10 @@ def calculate_reserve(
     case_reserves: Dict,
     premium_data: Dict,
     line_of_business: str,
-    prior_estimates: Dict
+    prior_estimates: Dict,
+    ldf_selection: str = "volume_weighted",
+    simulations: int = 0,
+    seed: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Calculate actuarial reserves.
@@ -310,6 +705,10 @@ def calculate_reserve(
         premium_data: Earned premium by period
         line_of_business: Insurance line
         prior_estimates: Previous reserve estimates
+        ldf_selection: Age-to-age factor average (volume_weighted, simple, medial)
+        simulations: ODP bootstrap simulations (default 0: Mack standard
+            error only)
+        seed: Random seed for the bootstrap
 
     Returns:
         Reserve calculation results
@@ -319,7 +718,8 @@ def calculate_reserve(
     # Calculate development factors
     development_factors = calculate_development_factors(
         loss_triangles,
-        method="chain_ladder"
+        method="chain_ladder",
+        ldf_selection=ldf_selection
     )
 
     # Estimate IBNR
@@ -329,6 +729,15 @@ def calculate_reserve(
         tables.get("method_weights", {})
     )
 
+    # Reserve variability: Mack standard error, plus the bootstrap distribution on request
+    reserve_variability = {}
+    for triangle_type in ("paid", "incurred"):
+        rows = loss_triangles.get(triangle_type, [])
+        if len(rows) >= 2:
+            analysis = analyze_triangle(rows, ldf_selection, simulations, seed)
+            analysis.pop("outcomes")
+            reserve_variability[triangle_type] = analysis
+
     # Total indicated reserve
     current_case = case_reserves.get("open_claims", 0)
     indicated_ibnr = ibnr_result.get("weighted_ibnr", 0)
@@ -363,6 +772,7 @@ def calculate_reserve(
         "ibnr_estimate": round(indicated_ibnr, 2),
         "development_factors": development_factors,
         "ibnr_analysis": ibnr_result,
+        "reserve_variability": reserve_variability,
         "statutory_minimum": statutory_minimum,
         "adequacy_assessment": adequacy_assessment
     }
@@ -9,8 +9,17 @@ import csv
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+    from skill_runtime import scenarios as scenario_engine
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
+    scenario_engine = None
 
+
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -34,6 +43,7 @@ def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[st
     return result
 
 
+@cached_reference_loader
 def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     """Load a CSV file and return as list of dictionaries."""
     csv_path = Path(__file__).parent / filename
@@ -56,6 +66,7 @@ def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     return result
 
 
+@cached_reference_loader
 def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
     """Load parameters CSV as key-value dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -81,6 +92,7 @@ def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
                     result[key] = value
     return result
 
+@cached_reference_loader
 def load_key_value_csv(filename: str) -> Dict[str, Any]:
     """Load a key-value CSV file as a flat dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -275,6 +287,66 @@ def perform_sensitivity_analysis(
     }
 
 
+def break_even_model(
+    unit_price: float,
+    variable_cost_per_unit: float,
+    fixed_costs: float,
+    expected_sales_units: float
+) -> Dict[str, Optional[float]]:
+    """Core break-even formula evaluated by the scenario engine."""
+    cm = unit_price - variable_cost_per_unit
+    return {
+        "operating_income": cm * expected_sales_units - fixed_costs,
+        "break_even_units": fixed_costs / cm if cm > 0 else None
+    }
+
+
+def rank_sensitivities(
+    base_inputs: Dict[str, float],
+    swing_pct: float
+) -> List[Dict[str, Any]]:
+    """Tornado ranking of inputs moved +/- swing_pct on operating income."""
+    ranges = {
+        name: (value * (1 - swing_pct / 100), value * (1 + swing_pct / 100))
+        for name, value in base_inputs.items()
+    }
+    return scenario_engine.round_floats(
+        scenario_engine.tornado(break_even_model, base_inputs, ranges, "operating_income")
+    )
+
+
+def simulate_break_even(
+    base_inputs: Dict[str, float],
+    uncertainty: Dict,
+    default_draws: int
+) -> Dict[str, Any]:
+    """
+    Monte Carlo break-even analysis.
+
+    Args:
+        base_inputs: Base-case break_even_model arguments
+        uncertainty: {"distributions": {...}, "draws": n, "seed": s}; keys of
+            distributions are break_even_model argument names
+        default_draws: Draws when uncertainty does not set them
+
+    Returns:
+        Percentile bands of operating income and break-even units and a
+        tornado ranking of the uncertain inputs
+    """
+    if scenario_engine is None:
+        return {"error": "Scenario engine (skill_runtime) is not available"}
+
+    result = scenario_engine.monte_carlo(
+        break_even_model,
+        base_inputs,
+        uncertainty.get("distributions", {}),
+        draws=int(uncertainty.get("draws", default_draws)),
+        seed=uncertainty.get("seed"),
+        tornado_output="operating_income"
+    )
+    return scenario_engine.round_floats(result)
+
+
 def model_scenarios(
     base_price: float,
     base_variable_cost: float,
@@ -375,7 +447,8 @@ def calculate_break_even(
     target_profit: Optional[float],
     products: Optional[List[Dict]],
     industry: str,
-    analysis_date: str
+    analysis_date: str,
+    uncertainty: Optional[Dict] = None
 ) -> Dict[str, Any]:
     """
     Calculate break-even analysis.
@@ -396,6 +469,9 @@ def calculate_break_even(
         products: Multi-product data (optional)
         industry: Industry for benchmarking
         analysis_date: Analysis date
+        uncertainty: Optional Monte Carlo spec with "distributions" over
+            unit_price, variable_cost_per_unit, fixed_costs and
+            expected_sales_units, plus optional "draws" and "seed"
 
     Returns:
         Break-even analysis results
@@ -437,6 +513,28 @@ def calculate_break_even(
         fixed_costs,
         params.get("sensitivity_ranges", {})
     )
+    base_inputs = {
+        "unit_price": unit_price,
+        "variable_cost_per_unit": variable_cost_per_unit,
+        "fixed_costs": fixed_costs,
+        "expected_sales_units": expected_sales_units
+    }
+    # Present (None) without the scenario engine, so the output shape is fixed
+    sensitivity["tornado"] = None
+    if scenario_engine is not None:
+        sensitivity["tornado"] = rank_sensitivities(
+            base_inputs,
+            params.get("tornado_swing_pct", 10)
+        )
+
+    # Monte Carlo analysis
+    monte_carlo = None
+    if uncertainty:
+        monte_carlo = simulate_break_even(
+            base_inputs,
+            uncertainty,
+            params.get("monte_carlo_draws", 100000)
+        )
 
     # Scenario modeling
     scenarios = model_scenarios(
@@ -485,6 +583,7 @@ def calculate_break_even(
         "target_profit_analysis": target_analysis,
         "sensitivity_analysis": sensitivity,
         "scenario_analysis": scenarios,
+        "monte_carlo_analysis": monte_carlo,
         "multi_product_analysis": multi_product,
         "risk_assessment": risk,
         "benchmark_comparison": benchmark_comparison,
@@ -8,10 +8,16 @@ multiple methods including MACRS, straight-line, and accelerated methods.
 import csv
 import ast
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Iterator, Optional, TextIO, Tuple
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
 
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -43,6 +49,7 @@ def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[st
     return result
 
 
+@cached_reference_loader
 def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     """Load a CSV file and return as list of dictionaries."""
     csv_path = Path(__file__).parent / filename
@@ -73,6 +80,7 @@ def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     return result
 
 
+@cached_reference_loader
 def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
     """Load parameters CSV as key-value dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -98,6 +106,7 @@ def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
                     result[key] = value
     return result
 
+@cached_reference_loader
 def load_key_value_csv(filename: str) -> Dict[str, Any]:
     """Load a key-value CSV file as a flat dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -122,6 +131,17 @@ def load_key_value_csv(filename: str) -> Dict[str, Any]:
     return result
 
 
+def load_macrs_tables(params: Dict[str, Any]) -> Dict[str, List[float]]:
+    """Parse the macrs_tables_<class> parameters into rate lists by MACRS class."""
+    prefix = "macrs_tables_"
+    tables = {}
+    for key, value in params.items():
+        if key.startswith(prefix):
+            rates = value if isinstance(value, str) else str(value)
+            tables[key[len(prefix):]] = [float(r) for r in rates.split(",") if r.strip()]
+    return tables
+
+
 def load_depreciation_methods() -> Dict[str, Any]:
     """Load configuration data from CSV files."""
     depreciation_methods_data = load_csv_as_dict("depreciation_methods.csv")
@@ -136,6 +156,7 @@ def load_depreciation_methods() -> Dict[str, Any]:
         "section_179_limits": section_179_limits_data,
         "bonus_depreciation": bonus_depreciation_data,
         "accounting_standards": accounting_standards_data,
+        "macrs_tables": load_macrs_tables(params),
         **params
     }
 
@@ -485,6 +506,187 @@ def calculate_depreciation_schedule(
     }
 
 
+# Column order of register schedule rows
+REGISTER_COLUMNS = [
+    "asset_id",
+    "asset_category",
+    "depreciation_method",
+    "year",
+    "calendar_year",
+    "depreciation_expense",
+    "accumulated_depreciation",
+    "book_value"
+]
+
+
+def schedule_fractions(
+    depreciation_method: str,
+    useful_life: int,
+    salvage_pct: float,
+    macrs_rates: List[float]
+) -> List[float]:
+    """
+    Per-year depreciation as fractions of the depreciable basis.
+
+    Every supported method scales linearly with basis (salvage is a fixed
+    share of basis), so one fraction table per method/life/salvage/MACRS
+    class serves every asset in that group.
+
+    Returns:
+        Depreciation fraction for each year of the schedule
+    """
+    if depreciation_method == "macrs":
+        return list(macrs_rates)
+
+    depreciable = 1 - salvage_pct
+    if depreciation_method == "declining_balance":
+        rate = 2.0 / useful_life
+        expense = []
+        book_value = 1.0
+        for _ in range(useful_life):
+            depreciation = max(0.0, min(book_value * rate, book_value - salvage_pct))
+            expense.append(depreciation)
+            book_value -= depreciation
+    elif depreciation_method == "sum_of_years_digits":
+        sum_of_years = useful_life * (useful_life + 1) / 2
+        expense = [(useful_life - year) / sum_of_years * depreciable for year in range(useful_life)]
+    else:
+        # Straight-line, and the single-asset fallback for unsupported methods
+        expense = [depreciable / useful_life] * useful_life
+    return expense
+
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes", "y")
+    return bool(value)
+
+
+def iter_register_schedule(
+    assets: Iterable[Dict[str, Any]],
+    fiscal_year: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream depreciation schedule rows for a whole fixed-asset register.
+
+    Assets are grouped by method and category, and each group's fraction
+    table (MACRS rates, straight-line, declining balance, SYD) is built once
+    and scaled by each asset's depreciable basis. Rows are flat dictionaries
+    in REGISTER_COLUMNS order, ready for csv.DictWriter.
+
+    Args:
+        assets: Asset records with asset_id, asset_category, acquisition_cost,
+            acquisition_date, depreciation_method and optional
+            apply_section_179_election / apply_bonus_depreciation_election
+            (values may be strings, as read from CSV). Units-of-production
+            assets also carry units_per_year (list or ';'-separated) and
+            total_units.
+        fiscal_year: Only emit rows for this calendar year (e.g. a month-end
+            run for the current year)
+
+    Returns:
+        Iterator of schedule rows
+    """
+    config = load_depreciation_methods()
+    categories = config.get("asset_categories", {})
+    macrs_tables = config.get("macrs_tables", {})
+    section_179_limits = config.get("section_179_limits", {})
+    bonus_config = config.get("bonus_depreciation", {})
+    fraction_tables: Dict[Tuple[str, str], List[float]] = {}
+
+    for asset in assets:
+        category = asset.get("asset_category", "machinery")
+        method = asset.get("depreciation_method", "straight_line")
+        cost = float(asset.get("acquisition_cost") or 0)
+        acquisition_date = str(asset.get("acquisition_date", ""))
+        acquisition_year = acquisition_date[:4]
+        if cost <= 0:
+            continue
+
+        category_config = categories.get(category, categories.get("machinery", {}))
+        salvage_pct = category_config.get("salvage_pct", 0.10)
+
+        basis = cost
+        if _as_bool(asset.get("apply_section_179_election", False)):
+            basis = apply_section_179(cost, section_179_limits, acquisition_year)["remaining_basis"]
+        if _as_bool(asset.get("apply_bonus_depreciation_election", False)) and basis > 0:
+            basis = apply_bonus_depreciation(basis, bonus_config, acquisition_year)["remaining_basis"]
+
+        units = asset.get("units_per_year")
+        total_units = float(asset.get("total_units") or 0)
+        if method == "units_of_production" and units and total_units:
+            if isinstance(units, str):
+                units = [float(u) for u in units.split(";") if u.strip()]
+            expense = [u / total_units * (1 - salvage_pct) for u in units]
+            # Units of production never books below salvage
+            book_floor = basis * salvage_pct
+        else:
+            book_floor = None
+            key = (method, category)
+            if key not in fraction_tables:
+                macrs_class = category_config.get("macrs_class", "7-year")
+                macrs_rates = macrs_tables.get(macrs_class, macrs_tables.get("5-year", []))
+                fraction_tables[key] = schedule_fractions(
+                    method,
+                    category_config.get("useful_life_years", 7),
+                    salvage_pct,
+                    macrs_rates
+                )
+            expense = fraction_tables[key]
+
+        start_year = int(acquisition_year) if acquisition_year.isdigit() else None
+        accumulated = 0.0
+        for year, fraction in enumerate(expense, 1):
+            depreciation = basis * fraction
+            accumulated += depreciation
+            book_value = basis - accumulated
+            if book_floor is not None:
+                book_value = max(book_value, book_floor)
+            calendar_year = start_year + year - 1 if start_year is not None else None
+            if fiscal_year is not None and calendar_year != fiscal_year:
+                continue
+            yield {
+                "asset_id": asset.get("asset_id"),
+                "asset_category": category,
+                "depreciation_method": method,
+                "year": year,
+                "calendar_year": calendar_year,
+                "depreciation_expense": round(depreciation, 2),
+                "accumulated_depreciation": round(accumulated, 2),
+                "book_value": round(book_value, 2)
+            }
+
+
+def read_asset_register(source: TextIO) -> Iterator[Dict[str, Any]]:
+    """Read asset records from a CSV register (one asset per row)."""
+    yield from csv.DictReader(source)
+
+
+def write_register_schedule(
+    assets: Iterable[Dict[str, Any]],
+    sink: TextIO,
+    fiscal_year: Optional[int] = None
+) -> int:
+    """
+    Write the register's schedule rows as CSV.
+
+    Args:
+        assets: Asset records (see iter_register_schedule)
+        sink: Writable text stream
+        fiscal_year: Only write rows for this calendar year
+
+    Returns:
+        Number of rows written
+    """
+    writer = csv.DictWriter(sink, fieldnames=REGISTER_COLUMNS)
+    writer.writeheader()
+    rows = 0
+    for row in iter_register_schedule(assets, fiscal_year):
+        writer.writerow(row)
+        rows += 1
+    return rows
+
+
 if __name__ == "__main__":
     import json
     result = calculate_depreciation_schedule(
@@ -9,11 +9,17 @@ import csv
 import ast
 import math
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple, Union
+from datetime import date, datetime, timedelta
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
 
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -45,6 +51,7 @@ def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[st
     return result
 
 
+@cached_reference_loader
 def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     """Load a CSV file and return as list of dictionaries."""
     csv_path = Path(__file__).parent / filename
@@ -75,6 +82,7 @@ def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     return result
 
 
+@cached_reference_loader
 def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
     """Load parameters CSV as key-value dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -100,6 +108,7 @@ def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
                     result[key] = value
     return result
 
+@cached_reference_loader
 def load_key_value_csv(filename: str) -> Dict[str, Any]:
     """Load a key-value CSV file as a flat dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -223,6 +232,14 @@ def calculate_maintenance_cost(
     }
 
 
+def standard_parts(equipment_params: Dict) -> List[str]:
+    """Standard parts of an equipment type (stored as a comma-separated string)."""
+    parts = equipment_params.get("standard_parts", [])
+    if isinstance(parts, str):
+        return [part.strip() for part in parts.split(",") if part.strip()]
+    return list(parts)
+
+
 def calculate_maintenance(
     equipment_id: str,
     equipment_type: str,
@@ -319,7 +336,7 @@ def calculate_maintenance(
         days_until = int(rul_hours / 24)
 
     # Check parts availability
-    parts_needed = equipment_params.get("standard_parts", [])
+    parts_needed = standard_parts(equipment_params)
     parts_status = []
     for part in parts_needed:
         available = parts_inventory.get(part, 0)
@@ -364,6 +381,282 @@ def calculate_maintenance(
     }
 
 
+HOURS_PER_MONTH = 720  # 30 days of 24/7 operation
+
+# Scheduling order of urgency classes
+URGENCY_RANK = {"immediate": 0, "soon": 1, "scheduled": 2, "normal": 3}
+
+FLEET_COLUMNS = (
+    "equipment_id", "equipment_type", "operating_hours", "sensor_data",
+    "maintenance_history", "hours_since_maintenance", "weibull_shape", "weibull_scale",
+)
+
+
+def _fleet_records(assets: Union[List[Dict], Dict[str, List]]) -> List[Dict]:
+    """Accept a list of asset records or a dict of equal-length columns."""
+    if isinstance(assets, dict):
+        names = [name for name in FLEET_COLUMNS if name in assets]
+        return [dict(zip(names, values)) for values in zip(*(assets[name] for name in names))]
+    return list(assets)
+
+
+def _threshold_table(thresholds: Dict) -> Dict[str, Tuple[Any, Any]]:
+    """Sensor -> (warning, critical) for sensors with at least one limit."""
+    table = {}
+    for sensor, config in thresholds.items():
+        if config and (config.get("warning") or config.get("critical")):
+            table[sensor] = (config.get("warning"), config.get("critical"))
+    return table
+
+
+def assess_fleet(
+    assets: Union[List[Dict], Dict[str, List]],
+    target_reliability: float = 0.9
+) -> List[Dict[str, Any]]:
+    """
+    Failure probability, RUL and condition alerts for a whole fleet.
+
+    Assets are grouped by equipment type and Weibull parameters, so threshold
+    tables and the target-reliability life are worked out once per group and
+    each asset costs a single exp() plus a threshold lookup per reading.
+    Results match calculate_maintenance asset by asset.
+
+    Args:
+        assets: Asset records (or columns) with equipment_id, equipment_type,
+            operating_hours and sensor_data; optional maintenance_history,
+            hours_since_maintenance and per-asset weibull_shape/weibull_scale
+        target_reliability: Reliability level that defines RUL
+
+    Returns:
+        One assessment per asset, in input order
+    """
+    params = load_equipment_parameters()
+    equipment_types = params["equipment_types"]
+    records = _fleet_records(assets)
+
+    groups: Dict[Tuple, List[int]] = {}
+    for index, asset in enumerate(records):
+        equipment_params = equipment_types.get(asset.get("equipment_type"), equipment_types["default"])
+        shape = asset.get("weibull_shape") or equipment_params["weibull_shape"]
+        scale = asset.get("weibull_scale") or equipment_params["weibull_scale"]
+        groups.setdefault((asset.get("equipment_type"), shape, scale), []).append(index)
+
+    valid_target = 0 < target_reliability < 1
+    log_target = -math.log(target_reliability) if valid_target else 0.0
+    results: List[Optional[Dict[str, Any]]] = [None] * len(records)
+
+    for (equipment_type, shape, scale), indices in groups.items():
+        equipment_params = equipment_types.get(equipment_type, equipment_types["default"])
+        thresholds = _threshold_table(equipment_params["sensor_thresholds"])
+        costs = equipment_params["maintenance_costs"]
+        failure_cost = costs.get("corrective", 5000) + costs.get("downtime_per_hour", 500) * 24
+        inv_scale = 1.0 / scale if scale > 0 else 0.0
+        target_time = scale * log_target ** (1 / shape) if valid_target else 0.0
+
+        for index in indices:
+            asset = records[index]
+            hours = asset.get("operating_hours", 0)
+            since = asset.get("hours_since_maintenance")
+            if since is None:
+                since = min(hours, 2000) if asset.get("maintenance_history") else hours
+
+            current = 1 - math.exp(-((since * inv_scale) ** shape)) if since > 0 and inv_scale else 0.0
+            ahead = since + HOURS_PER_MONTH
+            future = 1 - math.exp(-((ahead * inv_scale) ** shape)) if ahead > 0 and inv_scale else 0.0
+            rul = round(max(0, target_time - since), 0) if valid_target else 0
+
+            alerts = []
+            for sensor, value in (asset.get("sensor_data") or {}).items():
+                limits = thresholds.get(sensor)
+                if limits is None:
+                    continue
+                warning, critical = limits
+                if critical and value >= critical:
+                    alerts.append({"sensor": sensor, "value": value, "threshold": critical,
+                                   "level": "critical", "action": "immediate_inspection"})
+                elif warning and value >= warning:
+                    alerts.append({"sensor": sensor, "value": value, "threshold": warning,
+                                   "level": "warning", "action": "schedule_inspection"})
+
+            levels = {alert["level"] for alert in alerts}
+            if "critical" in levels:
+                urgency, maintenance_type, days_until = "immediate", "corrective", 0
+            elif "warning" in levels:
+                urgency, maintenance_type, days_until = "soon", "preventive", 7
+            elif current > 0.2:
+                urgency, maintenance_type, days_until = "scheduled", "preventive", 14
+            elif rul < HOURS_PER_MONTH:
+                urgency, maintenance_type, days_until = "scheduled", "preventive", int(rul / 24)
+            else:
+                urgency, maintenance_type, days_until = "normal", "preventive", int(rul / 24)
+
+            results[index] = {
+                "equipment_id": asset.get("equipment_id"),
+                "equipment_type": equipment_type,
+                "failure_probability": current,
+                "failure_probability_30_day": future,
+                "rul_hours": rul,
+                "condition_alerts": alerts,
+                "urgency": urgency,
+                "maintenance_type": maintenance_type,
+                "days_until": days_until,
+                "expected_failure_cost": (future - current) * failure_cost,
+            }
+
+    return results
+
+
+def plan_fleet_maintenance(
+    assets: Union[List[Dict], Dict[str, List]],
+    parts_inventory: Optional[Dict[str, int]] = None,
+    daily_capacity: Optional[int] = None,
+    horizon_days: Optional[int] = None,
+    start_date: Optional[Union[date, str]] = None
+) -> Dict[str, Any]:
+    """
+    Capacity-constrained maintenance schedule for a fleet.
+
+    Jobs are taken in priority order (urgency, due day, expected cost of
+    waiting). Spare parts are drawn from one shared inventory in that order,
+    and only by jobs that get a day on the plan; a job short of parts waits
+    for the lead time unless it is immediate.
+    Each job is placed on the latest day on or before its due day that still
+    has crew capacity, or on the first free day after it (reported as late).
+    Jobs due after the horizon are deferred to a later planning cycle.
+
+    Args:
+        assets: Asset records or columns, as for assess_fleet
+        parts_inventory: Spare parts on hand across the site
+        daily_capacity: Maintenance jobs the crews can complete per day
+        horizon_days: Planning horizon in days
+        start_date: First day of the plan (default: today)
+
+    Returns:
+        Schedule, daily load, capacity overflow and parts shortfalls
+    """
+    params = load_equipment_parameters()
+    equipment_types = params["equipment_types"]
+    capacity = int(daily_capacity if daily_capacity is not None else params.get("daily_maintenance_capacity", 25))
+    horizon = int(horizon_days if horizon_days is not None else params.get("planning_horizon_days", 90))
+    lead_time = params["parts_lead_time_days"]
+    if isinstance(start_date, str):
+        start = date.fromisoformat(start_date[:10])
+    else:
+        start = start_date or datetime.now().date()
+    if capacity <= 0:
+        raise ValueError("daily_capacity must be positive")
+
+    assessments = assess_fleet(assets)
+    order = sorted(
+        range(len(assessments)),
+        key=lambda i: (
+            URGENCY_RANK[assessments[i]["urgency"]],
+            assessments[i]["days_until"],
+            -assessments[i]["expected_failure_cost"],
+        )
+    )
+
+    stock = dict(parts_inventory or {})
+    shortfall: Dict[str, int] = {}
+    parts_by_type: Dict[str, List[str]] = {}
+    remaining = [capacity] * (horizon + 1)
+    # Union-find style pointers to the nearest day with capacity left
+    free_before = list(range(horizon + 1))
+    free_after = list(range(horizon + 2))
+
+    def latest_free(day: int) -> int:
+        root = day
+        while root >= 0 and free_before[root] != root:
+            root = free_before[root]
+        while day >= 0 and free_before[day] != day:
+            free_before[day], day = root, free_before[day]
+        return root
+
+    def earliest_free(day: int) -> int:
+        root = day
+        while free_after[root] != root:
+            root = free_after[root]
+        while free_after[day] != day:
+            free_after[day], day = root, free_after[day]
+        return root
+
+    schedule = []
+    overflow = []
+    deferred = 0
+    for index in order:
+        job = assessments[index]
+        equipment_type = job["equipment_type"]
+        if equipment_type not in parts_by_type:
+            parts_by_type[equipment_type] = standard_parts(
+                equipment_types.get(equipment_type, equipment_types["default"])
+            )
+
+        due = job["days_until"]
+        if due > horizon:
+            deferred += 1
+            continue
+
+        parts = parts_by_type[equipment_type]
+        missing = [part for part in parts if stock.get(part, 0) < 1]
+        if missing and job["urgency"] != "immediate":
+            due = max(due, lead_time)
+
+        day = latest_free(min(due, horizon))
+        if day < 0:
+            day = earliest_free(min(due, horizon) + 1)
+        if day > horizon:
+            overflow.append(job["equipment_id"])
+            continue
+
+        # Parts are only reserved once the job has a day on the plan
+        for part in parts:
+            if part in missing:
+                shortfall[part] = shortfall.get(part, 0) + 1
+            else:
+                stock[part] -= 1
+        remaining[day] -= 1
+        if remaining[day] == 0:
+            free_before[day] = day - 1
+            free_after[day] = day + 1
+        schedule.append({
+            "equipment_id": job["equipment_id"],
+            "equipment_type": equipment_type,
+            "date": (start + timedelta(days=day)).isoformat(),
+            "day": day,
+            "due_day": due,
+            "days_late": max(0, day - due),
+            "type": job["maintenance_type"],
+            "urgency": job["urgency"],
+            "parts_missing": missing,
+            "failure_probability": round(job["failure_probability"], 3),
+        })
+
+    schedule.sort(key=lambda row: (row["day"], URGENCY_RANK[row["urgency"]]))
+    urgency_counts = {urgency: 0 for urgency in URGENCY_RANK}
+    for job in assessments:
+        urgency_counts[job["urgency"]] += 1
+
+    return {
+        "start_date": start.isoformat(),
+        "horizon_days": horizon,
+        "daily_capacity": capacity,
+        "fleet_size": len(assessments),
+        "urgency_counts": urgency_counts,
+        "expected_failures_30_day": round(
+            sum(job["failure_probability_30_day"] - job["failure_probability"] for job in assessments), 2
+        ),
+        "schedule": schedule,
+        "daily_load": [
+            {"day": day, "date": (start + timedelta(days=day)).isoformat(), "jobs": capacity - left}
+            for day, left in enumerate(remaining) if left < capacity
+        ],
+        "late_jobs": sum(1 for row in schedule if row["days_late"] > 0),
+        "over_capacity": overflow,
+        "deferred_beyond_horizon": deferred,
+        "parts_shortfall": shortfall,
+    }
+
+
 if __name__ == "__main__":
     import json
     result = calculate_maintenance(
@@ -7,10 +7,19 @@ using actuarial methods including PBO and ABO.
 
 import csv
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+    from skill_runtime import scenarios as scenario_engine
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
+    scenario_engine = None
 
+
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -34,6 +43,7 @@ def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[st
     return result
 
 
+@cached_reference_loader
 def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     """Load a CSV file and return as list of dictionaries."""
     csv_path = Path(__file__).parent / filename
@@ -56,6 +66,7 @@ def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     return result
 
 
+@cached_reference_loader
 def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
     """Load parameters CSV as key-value dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -81,6 +92,7 @@ def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
                     result[key] = value
     return result
 
+@cached_reference_loader
 def load_key_value_csv(filename: str) -> Dict[str, Any]:
     """Load a key-value CSV file as a flat dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -127,88 +139,193 @@ def load_pension_assumptions() -> Dict[str, Any]:
     }
 
 
-def calculate_pbo(
-    participant_data: List[Dict],
-    plan_provisions: Dict,
-    assumptions: Dict
-) -> Dict[str, Any]:
-    """Calculate Projected Benefit Obligation."""
-    discount_rate = assumptions.get("discount_rate", 0.055)
-    salary_growth = assumptions.get("salary_growth", 0.03)
-    formula = plan_provisions.get("formula", "final_average")
-    benefit_pct = plan_provisions.get("benefit_pct", 0.015)
+# Benefits are paid as a 20-year annuity certain from retirement
+PAYOUT_YEARS = 20
 
-    total_pbo = 0
-    participant_details = []
+# Participants are assumed to retire at 65
+RETIREMENT_AGE = 65
 
-    for participant in participant_data:
-        age = participant.get("age", 55)
-        service_years = participant.get("service_years", 0)
-        current_salary = participant.get("salary", 0)
 
-        # Project salary to retirement (assume age 65)
-        years_to_retirement = max(0, 65 - age)
-        projected_salary = current_salary * ((1 + salary_growth) ** years_to_retirement)
+def annuity_factor(discount_rate: float, years: int = PAYOUT_YEARS) -> float:
+    """Present value of 1 per year for `years` years at discount_rate."""
+    if discount_rate == 0:
+        return float(years)
+    return (1 - (1 + discount_rate) ** -years) / discount_rate
 
-        # Calculate annual benefit
-        if formula == "final_average":
-            annual_benefit = projected_salary * benefit_pct * (service_years + years_to_retirement)
-        else:
-            annual_benefit = current_salary * benefit_pct * service_years
 
-        # Calculate PV of benefits
-        # Simplified: assume 20-year payout at retirement
-        annuity_factor = (1 - (1 + discount_rate) ** -20) / discount_rate
-        pv_at_retirement = annual_benefit * annuity_factor
+class PensionCensus:
+    """
+    Columnar participant census for whole-plan valuation.
+
+    Participants are stored as parallel columns and aggregated by years to
+    retirement. Both the PBO (projected salary, projected service) and the
+    ABO (current salary, current service) are sums over participants of
+    salary * service-like terms times factors that depend only on years to
+    retirement, so a valuation is one pass over the distinct retirement
+    horizons (a few dozen for a real plan) instead of one pass over every
+    life. Revaluing under shocked assumptions reuses the aggregates.
+    """
 
-        # Discount to current date
-        pbo_participant = pv_at_retirement / ((1 + discount_rate) ** years_to_retirement)
+    def __init__(
+        self,
+        ids: List[Any],
+        ages: List[float],
+        service_years: List[float],
+        salaries: List[float]
+    ):
+        if not len(ids) == len(ages) == len(service_years) == len(salaries):
+            raise ValueError("Census columns must have the same length")
+        self.ids = ids
+        self.ages = ages
+        self.service_years = service_years
+        self.salaries = salaries
+        self._groups: Dict[float, Dict[float, List[float]]] = {}
+
+    @classmethod
+    def from_records(cls, participant_data: List[Dict]) -> "PensionCensus":
+        """Build a census from participant dictionaries (id, age, service_years, salary)."""
+        return cls(
+            [p.get("id", "unknown") for p in participant_data],
+            [p.get("age", 55) for p in participant_data],
+            [p.get("service_years", 0) for p in participant_data],
+            [p.get("salary", 0) for p in participant_data]
+        )
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, List[Any]]) -> "PensionCensus":
+        """Build a census from parallel columns (age, service_years, salary, optional id)."""
+        ages = columns["age"]
+        return cls(
+            columns.get("id") or [f"P{i + 1}" for i in range(len(ages))],
+            ages,
+            columns["service_years"],
+            columns["salary"]
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def horizon_groups(self, retirement_age: float) -> Dict[float, List[float]]:
+        """
+        Aggregates keyed by years to retirement.
+
+        Each value is [sum of salary, sum of salary * service]; built once
+        per retirement age.
+        """
+        groups = self._groups.get(retirement_age)
+        if groups is None:
+            groups = {}
+            for age, service, salary in zip(self.ages, self.service_years, self.salaries):
+                years = max(0, retirement_age - age)
+                totals = groups.setdefault(years, [0.0, 0.0])
+                totals[0] += salary
+                totals[1] += salary * service
+            self._groups[retirement_age] = groups
+        return groups
+
+    def value(
+        self,
+        plan_provisions: Dict,
+        assumptions: Dict
+    ) -> Dict[str, float]:
+        """
+        Value the whole census.
+
+        Args:
+            plan_provisions: Benefit formula details
+            assumptions: Valuation assumptions (discount_rate, salary_growth)
+
+        Returns:
+            Dictionary with unrounded pbo and abo
+        """
+        discount_rate = assumptions.get("discount_rate", 0.055)
+        salary_growth = assumptions.get("salary_growth", 0.03)
+        retirement_age = RETIREMENT_AGE
+        formula = plan_provisions.get("formula", "final_average")
+        benefit_pct = plan_provisions.get("benefit_pct", 0.015)
+
+        pbo = 0.0
+        abo = 0.0
+        for years, (salary_total, salary_service_total) in self.horizon_groups(retirement_age).items():
+            discount = (1 + discount_rate) ** -years
+            abo += salary_service_total * discount
+            if formula == "final_average":
+                # salary * (1+g)^y * (service + y), summed over the group
+                growth = (1 + salary_growth) ** years
+                pbo += (salary_service_total + years * salary_total) * growth * discount
+            else:
+                pbo += salary_service_total * discount
+
+        scale = benefit_pct * annuity_factor(discount_rate)
+        return {"pbo": pbo * scale, "abo": abo * scale}
+
+    def participant_details(
+        self,
+        plan_provisions: Dict,
+        assumptions: Dict,
+        limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Per-participant PBO breakdown for the first `limit` participants."""
+        discount_rate = assumptions.get("discount_rate", 0.055)
+        salary_growth = assumptions.get("salary_growth", 0.03)
+        retirement_age = RETIREMENT_AGE
+        formula = plan_provisions.get("formula", "final_average")
+        benefit_pct = plan_provisions.get("benefit_pct", 0.015)
+        factor = annuity_factor(discount_rate)
+
+        details = []
+        for i in range(min(limit, len(self))):
+            years_to_retirement = max(0, retirement_age - self.ages[i])
+            salary = self.salaries[i]
+            projected_salary = salary * ((1 + salary_growth) ** years_to_retirement)
+            if formula == "final_average":
+                annual_benefit = projected_salary * benefit_pct * (self.service_years[i] + years_to_retirement)
+            else:
+                annual_benefit = salary * benefit_pct * self.service_years[i]
+            details.append({
+                "participant_id": self.ids[i],
+                "projected_salary": round(projected_salary, 2),
+                "annual_benefit": round(annual_benefit, 2),
+                "pbo": round(annual_benefit * factor / ((1 + discount_rate) ** years_to_retirement), 2)
+            })
+        return details
+
+
+def as_census(participant_data: Union[List[Dict], Dict[str, List], PensionCensus]) -> PensionCensus:
+    """Accept a participant list, a dictionary of columns or a built census."""
+    if isinstance(participant_data, PensionCensus):
+        return participant_data
+    if isinstance(participant_data, dict):
+        return PensionCensus.from_columns(participant_data)
+    return PensionCensus.from_records(participant_data)
 
-        participant_details.append({
-            "participant_id": participant.get("id", "unknown"),
-            "projected_salary": round(projected_salary, 2),
-            "annual_benefit": round(annual_benefit, 2),
-            "pbo": round(pbo_participant, 2)
-        })
 
-        total_pbo += pbo_participant
+def calculate_pbo(
+    participant_data: Union[List[Dict], Dict[str, List], PensionCensus],
+    plan_provisions: Dict,
+    assumptions: Dict
+) -> Dict[str, Any]:
+    """Calculate Projected Benefit Obligation."""
+    census = as_census(participant_data)
+    valuation = census.value(plan_provisions, assumptions)
 
     return {
-        "total_pbo": round(total_pbo, 2),
-        "participant_count": len(participant_data),
-        "participant_details": participant_details[:5]  # First 5 for sample
+        "total_pbo": round(valuation["pbo"], 2),
+        "participant_count": len(census),
+        "participant_details": census.participant_details(plan_provisions, assumptions)
     }
 
 
 def calculate_abo(
-    participant_data: List[Dict],
+    participant_data: Union[List[Dict], Dict[str, List], PensionCensus],
     plan_provisions: Dict,
     assumptions: Dict
 ) -> Dict[str, Any]:
     """Calculate Accumulated Benefit Obligation."""
-    discount_rate = assumptions.get("discount_rate", 0.055)
-    benefit_pct = plan_provisions.get("benefit_pct", 0.015)
-
-    total_abo = 0
-
-    for participant in participant_data:
-        age = participant.get("age", 55)
-        service_years = participant.get("service_years", 0)
-        current_salary = participant.get("salary", 0)
-
-        # ABO uses current salary and current service
-        annual_benefit = current_salary * benefit_pct * service_years
-
-        # Calculate PV
-        years_to_retirement = max(0, 65 - age)
-        annuity_factor = (1 - (1 + discount_rate) ** -20) / discount_rate
-        pv_at_retirement = annual_benefit * annuity_factor
-        abo_participant = pv_at_retirement / ((1 + discount_rate) ** years_to_retirement)
-
-        total_abo += abo_participant
+    valuation = as_census(participant_data).value(plan_provisions, assumptions)
 
     return {
-        "total_abo": round(total_abo, 2)
+        "total_abo": round(valuation["abo"], 2)
     }
 
 
@@ -272,37 +389,56 @@ def calculate_pension_expense(
 
 
 def sensitivity_analysis(
+    participant_data: Union[List[Dict], Dict[str, List], PensionCensus],
+    plan_provisions: Dict,
+    assumptions: Dict,
     pbo: float,
-    assumptions: Dict
+    shock: float = 0.005
 ) -> Dict[str, Any]:
-    """Analyze sensitivity to assumption changes."""
-    discount_rate = assumptions.get("discount_rate", 0.055)
+    """
+    Analyze sensitivity to assumption changes.
 
-    # 50bp change in discount rate
-    discount_sensitivity = pbo * 0.10  # Approximate 10% impact per 50bp
+    PBO is revalued under each shocked assumption rather than approximated
+    with a fixed percentage impact.
+    """
+    census = as_census(participant_data)
+    discount_rate = assumptions.get("discount_rate", 0.055)
+    salary_growth = assumptions.get("salary_growth", 0.03)
 
-    # 50bp change in salary growth
-    salary_sensitivity = pbo * 0.03  # Approximate 3% impact
+    def shocked_pbo(discount_rate: float, salary_growth: float) -> float:
+        shocked = {**assumptions, "discount_rate": discount_rate, "salary_growth": salary_growth}
+        return round(census.value(plan_provisions, shocked)["pbo"], 2)
 
-    return {
-        "discount_rate_50bp_decrease": {
-            "pbo_impact": round(discount_sensitivity, 2),
-            "pbo_impact_pct": 10.0
-        },
-        "discount_rate_50bp_increase": {
-            "pbo_impact": round(-discount_sensitivity, 2),
-            "pbo_impact_pct": -10.0
-        },
-        "salary_growth_50bp_increase": {
-            "pbo_impact": round(salary_sensitivity, 2),
-            "pbo_impact_pct": 3.0
+    def impact(shocked_value: float) -> Dict[str, float]:
+        return {
+            "pbo": round(shocked_value, 2),
+            "pbo_impact": round(shocked_value - pbo, 2),
+            "pbo_impact_pct": round((shocked_value / pbo - 1) * 100, 2) if pbo else 0.0
         }
+
+    results = {
+        "discount_rate_50bp_decrease": impact(shocked_pbo(discount_rate - shock, salary_growth)),
+        "discount_rate_50bp_increase": impact(shocked_pbo(discount_rate + shock, salary_growth)),
+        "salary_growth_50bp_decrease": impact(shocked_pbo(discount_rate, salary_growth - shock)),
+        "salary_growth_50bp_increase": impact(shocked_pbo(discount_rate, salary_growth + shock))
     }
 
+    if scenario_engine is not None:
+        results["tornado"] = scenario_engine.round_floats(scenario_engine.tornado(
+            shocked_pbo,
+            {"discount_rate": discount_rate, "salary_growth": salary_growth},
+            {
+                "discount_rate": (discount_rate - shock, discount_rate + shock),
+                "salary_growth": (salary_growth - shock, salary_growth + shock)
+            }
+        ), 4)
+
+    return results
+
 
 def calculate_pension(
     plan_id: str,
-    participant_data: List[Dict],
+    participant_data: Union[List[Dict], Dict[str, List]],
     plan_provisions: Dict,
     actuarial_assumptions: Dict,
     asset_values: Dict,
@@ -319,7 +455,8 @@ def calculate_pension(
 
     Args:
         plan_id: Plan identifier
-        participant_data: Participant census
+        participant_data: Participant census, as a list of participants or
+            as columns {"age": [...], "service_years": [...], "salary": [...]}
         plan_provisions: Benefit formula details
         actuarial_assumptions: Valuation assumptions
         asset_values: Plan asset data
@@ -333,16 +470,19 @@ def calculate_pension(
     # Override with provided assumptions
     calc_assumptions = {**assumptions.get("default_assumptions", {}), **actuarial_assumptions}
 
+    # Columnar census, valued once per assumption set
+    census = as_census(participant_data)
+
     # Calculate PBO
     pbo_result = calculate_pbo(
-        participant_data,
+        census,
         plan_provisions,
         calc_assumptions
     )
 
     # Calculate ABO
     abo_result = calculate_abo(
-        participant_data,
+        census,
         plan_provisions,
         calc_assumptions
     )
@@ -362,8 +502,10 @@ def calculate_pension(
 
     # Sensitivity analysis
     sensitivity = sensitivity_analysis(
-        pbo_result["total_pbo"],
-        calc_assumptions
+        census,
+        plan_provisions,
+        calc_assumptions,
+        pbo_result["total_pbo"]
     )
 
     return {
@@ -7,11 +7,19 @@ and concentration analysis for wealth management.
 
 import csv
 import math
+import random
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from statistics import NormalDist
+from typing import Dict, List, Any, Optional, Tuple
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
 
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -35,6 +43,7 @@ def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[st
     return result
 
 
+@cached_reference_loader
 def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     """Load a CSV file and return as list of dictionaries."""
     csv_path = Path(__file__).parent / filename
@@ -57,6 +66,7 @@ def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     return result
 
 
+@cached_reference_loader
 def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
     """Load parameters CSV as key-value dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -82,6 +92,7 @@ def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
                     result[key] = value
     return result
 
+@cached_reference_loader
 def load_key_value_csv(filename: str) -> Dict[str, Any]:
     """Load a key-value CSV file as a flat dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -122,6 +133,22 @@ def load_market_data() -> Dict[str, Any]:
     }
 
 
+# Published z-values kept for the standard confidence levels
+Z_SCORES = {0.95: 1.645, 0.99: 2.326}
+
+TRADING_DAYS = 252
+
+# Sectors treated as bonds for the equity/bond correlation
+BOND_SECTORS = {"fixed_income"}
+
+
+def z_score(confidence: float) -> float:
+    """One-sided standard normal quantile for a confidence level."""
+    if confidence in Z_SCORES:
+        return Z_SCORES[confidence]
+    return NormalDist().inv_cdf(confidence)
+
+
 def calculate_position_var(
     value: float,
     volatility: float,
@@ -129,44 +156,425 @@ def calculate_position_var(
     days: int = 1
 ) -> float:
     """Calculate parametric VaR for a position."""
-    # Z-scores for confidence levels
-    z_scores = {0.95: 1.645, 0.99: 2.326}
-    z = z_scores.get(confidence, 1.645)
-
     # Daily to period conversion
-    var = value * volatility * z * math.sqrt(days / 252)
+    var = value * volatility * z_score(confidence) * math.sqrt(days / TRADING_DAYS)
     return var
 
 
-def calculate_portfolio_volatility(
-    positions: List[Dict],
-    market_data: Dict
+def calculate_position_cvar(
+    value: float,
+    volatility: float,
+    confidence: float,
+    days: int = 1
 ) -> float:
-    """Calculate portfolio volatility with correlations."""
-    if not positions:
-        return 0.0
+    """Calculate parametric CVaR (expected shortfall) for a normal position."""
+    z = NormalDist().inv_cdf(confidence)
+    tail = NormalDist().pdf(z) / (1 - confidence)
+    return value * volatility * tail * math.sqrt(days / TRADING_DAYS)
 
-    total_value = sum(p.get("value", 0) for p in positions)
-    if total_value == 0:
-        return 0.0
 
-    # Calculate weighted average volatility (simplified)
-    weighted_vol = 0
+def sector_correlation(sector_a: str, sector_b: str, correlations: Dict[str, float]) -> float:
+    """
+    Look up the correlation between two sectors for one regime.
+
+    Named pairs (e.g. ``technology_energy``) are matched in either order;
+    otherwise equity/bond pairs use ``equity_bonds``, same-sector pairs use
+    ``same_sector`` and remaining pairs fall back to ``equity_equity``.
+    """
+    if sector_a == sector_b:
+        return correlations.get("same_sector", 1.0)
+    for key in (f"{sector_a}_{sector_b}", f"{sector_b}_{sector_a}"):
+        if key in correlations:
+            return correlations[key]
+    if (sector_a in BOND_SECTORS) != (sector_b in BOND_SECTORS):
+        return correlations.get("equity_bonds", 0.0)
+    return correlations.get("equity_equity", 0.0)
+
+
+def cholesky(matrix: List[List[float]]) -> List[List[float]]:
+    """
+    Lower-triangular Cholesky factor of a symmetric matrix.
+
+    Non-positive pivots (a matrix that is not quite positive definite) are
+    floored at zero, which drops the degenerate direction instead of failing.
+    """
+    n = len(matrix)
+    lower = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1):
+            total = matrix[i][j] - sum(lower[i][k] * lower[j][k] for k in range(j))
+            if i == j:
+                lower[i][j] = math.sqrt(total) if total > 0 else 0.0
+            else:
+                lower[i][j] = total / lower[j][j] if lower[j][j] > 0 else 0.0
+    return lower
+
+
+def symmetric_eigen(matrix: List[List[float]], sweeps: int = 50) -> Tuple[List[float], List[List[float]]]:
+    """
+    Eigen-decomposition of a small symmetric matrix (cyclic Jacobi rotations).
+
+    Returns:
+        Tuple of (eigenvalues, eigenvectors as columns)
+    """
+    n = len(matrix)
+    a = [row[:] for row in matrix]
+    v = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
+    for _ in range(sweeps):
+        off = sum(a[i][j] ** 2 for i in range(n) for j in range(n) if i != j)
+        if off < 1e-22:
+            break
+        for p in range(n - 1):
+            for q in range(p + 1, n):
+                if abs(a[p][q]) < 1e-15:
+                    continue
+                theta = (a[q][q] - a[p][p]) / (2 * a[p][q])
+                t = math.copysign(1.0, theta) / (abs(theta) + math.sqrt(theta * theta + 1))
+                c = 1 / math.sqrt(t * t + 1)
+                s = t * c
+                for k in range(n):
+                    akp, akq = a[k][p], a[k][q]
+                    a[k][p], a[k][q] = c * akp - s * akq, s * akp + c * akq
+                for k in range(n):
+                    apk, aqk = a[p][k], a[q][k]
+                    a[p][k], a[q][k] = c * apk - s * aqk, s * apk + c * aqk
+                for k in range(n):
+                    vkp, vkq = v[k][p], v[k][q]
+                    v[k][p], v[k][q] = c * vkp - s * vkq, s * vkp + c * vkq
+    return [a[i][i] for i in range(n)], v
+
+
+def nearest_correlation(matrix: List[List[float]], floor: float = 1e-10) -> List[List[float]]:
+    """
+    Repair a correlation matrix that is not positive semidefinite.
+
+    Negative eigenvalues are clipped and the result rescaled to a unit
+    diagonal. Valid matrices are returned unchanged.
+    """
+    values, vectors = symmetric_eigen(matrix)
+    if min(values) >= -floor:
+        return [row[:] for row in matrix]
+
+    n = len(matrix)
+    clipped = [max(value, floor) for value in values]
+    rebuilt = [
+        [sum(vectors[i][k] * clipped[k] * vectors[j][k] for k in range(n)) for j in range(n)]
+        for i in range(n)
+    ]
+    scale = [math.sqrt(rebuilt[i][i]) for i in range(n)]
+    return [[rebuilt[i][j] / (scale[i] * scale[j]) for j in range(n)] for i in range(n)]
+
+
+class PortfolioRiskModel:
+    """
+    Covariance model of a portfolio built from the securities' market data.
+
+    Each security's annual return is its volatility times a mix of a sector
+    factor and an idiosyncratic shock, so two securities correlate at the
+    sector-pair correlation (``same_sector`` within a sector). The covariance
+    of N positions then reduces to per-sector sums, computed once:
+
+        X_s = sum of value * vol over the sector's positions
+        Q_s = sum of (value * vol)^2 over the sector's securities
+
+        variance = sum_s,t rho_st X_s X_t + sum_s (1 - rho_ss) Q_s
+
+    which is the exact quadratic form w' Sigma w in O(N + S^2) instead of
+    O(N^2). Lots of the same ticker are one security, so their exposures
+    are netted before squaring. The decomposition is reused for every
+    confidence level, method, correlation regime and stress scenario.
+
+    Published sector correlations need not be mutually consistent; each
+    regime's matrix is repaired once to the nearest valid correlation matrix
+    so that parametric and simulated results describe the same covariance.
+    """
+
+    def __init__(self, positions: List[Dict], market_data: Dict):
+        securities = market_data["securities"]
+        self.correlation_regimes = market_data.get("correlation_matrix", {})
+        self.total_value = 0
+        self.sector_exposure: Dict[str, float] = {}
+        self.sector_square_exposure: Dict[str, float] = {}
+        self.position_sectors: List[str] = []
+        self.position_exposures: List[float] = []
+        self.position_tickers: List[str] = []
+        self.ticker_exposure: Dict[str, float] = {}
+        ticker_sectors: Dict[str, str] = {}
+
+        for pos in positions:
+            value = pos.get("value", 0)
+            ticker = pos.get("ticker", "")
+            security = securities.get(ticker, securities["default"])
+            sector = security.get("sector", "unknown")
+            exposure = value * security["volatility"]
+
+            self.total_value += value
+            self.sector_exposure[sector] = self.sector_exposure.get(sector, 0.0) + exposure
+            self.ticker_exposure[ticker] = self.ticker_exposure.get(ticker, 0.0) + exposure
+            ticker_sectors[ticker] = sector
+            self.position_sectors.append(sector)
+            self.position_exposures.append(exposure)
+            self.position_tickers.append(ticker)
+
+        for ticker, exposure in self.ticker_exposure.items():
+            sector = ticker_sectors[ticker]
+            self.sector_square_exposure[sector] = (
+                self.sector_square_exposure.get(sector, 0.0) + exposure * exposure
+            )
+
+        self.sectors = sorted(self.sector_exposure)
+        self._correlations: Dict[str, List[List[float]]] = {}
+        self._factor_correlations: Dict[str, List[List[float]]] = {}
+        self._factor_loadings: Dict[str, Tuple[List[List[float]], List[float]]] = {}
+
+    def correlations(self, regime: str = "normal") -> List[List[float]]:
+        """
+        Sector-by-sector correlation matrix for a regime (cached).
+
+        Off-diagonal entries are position-to-position correlations across
+        sectors; the diagonal holds the within-sector correlation.
+        """
+        if regime not in self._correlations:
+            pairs = self.correlation_regimes.get(regime, self.correlation_regimes.get("normal", {}))
+            raw = [[sector_correlation(a, b, pairs) for b in self.sectors] for a in self.sectors]
+
+            # Positions load sqrt(rho_ss) on their sector factor, so the
+            # factors correlate at rho_st / sqrt(rho_ss * rho_tt)
+            n = len(self.sectors)
+            loading = [math.sqrt(max(raw[i][i], 0.0)) for i in range(n)]
+            factor_corr = nearest_correlation([
+                [
+                    1.0 if i == j else (
+                        raw[i][j] / (loading[i] * loading[j]) if loading[i] and loading[j] else 0.0
+                    )
+                    for j in range(n)
+                ]
+                for i in range(n)
+            ])
+            self._factor_correlations[regime] = factor_corr
+            self._correlations[regime] = [
+                [raw[i][i] if i == j else factor_corr[i][j] * loading[i] * loading[j] for j in range(n)]
+                for i in range(n)
+            ]
+        return self._correlations[regime]
+
+    def variance(self, regime: str = "normal") -> float:
+        """Annual variance of portfolio value (currency units squared)."""
+        rho = self.correlations(regime)
+        exposure = [self.sector_exposure[s] for s in self.sectors]
+        variance = 0.0
+        for i, sector in enumerate(self.sectors):
+            variance += sum(rho[i][j] * exposure[i] * exposure[j] for j in range(len(self.sectors)))
+            variance += (1 - rho[i][i]) * self.sector_square_exposure[sector]
+        return max(variance, 0.0)
+
+    def volatility(self, regime: str = "normal") -> float:
+        """Annualized portfolio volatility as a fraction of total value."""
+        if self.total_value <= 0:
+            return 0.0
+        return math.sqrt(self.variance(regime)) / self.total_value
+
+    def component_var(self, confidence: float, days: int, regime: str = "normal") -> List[float]:
+        """
+        Euler allocation of parametric VaR to positions (sums to portfolio VaR).
+
+        Args:
+            confidence: Confidence level, e.g. 0.95
+            days: Horizon in trading days
+            regime: Correlation regime
+
+        Returns:
+            Component VaR per position, in input order
+        """
+        sigma = math.sqrt(self.variance(regime))
+        if sigma == 0:
+            return [0.0] * len(self.position_exposures)
+
+        rho = self.correlations(regime)
+        index = {sector: i for i, sector in enumerate(self.sectors)}
+        exposure = [self.sector_exposure[s] for s in self.sectors]
+        # Covariance of each sector's factor with the whole portfolio
+        sector_cov = [
+            sum(rho[i][j] * exposure[j] for j in range(len(self.sectors)))
+            for i in range(len(self.sectors))
+        ]
+        scale = z_score(confidence) * math.sqrt(days / TRADING_DAYS) / sigma
+        # A lot's idiosyncratic risk is shared with the other lots of its ticker
+        return [
+            x * (sector_cov[index[sector]] + (1 - rho[index[sector]][index[sector]]) * self.ticker_exposure[ticker])
+            * scale
+            for sector, ticker, x in zip(self.position_sectors, self.position_tickers, self.position_exposures)
+        ]
+
+    def parametric_var(self, confidence: float, days: int, regime: str = "normal") -> Dict[str, float]:
+        """Normal (variance-covariance) VaR and CVaR over the horizon."""
+        vol = self.volatility(regime)
+        return {
+            "var": calculate_position_var(self.total_value, vol, confidence, days),
+            "cvar": calculate_position_cvar(self.total_value, vol, confidence, days),
+        }
+
+    def factor_loadings(self, regime: str = "normal") -> Tuple[List[List[float]], List[float]]:
+        """
+        Cholesky factor of the sector factor correlations and the idiosyncratic
+        standard deviation per sector, for simulation (cached per regime).
+        """
+        if regime not in self._factor_loadings:
+            rho = self.correlations(regime)
+            n = len(self.sectors)
+            loading = [math.sqrt(max(rho[i][i], 0.0)) for i in range(n)]
+            lower = cholesky(self._factor_correlations[regime])
+            systematic = [
+                [lower[i][k] * loading[i] * self.sector_exposure[s] for k in range(n)]
+                for i, s in enumerate(self.sectors)
+            ]
+            idiosyncratic = [
+                math.sqrt(max(1 - rho[i][i], 0.0) * self.sector_square_exposure[s])
+                for i, s in enumerate(self.sectors)
+            ]
+            self._factor_loadings[regime] = (systematic, idiosyncratic)
+        return self._factor_loadings[regime]
+
+    def simulate_pnl(
+        self,
+        simulations: int,
+        days: int,
+        regime: str = "normal",
+        seed: Optional[int] = None
+    ) -> List[float]:
+        """
+        Monte Carlo portfolio P&L over the horizon.
+
+        The idiosyncratic shocks of a sector's positions are summed analytically
+        into one normal draw per sector, so each scenario costs O(S^2)
+        regardless of the number of positions.
+        """
+        systematic, idiosyncratic = self.factor_loadings(regime)
+        n = len(self.sectors)
+        horizon = math.sqrt(days / TRADING_DAYS)
+        rng = random.Random(seed)
+        gauss = rng.gauss
+
+        # Collapse the factor loadings to one coefficient per independent draw
+        factor_weights = [sum(systematic[i][k] for i in range(n)) * horizon for k in range(n)]
+        idio_weights = [sd * horizon for sd in idiosyncratic]
+
+        pnl = []
+        for _ in range(simulations):
+            total = 0.0
+            for k in range(n):
+                total += factor_weights[k] * gauss(0.0, 1.0) + idio_weights[k] * gauss(0.0, 1.0)
+            pnl.append(total)
+        return pnl
+
+    def monte_carlo_var(
+        self,
+        confidence: float,
+        days: int,
+        regime: str = "normal",
+        simulations: int = 10000,
+        seed: Optional[int] = None
+    ) -> Dict[str, float]:
+        """Monte Carlo VaR and CVaR over the horizon."""
+        return tail_risk(self.simulate_pnl(simulations, days, regime, seed), confidence)
+
+
+def tail_risk(pnl: List[float], confidence: float) -> Dict[str, float]:
+    """
+    Empirical VaR and CVaR of a P&L sample (losses reported as positive).
+
+    Args:
+        pnl: Profit and loss outcomes
+        confidence: Confidence level, e.g. 0.95
+
+    Returns:
+        Dictionary with var and cvar
+    """
+    if not pnl:
+        return {"var": 0.0, "cvar": 0.0}
+    losses = sorted((-x for x in pnl), reverse=True)
+    tail_count = max(1, int(math.ceil(len(losses) * (1 - confidence))))
+    tail = losses[:tail_count]
+    return {"var": max(tail[-1], 0.0), "cvar": max(sum(tail) / tail_count, 0.0)}
+
+
+def historical_pnl(
+    positions: List[Dict],
+    return_history: Dict[str, List[float]]
+) -> Tuple[List[float], List[str]]:
+    """
+    Daily portfolio P&L replayed from aligned daily return series.
+
+    Position values are first netted per ticker, so the replay costs
+    O(tickers x days) however many lines the book has.
+
+    Args:
+        positions: Position holdings with ticker and value
+        return_history: Daily returns per ticker, all series aligned by date
+
+    Returns:
+        Tuple of (daily P&L, tickers without history)
+    """
+    ticker_values: Dict[str, float] = {}
     for pos in positions:
         ticker = pos.get("ticker", "")
-        value = pos.get("value", 0)
-        weight = value / total_value
+        ticker_values[ticker] = ticker_values.get(ticker, 0) + pos.get("value", 0)
+
+    missing = []
+    daily_pnl: List[float] = []
+    for ticker, value in ticker_values.items():
+        series = return_history.get(ticker)
+        if not series:
+            missing.append(ticker)
+            continue
+        if not daily_pnl:
+            daily_pnl = [0.0] * len(series)
+        for t, r in enumerate(series[:len(daily_pnl)]):
+            daily_pnl[t] += value * r
+    return daily_pnl, missing
+
+
+def calculate_historical_var(
+    positions: List[Dict],
+    return_history: Dict[str, List[float]],
+    confidence: float,
+    days: int = 1
+) -> Dict[str, Any]:
+    """
+    Historical-simulation VaR and CVaR from aligned daily return series.
 
-        security = market_data["securities"].get(ticker, market_data["securities"]["default"])
-        vol = security["volatility"]
+    Daily portfolio P&L is the value-weighted sum of each position's daily
+    returns; the one-day result is scaled by sqrt(days).
 
-        weighted_vol += weight * vol
+    Args:
+        positions: Position holdings with ticker and value
+        return_history: Daily returns per ticker, all series aligned by date
+        confidence: Confidence level, e.g. 0.95
+        days: Horizon in trading days
 
-    # Apply diversification benefit (simplified)
-    n_positions = len(positions)
-    diversification = 1 - (0.1 * min(n_positions - 1, 10))
+    Returns:
+        Dictionary with var, cvar, observations and tickers lacking history
+    """
+    daily_pnl, missing = historical_pnl(positions, return_history)
+    risk = tail_risk(daily_pnl, confidence)
+    scale = math.sqrt(days)
+    return {
+        "var": risk["var"] * scale,
+        "cvar": risk["cvar"] * scale,
+        "observations": len(daily_pnl),
+        "positions_without_history": missing,
+    }
 
-    return weighted_vol * diversification
+
+def calculate_portfolio_volatility(
+    positions: List[Dict],
+    market_data: Dict,
+    regime: str = "normal"
+) -> float:
+    """Calculate annualized portfolio volatility from the sector covariance model."""
+    if not positions:
+        return 0.0
+    return PortfolioRiskModel(positions, market_data).volatility(regime)
 
 
 def check_concentration(
@@ -243,13 +651,18 @@ def calculate_portfolio_risk(
     client_risk_profile: str,
     time_horizon: str,
     benchmark: str,
-    stress_scenario: str
+    stress_scenario: str,
+    var_methods: Optional[List[str]] = None,
+    return_history: Optional[Dict[str, List[float]]] = None,
+    simulations: Optional[int] = None,
+    seed: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Calculate portfolio risk metrics.
 
     Business Rules:
-    1. VaR using historical simulation with scaling
+    1. VaR from a sector covariance model (parametric, Monte Carlo or
+       historical simulation) scaled to the horizon
     2. Concentration limits by risk profile
     3. Dynamic correlation in stress
     4. Liquidity scoring
@@ -261,6 +674,11 @@ def calculate_portfolio_risk(
         time_horizon: Investment horizon
         benchmark: Benchmark index
         stress_scenario: Stress test scenario
+        var_methods: Extra VaR/CVaR methods to report: "parametric",
+            "monte_carlo", "historical" (default: parametric only)
+        return_history: Aligned daily returns per ticker, for "historical"
+        simulations: Monte Carlo scenarios (default: parameters.csv)
+        seed: Random seed for reproducible Monte Carlo results
 
     Returns:
         Risk metrics and alerts
@@ -275,22 +693,60 @@ def calculate_portfolio_risk(
         market_data["risk_profiles"]["moderate"]
     )
 
+    # Build the covariance model once; stressed runs reuse it with the stress correlations
+    model = PortfolioRiskModel(positions, market_data)
+    regime = "normal" if stress_scenario == "none" else "stress"
+    stress_multipliers = market_data["stress_scenarios"]
+
     # Calculate portfolio volatility
-    portfolio_vol = calculate_portfolio_volatility(positions, market_data)
+    portfolio_vol = model.volatility()
 
     # Time horizon adjustment
     horizon_days = {"short": 21, "medium": 63, "long": 252}.get(time_horizon, 63)
 
     # Calculate VaR
-    var_95 = calculate_position_var(total_value, portfolio_vol, 0.95, horizon_days)
-    var_99 = calculate_position_var(total_value, portfolio_vol, 0.99, horizon_days)
+    var_95 = model.parametric_var(0.95, horizon_days, regime)["var"]
+    var_99 = model.parametric_var(0.99, horizon_days, regime)["var"]
 
     # Apply stress scenario
-    stress_multipliers = market_data["stress_scenarios"]
     if stress_scenario != "none":
         var_95 = apply_stress_scenario(var_95, stress_scenario, stress_multipliers)
         var_99 = apply_stress_scenario(var_99, stress_scenario, stress_multipliers)
 
+    # Additional VaR/CVaR methods; each P&L sample is generated once for both levels
+    var_analysis = {}
+    for method in var_methods or []:
+        results = {}
+        if method == "monte_carlo":
+            pnl = model.simulate_pnl(
+                simulations or market_data.get("monte_carlo_simulations", 10000),
+                horizon_days, regime, seed
+            )
+        elif method == "historical":
+            if not return_history:
+                raise ValueError("Historical VaR requires return_history")
+            pnl, missing = historical_pnl(positions, return_history)
+            # Scale one-day outcomes to the horizon
+            pnl = [x * math.sqrt(horizon_days) for x in pnl]
+            results["observations"] = len(pnl)
+            results["positions_without_history"] = missing
+        elif method != "parametric":
+            raise ValueError(f"Unknown VaR method: {method}")
+
+        for confidence in (0.95, 0.99):
+            if method == "parametric":
+                risk = model.parametric_var(confidence, horizon_days, regime)
+            else:
+                risk = tail_risk(pnl, confidence)
+
+            label = int(round(confidence * 100))
+            for measure in ("var", "cvar"):
+                amount = risk[measure]
+                if stress_scenario != "none":
+                    amount = apply_stress_scenario(amount, stress_scenario, stress_multipliers)
+                results[f"{measure}_{label}"] = round(amount, 2)
+        var_analysis[method] = results
+
     # Check concentration limits
     concentration_alerts = check_concentration(positions, profile_limits)
 
@@ -310,7 +766,8 @@ def calculate_portfolio_risk(
 
     # Risk decomposition
     risk_decomposition = []
-    for pos in positions:
+    component_vars = model.component_var(0.95, horizon_days)
+    for pos, component_var in zip(positions, component_vars):
         ticker = pos.get("ticker", "")
         value = pos.get("value", 0)
         weight = value / total_value if total_value > 0 else 0
@@ -322,7 +779,8 @@ def calculate_portfolio_risk(
             "ticker": ticker,
             "value": value,
             "weight_pct": round(weight * 100, 2),
-            "contribution_to_var": round(pos_var, 2)
+            "contribution_to_var": round(pos_var, 2),
+            "component_var": round(component_var, 2)
         })
 
     return {
@@ -339,6 +797,7 @@ def calculate_portfolio_risk(
         "liquidity_score": liquidity["score"],
         "illiquid_positions": liquidity["illiquid_positions"],
         "risk_decomposition": risk_decomposition,
+        "var_analysis": var_analysis,
         "time_horizon": time_horizon,
         "stress_scenario": stress_scenario,
         "benchmark": benchmark
@@ -9,8 +9,36 @@ import csv
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
-
-
+try:
+    from skill_runtime.refdata import cached_reference_loader
+    from skill_runtime.cashflow import irr as solve_irr, npv as net_present_value
+    from skill_runtime import scenarios as scenario_engine
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
+
+    scenario_engine = None
+
+    def net_present_value(rate, cash_flows):
+        return sum(cf / (1 + rate) ** t for t, cf in enumerate(cash_flows))
+
+    def solve_irr(cash_flows, guess=0.1):
+        # Bisection fallback; like the shared solver, None when there is no IRR
+        lo, hi = -0.99, 10.0
+        f_lo = net_present_value(lo, cash_flows)
+        if len(cash_flows) < 2 or f_lo * net_present_value(hi, cash_flows) > 0:
+            return None
+        for _ in range(100):
+            mid = (lo + hi) / 2
+            f_mid = net_present_value(mid, cash_flows)
+            if f_lo * f_mid <= 0:
+                hi = mid
+            else:
+                lo, f_lo = mid, f_mid
+        return (lo + hi) / 2
+
+
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -34,6 +62,7 @@ def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[st
     return result
 
 
+@cached_reference_loader
 def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     """Load a CSV file and return as list of dictionaries."""
     csv_path = Path(__file__).parent / filename
@@ -56,6 +85,7 @@ def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     return result
 
 
+@cached_reference_loader
 def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
     """Load parameters CSV as key-value dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -81,6 +111,7 @@ def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
                     result[key] = value
     return result
 
+@cached_reference_loader
 def load_key_value_csv(filename: str) -> Dict[str, Any]:
     """Load a key-value CSV file as a flat dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -214,13 +245,11 @@ def calculate_npv(
     discount_rate: float
 ) -> Dict[str, Any]:
     """Calculate Net Present Value."""
-    npv = 0
     discounted_flows = []
 
     for year, cf in enumerate(cash_flows):
         discount_factor = (1 + discount_rate) ** year
         discounted_cf = cf / discount_factor
-        npv += discounted_cf
         discounted_flows.append({
             "year": year,
             "cash_flow": cf,
@@ -229,7 +258,7 @@ def calculate_npv(
         })
 
     return {
-        "npv": round(npv, 2),
+        "npv": round(net_present_value(discount_rate, cash_flows), 2),
         "discount_rate": discount_rate,
         "discounted_flows": discounted_flows
     }
@@ -237,29 +266,15 @@ def calculate_npv(
 
 def calculate_irr(
     cash_flows: List[float],
-    max_iterations: int = 100,
-    tolerance: float = 0.0001
+    guess: float = 0.10
 ) -> Dict[str, Any]:
-    """Calculate Internal Rate of Return using Newton-Raphson method."""
+    """Calculate Internal Rate of Return with a bracketed Newton solver."""
     if len(cash_flows) < 2:
         return {"irr": None, "error": "Insufficient cash flows"}
 
-    # Initial guess
-    irr = 0.10
-
-    for _ in range(max_iterations):
-        npv = sum(cf / (1 + irr) ** i for i, cf in enumerate(cash_flows))
-        npv_derivative = sum(-i * cf / (1 + irr) ** (i + 1) for i, cf in enumerate(cash_flows))
-
-        if abs(npv_derivative) < tolerance:
-            break
-
-        new_irr = irr - npv / npv_derivative
-
-        if abs(new_irr - irr) < tolerance:
-            return {"irr": round(new_irr, 4), "irr_pct": round(new_irr * 100, 2)}
-
-        irr = new_irr
+    irr = solve_irr(cash_flows, guess)
+    if irr is None:
+        return {"irr": None, "error": "Cash flows never change sign"}
 
     return {"irr": round(irr, 4), "irr_pct": round(irr * 100, 2)}
 
@@ -369,6 +384,94 @@ def perform_sensitivity_analysis(
     return results
 
 
+def build_project_value_model(
+    yearly_costs: List[float],
+    yearly_benefits: List[float]
+):
+    """
+    Build the NPV/ROI formula evaluated by the scenario engine.
+
+    The model scales the yearly benefit and cost streams by benefit_factor
+    and cost_factor and discounts them at discount_rate. NPV is linear in
+    the two factors, so each evaluation is two NPV passes.
+    """
+    total_costs = sum(yearly_costs)
+    total_benefits = sum(yearly_benefits)
+
+    def project_value_model(
+        benefit_factor: float,
+        cost_factor: float,
+        discount_rate: float
+    ) -> Dict[str, Optional[float]]:
+        adj_costs = total_costs * cost_factor
+        npv = (
+            benefit_factor * net_present_value(discount_rate, yearly_benefits)
+            - cost_factor * net_present_value(discount_rate, yearly_costs)
+        )
+        roi_pct = ((total_benefits * benefit_factor - adj_costs) / adj_costs * 100) if adj_costs > 0 else None
+        return {"npv": npv, "roi_pct": roi_pct}
+
+    return project_value_model
+
+
+def rank_sensitivities(
+    model,
+    discount_rate: float,
+    scenarios: Dict,
+    discount_rate_shift: float
+) -> List[Dict[str, Any]]:
+    """
+    Tornado ranking of NPV drivers.
+
+    Benefit and cost factors range over the lowest and highest factors of
+    the sensitivity scenarios; the discount rate moves +/- discount_rate_shift.
+    """
+    benefit_factors = [f.get("benefit_factor", 1.0) for f in scenarios.values()] or [1.0]
+    cost_factors = [f.get("cost_factor", 1.0) for f in scenarios.values()] or [1.0]
+    ranges = {
+        "benefit_factor": (min(benefit_factors), max(benefit_factors)),
+        "cost_factor": (min(cost_factors), max(cost_factors)),
+        "discount_rate": (discount_rate - discount_rate_shift, discount_rate + discount_rate_shift)
+    }
+    base = {"benefit_factor": 1.0, "cost_factor": 1.0, "discount_rate": discount_rate}
+    return scenario_engine.round_floats(scenario_engine.tornado(model, base, ranges, "npv"), 4)
+
+
+def simulate_project_value(
+    model,
+    discount_rate: float,
+    uncertainty: Dict,
+    default_draws: int
+) -> Dict[str, Any]:
+    """
+    Monte Carlo NPV and ROI analysis.
+
+    Args:
+        model: Formula from build_project_value_model
+        discount_rate: Base-case discount rate
+        uncertainty: {"distributions": {...}, "draws": n, "seed": s}; keys of
+            distributions are benefit_factor, cost_factor and discount_rate
+        default_draws: Draws when uncertainty does not set them
+
+    Returns:
+        Percentile bands of NPV and ROI and a tornado ranking of the
+        uncertain inputs
+    """
+    if scenario_engine is None:
+        return {"error": "Scenario engine (skill_runtime) is not available"}
+
+    base = {"benefit_factor": 1.0, "cost_factor": 1.0, "discount_rate": discount_rate}
+    result = scenario_engine.monte_carlo(
+        model,
+        base,
+        uncertainty.get("distributions", {}),
+        draws=int(uncertainty.get("draws", default_draws)),
+        seed=uncertainty.get("seed"),
+        tornado_output="npv"
+    )
+    return scenario_engine.round_floats(result)
+
+
 def evaluate_against_hurdles(
     roi: float,
     npv: float,
@@ -436,7 +539,8 @@ def calculate_project_roi(
     costs: List[Dict],
     benefits: List[Dict],
     risk_factors: Dict,
-    analysis_date: str
+    analysis_date: str,
+    uncertainty: Optional[Dict] = None
 ) -> Dict[str, Any]:
     """
     Calculate project ROI.
@@ -456,6 +560,9 @@ def calculate_project_roi(
         benefits: Expected benefits
         risk_factors: Risk assessment factors
         analysis_date: Analysis date
+        uncertainty: Optional Monte Carlo spec with "distributions" over
+            benefit_factor, cost_factor and discount_rate, plus optional
+            "draws" and "seed"
 
     Returns:
         Project ROI analysis results
@@ -508,6 +615,28 @@ def calculate_project_roi(
         benefits_result["total_benefits"],
         params.get("sensitivity_scenarios", {})
     )
+    value_model = build_project_value_model(
+        costs_result["yearly_costs"],
+        benefits_result["yearly_benefits"]
+    )
+    sensitivity_ranking = None
+    if scenario_engine is not None:
+        sensitivity_ranking = rank_sensitivities(
+            value_model,
+            discount_rate,
+            params.get("sensitivity_scenarios", {}),
+            params.get("tornado_discount_rate_shift", 0.02)
+        )
+
+    # Monte Carlo analysis
+    monte_carlo = None
+    if uncertainty:
+        monte_carlo = simulate_project_value(
+            value_model,
+            discount_rate,
+            uncertainty,
+            params.get("monte_carlo_draws", 100000)
+        )
 
     # Evaluate against hurdles
     evaluation = evaluate_against_hurdles(
@@ -544,6 +673,8 @@ def calculate_project_roi(
         },
         "risk_adjusted_analysis": risk_adjusted,
         "sensitivity_analysis": sensitivity,
+        "sensitivity_ranking": sensitivity_ranking,
+        "monte_carlo_analysis": monte_carlo,
         "evaluation": evaluation
     }
 
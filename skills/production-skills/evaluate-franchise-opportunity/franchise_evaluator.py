@@ -9,8 +9,33 @@ import csv
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
-
-
+try:
+    from skill_runtime.refdata import cached_reference_loader
+    from skill_runtime.cashflow import irr as solve_irr, npv as net_present_value
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
+
+    def net_present_value(rate, cash_flows):
+        return sum(cf / (1 + rate) ** t for t, cf in enumerate(cash_flows))
+
+    def solve_irr(cash_flows, guess=0.1):
+        # Bisection fallback; like the shared solver, None when there is no IRR
+        lo, hi = -0.99, 10.0
+        f_lo = net_present_value(lo, cash_flows)
+        if len(cash_flows) < 2 or f_lo * net_present_value(hi, cash_flows) > 0:
+            return None
+        for _ in range(100):
+            mid = (lo + hi) / 2
+            f_mid = net_present_value(mid, cash_flows)
+            if f_lo * f_mid <= 0:
+                hi = mid
+            else:
+                lo, f_lo = mid, f_mid
+        return (lo + hi) / 2
+
+
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -34,6 +59,7 @@ def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[st
     return result
 
 
+@cached_reference_loader
 def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     """Load a CSV file and return as list of dictionaries."""
     csv_path = Path(__file__).parent / filename
@@ -56,6 +82,7 @@ def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     return result
 
 
+@cached_reference_loader
 def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
     """Load parameters CSV as key-value dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -81,6 +108,7 @@ def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
                     result[key] = value
     return result
 
+@cached_reference_loader
 def load_key_value_csv(filename: str) -> Dict[str, Any]:
     """Load a key-value CSV file as a flat dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -311,19 +339,14 @@ def calculate_return_projections(
     terminal_value = current_ebitda * terminal_multiple
     cash_flows[-1] += terminal_value
 
-    # Calculate IRR (simplified Newton-Raphson)
-    irr = 0.15  # Initial guess
-    for _ in range(50):
-        npv = sum(cf / (1 + irr) ** t for t, cf in enumerate(cash_flows))
-        npv_derivative = sum(-t * cf / (1 + irr) ** (t + 1) for t, cf in enumerate(cash_flows))
-        if abs(npv_derivative) > 0.0001:
-            irr = irr - npv / npv_derivative
+    # Calculate IRR (None if the flows never change sign or the solver is unavailable)
+    irr = solve_irr(cash_flows, 0.15)
 
     # Calculate NPV at discount rate
-    npv = sum(cf / (1 + discount_rate) ** t for t, cf in enumerate(cash_flows))
+    npv = net_present_value(discount_rate, cash_flows)
 
     return {
-        "projected_irr": round(max(0, min(1, irr)), 3),
+        "projected_irr": round(max(0, min(1, irr)), 3) if irr is not None else None,
         "npv_at_discount_rate": round(npv, 2),
         "discount_rate_used": discount_rate,
         "payback_years": unit_economics.get("payback_years"),
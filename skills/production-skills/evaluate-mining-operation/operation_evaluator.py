@@ -9,7 +9,14 @@ import csv
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
+
+@cached_reference_loader
 def load_mining_benchmarks() -> Dict[str, Any]:
     """Load mining benchmark data."""
     benchmarks_path = Path(__file__).parent / "mining_benchmarks.csv"
@@ -9,8 +9,33 @@ import csv
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
-
-
+try:
+    from skill_runtime.refdata import cached_reference_loader
+    from skill_runtime.cashflow import irr as solve_irr, npv as net_present_value
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
+
+    def net_present_value(rate, cash_flows):
+        return sum(cf / (1 + rate) ** t for t, cf in enumerate(cash_flows))
+
+    def solve_irr(cash_flows, guess=0.1):
+        # Bisection fallback; like the shared solver, None when there is no IRR
+        lo, hi = -0.99, 10.0
+        f_lo = net_present_value(lo, cash_flows)
+        if len(cash_flows) < 2 or f_lo * net_present_value(hi, cash_flows) > 0:
+            return None
+        for _ in range(100):
+            mid = (lo + hi) / 2
+            f_mid = net_present_value(mid, cash_flows)
+            if f_lo * f_mid <= 0:
+                hi = mid
+            else:
+                lo, f_lo = mid, f_mid
+        return (lo + hi) / 2
+
+
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -34,6 +59,7 @@ def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[st
     return result
 
 
+@cached_reference_loader
 def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     """Load a CSV file and return as list of dictionaries."""
     csv_path = Path(__file__).parent / filename
@@ -56,6 +82,7 @@ def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     return result
 
 
+@cached_reference_loader
 def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
     """Load parameters CSV as key-value dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -81,6 +108,7 @@ def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
                     result[key] = value
     return result
 
+@cached_reference_loader
 def load_key_value_csv(filename: str) -> Dict[str, Any]:
     """Load a key-value CSV file as a flat dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -160,26 +188,10 @@ def calculate_irr(
     initial_investment: float,
     cash_flows: List[float],
     terminal_value: float
-) -> float:
-    """Calculate IRR using Newton-Raphson approximation."""
+) -> Optional[float]:
+    """Calculate IRR with a bracketed Newton solver (None if the flows have no IRR)."""
     cash_flows = [-initial_investment] + cash_flows[:-1] + [cash_flows[-1] + terminal_value]
-
-    # Initial guess
-    irr = 0.10
-
-    for _ in range(100):
-        npv = sum(cf / (1 + irr) ** t for t, cf in enumerate(cash_flows))
-        dnpv = sum(-t * cf / (1 + irr) ** (t + 1) for t, cf in enumerate(cash_flows))
-
-        if abs(dnpv) < 1e-10:
-            break
-
-        irr = irr - npv / dnpv
-
-        if abs(npv) < 1e-6:
-            break
-
-    return irr
+    return solve_irr(cash_flows, 0.10)
 
 
 def assess_risk(
@@ -322,10 +334,12 @@ def evaluate_investment(
         "asking_vs_mid": round((asking_price / ((low_value + high_value) / 2) - 1) * 100, 1)
     }
 
-    # Investment rating
-    irr_spread = projected_irr - required_return
+    # Investment rating; without an IRR the required return cannot be shown to be met
+    irr_spread = projected_irr - required_return if projected_irr is not None else None
 
-    if irr_spread >= 0.02 and risk_assessment["score"] >= 60:
+    if irr_spread is None:
+        investment_rating = "PASS"
+    elif irr_spread >= 0.02 and risk_assessment["score"] >= 60:
         investment_rating = "BUY"
     elif irr_spread >= 0 and risk_assessment["score"] >= 50:
         investment_rating = "HOLD"
@@ -339,9 +353,9 @@ def evaluate_investment(
         "cap_rate_vs_benchmark": round(cap_rate_spread * 100, 1),
         "price_per_sf": round(price_per_sf, 2),
         "price_psf_vs_benchmark": round((price_per_sf / benchmark_psf - 1) * 100, 1),
-        "projected_irr": round(projected_irr, 4),
+        "projected_irr": round(projected_irr, 4) if projected_irr is not None else None,
         "required_return": round(required_return, 4),
-        "irr_spread": round(irr_spread * 100, 1),
+        "irr_spread": round(irr_spread * 100, 1) if irr_spread is not None else None,
         "risk_score": risk_assessment["score"],
         "risk_level": risk_assessment["risk_level"],
         "risk_factors": risk_assessment["risks"],
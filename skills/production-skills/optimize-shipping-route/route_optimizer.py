@@ -6,11 +6,22 @@ time, and carbon emissions for freight transportation.
 """
 
 import csv
+import heapq
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Optional, Tuple
 from datetime import datetime, timedelta
 
+try:
+    from skill_runtime.refdata import cached_reference_loader, cached_reference_object
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
+    def cached_reference_object(func):
+        return func
+
+
+@cached_reference_loader
 def load_transit_matrix() -> Dict[str, Any]:
     """Load transit time and cost matrix."""
     matrix_path = Path(__file__).parent / "transit_matrix.csv"
@@ -33,6 +44,15 @@ def load_transit_matrix() -> Dict[str, Any]:
     return {"routes": routes}
 
 
+# Port handling time added at each transshipment
+TRANSSHIPMENT_DAYS = 2
+
+# Longest itinerary considered, in legs
+MAX_LEGS = 3
+
+OBJECTIVES = ("cost", "transit", "carbon")
+
+
 def find_direct_routes(
     origin_port: str,
     destination_port: str,
@@ -98,6 +118,259 @@ def score_route(
     return score
 
 
+class PortGraph:
+    """
+    Port network built once from the transit matrix.
+
+    Lanes are indexed by origin port (adjacency lists) and by port pair, so
+    direct lookups are a dictionary access and multi-leg itineraries with
+    transshipments can be searched with Dijkstra's algorithm. Paths are lists
+    of lane indices, which keeps parallel lanes (one per mode) distinct.
+    """
+
+    def __init__(self, routes: List[Dict], transshipment_days: float = TRANSSHIPMENT_DAYS):
+        self.lanes = list(routes)
+        self.transshipment_days = transshipment_days
+        self.adjacency: Dict[str, List[int]] = {}
+        self.pairs: Dict[Tuple[str, str], List[int]] = {}
+        for index, lane in enumerate(self.lanes):
+            self.adjacency.setdefault(lane["origin"], []).append(index)
+            self.pairs.setdefault((lane["origin"], lane["destination"]), []).append(index)
+
+    def direct(self, origin_port: str, destination_port: str) -> List[Dict]:
+        """Direct lanes between two ports."""
+        return [self.lanes[i] for i in self.pairs.get((origin_port, destination_port), [])]
+
+    def leg_weight(self, lane: Dict, objective: str, weight_kg: float, volume_cbm: float) -> float:
+        """Edge weight of a lane under an objective."""
+        if objective == "cost":
+            return calculate_route_cost(lane, weight_kg, volume_cbm)
+        if objective == "transit":
+            # Every leg carries one handling period; the first is taken off the total
+            return lane["transit_days"] + self.transshipment_days
+        if objective == "carbon":
+            return calculate_carbon_footprint(lane, weight_kg)
+        raise ValueError(f"Unknown objective '{objective}'; expected one of {OBJECTIVES}")
+
+    def shortest_path(
+        self,
+        origin_port: str,
+        destination_port: str,
+        objective: str = "cost",
+        weight_kg: float = 0,
+        volume_cbm: float = 0,
+        service_level: Optional[str] = None,
+        max_legs: int = MAX_LEGS,
+        excluded_lanes: Iterable[int] = (),
+        excluded_ports: Iterable[str] = ()
+    ) -> Optional[Tuple[float, List[int]]]:
+        """
+        Cheapest itinerary under an objective (Dijkstra over port and leg count).
+
+        Args:
+            origin_port: Start port
+            destination_port: End port
+            objective: "cost", "transit" or "carbon"
+            weight_kg: Cargo weight
+            volume_cbm: Cargo volume
+            service_level: Only use lanes offering this service level
+            max_legs: Longest itinerary allowed
+            excluded_lanes: Lane indices that may not be used
+            excluded_ports: Ports that may not be visited
+
+        Returns:
+            Tuple of (total edge weight, lane indices), or None if unreachable
+        """
+        banned_lanes = set(excluded_lanes)
+        banned_ports = set(excluded_ports)
+        if origin_port in banned_ports:
+            return None
+
+        heap: List[Tuple[float, int, str, Tuple[int, ...]]] = [(0.0, 0, origin_port, ())]
+        settled = set()
+        while heap:
+            total, legs, port, path = heapq.heappop(heap)
+            if port == destination_port and path:
+                return total, list(path)
+            if (port, legs) in settled or legs >= max_legs:
+                continue
+            settled.add((port, legs))
+
+            visited = {origin_port} | {self.lanes[i]["destination"] for i in path}
+            for index in self.adjacency.get(port, []):
+                lane = self.lanes[index]
+                nxt = lane["destination"]
+                if index in banned_lanes or nxt in banned_ports or nxt in visited:
+                    continue
+                if service_level and service_level not in lane["service_levels"]:
+                    continue
+                step = self.leg_weight(lane, objective, weight_kg, volume_cbm)
+                heapq.heappush(heap, (total + step, legs + 1, nxt, path + (index,)))
+        return None
+
+    def k_shortest_paths(
+        self,
+        origin_port: str,
+        destination_port: str,
+        k: int = 3,
+        objective: str = "cost",
+        weight_kg: float = 0,
+        volume_cbm: float = 0,
+        service_level: Optional[str] = None,
+        max_legs: int = MAX_LEGS
+    ) -> List[List[int]]:
+        """
+        The k best loopless itineraries under an objective (Yen's algorithm).
+
+        Args:
+            origin_port: Start port
+            destination_port: End port
+            k: Number of itineraries to return
+            objective: "cost", "transit" or "carbon"
+            weight_kg: Cargo weight
+            volume_cbm: Cargo volume
+            service_level: Only use lanes offering this service level
+            max_legs: Longest itinerary allowed
+
+        Returns:
+            Lane-index paths, best first
+        """
+        search = dict(objective=objective, weight_kg=weight_kg, volume_cbm=volume_cbm,
+                      service_level=service_level)
+        best = self.shortest_path(origin_port, destination_port, max_legs=max_legs, **search)
+        if best is None:
+            return []
+
+        accepted = [best[1]]
+        candidates: List[Tuple[float, List[int]]] = []
+        seen = {tuple(best[1])}
+        while len(accepted) < k:
+            previous = accepted[-1]
+            ports = [origin_port] + [self.lanes[i]["destination"] for i in previous]
+            for i in range(len(previous)):
+                root = previous[:i]
+                removed = {path[i] for path in accepted if path[:i] == root and len(path) > i}
+                spur = self.shortest_path(
+                    ports[i], destination_port, max_legs=max_legs - i,
+                    excluded_lanes=removed, excluded_ports=ports[:i], **search
+                )
+                if spur is None:
+                    continue
+                path = root + spur[1]
+                if tuple(path) in seen:
+                    continue
+                seen.add(tuple(path))
+                total = sum(
+                    self.leg_weight(self.lanes[j], objective, weight_kg, volume_cbm) for j in path
+                )
+                heapq.heappush(candidates, (total, path))
+            if not candidates:
+                break
+            accepted.append(heapq.heappop(candidates)[1])
+        return accepted
+
+    def itinerary(self, path: List[int], weight_kg: float, volume_cbm: float) -> Dict[str, Any]:
+        """Totals and legs of a lane-index path for a given cargo."""
+        lanes = [self.lanes[i] for i in path]
+        transfers = len(lanes) - 1
+        return {
+            "legs": lanes,
+            "mode": "+".join(lane["mode"] for lane in lanes),
+            "transit_days": sum(lane["transit_days"] for lane in lanes) + transfers * self.transshipment_days,
+            "cost": sum(calculate_route_cost(lane, weight_kg, volume_cbm) for lane in lanes),
+            "carbon_kg": sum(calculate_carbon_footprint(lane, weight_kg) for lane in lanes),
+            "transshipment_ports": [lane["destination"] for lane in lanes[:-1]],
+        }
+
+
+@cached_reference_object
+def load_port_graph() -> PortGraph:
+    """Port graph for the transit matrix."""
+    return PortGraph(load_transit_matrix()["routes"])
+
+
+def find_best_routes(
+    origin_port: str,
+    destination_port: str,
+    cargo_specs: Dict,
+    objective: str = "cost",
+    k: int = 3,
+    service_level: Optional[str] = None,
+    max_legs: int = MAX_LEGS,
+    graph: Optional[PortGraph] = None
+) -> List[Dict[str, Any]]:
+    """
+    Best multi-leg itineraries between two ports under one objective.
+
+    Args:
+        origin_port: Start port
+        destination_port: End port
+        cargo_specs: Cargo specifications (weight_kg, volume_cbm)
+        objective: "cost", "transit" or "carbon"
+        k: Number of itineraries to return
+        service_level: Only use lanes offering this service level
+        max_legs: Longest itinerary allowed
+        graph: Port graph to search (default: the cached transit matrix graph)
+
+    Returns:
+        Itineraries, best first
+    """
+    graph = graph or load_port_graph()
+    weight_kg = cargo_specs.get("weight_kg", 0)
+    volume_cbm = cargo_specs.get("volume_cbm", 0)
+    paths = graph.k_shortest_paths(
+        origin_port, destination_port, k, objective, weight_kg, volume_cbm, service_level, max_legs
+    )
+    return [graph.itinerary(path, weight_kg, volume_cbm) for path in paths]
+
+
+def optimize_shipments(
+    shipments: List[Dict],
+    objective: str = "cost",
+    k: int = 1,
+    max_legs: int = MAX_LEGS
+) -> List[Dict[str, Any]]:
+    """
+    Route many shipments against one cached port graph.
+
+    Transit-time and carbon rankings do not depend on the cargo (carbon is
+    proportional to weight), so those searches are shared by every shipment
+    on the same lane and service level; cost searches are shared by identical
+    cargo.
+
+    Args:
+        shipments: Records with shipment_id, origin_port, destination_port,
+            cargo_specs and optional service_level
+        objective: "cost", "transit" or "carbon"
+        k: Itineraries to return per shipment
+        max_legs: Longest itinerary allowed
+
+    Returns:
+        One result per shipment, in input order
+    """
+    graph = load_port_graph()
+    searches: Dict[Tuple, List[List[int]]] = {}
+    results = []
+    for shipment in shipments:
+        cargo = shipment.get("cargo_specs", {})
+        weight_kg = cargo.get("weight_kg", 0)
+        volume_cbm = cargo.get("volume_cbm", 0)
+        lane_key = (shipment["origin_port"], shipment["destination_port"], shipment.get("service_level"))
+        key = lane_key + ((weight_kg, volume_cbm) if objective == "cost" else (weight_kg > 0,))
+
+        paths = searches.get(key)
+        if paths is None:
+            paths = searches[key] = graph.k_shortest_paths(
+                lane_key[0], lane_key[1], k, objective, weight_kg, volume_cbm, lane_key[2], max_legs
+            )
+        results.append({
+            "shipment_id": shipment.get("shipment_id"),
+            "objective": objective,
+            "routes": [graph.itinerary(path, weight_kg, volume_cbm) for path in paths],
+        })
+    return results
+
+
 def optimize_route(
     shipment_id: str,
     origin: Dict,
@@ -142,42 +415,40 @@ def optimize_route(
     else:
         deadline_days = 999
 
-    # Find available routes
-    direct_routes = find_direct_routes(origin_port, destination_port, matrix["routes"])
+    # Direct lanes plus the best multi-leg itineraries through hubs
+    graph = load_port_graph()
 
-    # Filter by service level
-    eligible_routes = [
-        r for r in direct_routes
-        if service_level in r["service_levels"]
-    ]
+    def candidate_itineraries(level: Optional[str]) -> List[Dict[str, Any]]:
+        found: Dict[Tuple[int, ...], Dict[str, Any]] = {}
+        for objective in OBJECTIVES:
+            for path in graph.k_shortest_paths(
+                origin_port, destination_port, 3, objective, weight_kg, volume_cbm, level
+            ):
+                found.setdefault(tuple(path), graph.itinerary(path, weight_kg, volume_cbm))
+        for index in graph.pairs.get((origin_port, destination_port), []):
+            if level is None or level in graph.lanes[index]["service_levels"]:
+                found.setdefault((index,), graph.itinerary([index], weight_kg, volume_cbm))
+        return list(found.values())
 
-    # If no direct routes, try common hubs (simplified)
-    if not eligible_routes:
-        eligible_routes = direct_routes  # Fall back to all direct routes
+    # Filter by service level, falling back to every itinerary if none offers it
+    eligible_routes = candidate_itineraries(service_level) or candidate_itineraries(None)
 
     # Score each route
     scored_routes = []
-    for route in eligible_routes:
-        cost = calculate_route_cost(route, weight_kg, volume_cbm)
-        carbon = calculate_carbon_footprint(route, weight_kg)
-
+    for itinerary in eligible_routes:
         score = score_route(
-            route,
-            route["transit_days"],
-            cost,
-            carbon,
+            itinerary,
+            itinerary["transit_days"],
+            itinerary["cost"],
+            itinerary["carbon_kg"],
             preferences,
             deadline_days
         )
 
         scored_routes.append({
-            "route": route,
-            "cost": cost,
-            "carbon_kg": carbon,
-            "transit_days": route["transit_days"],
-            "mode": route["mode"],
+            **itinerary,
             "score": score,
-            "meets_deadline": route["transit_days"] <= deadline_days
+            "meets_deadline": itinerary["transit_days"] <= deadline_days
         })
 
     # Sort by score
@@ -192,14 +463,16 @@ def optimize_route(
             "destination_port": destination_port,
             "mode": best["mode"],
             "transit_days": best["transit_days"],
+            "transshipment_ports": best["transshipment_ports"],
             "legs": [
                 {
-                    "from": origin_port,
-                    "to": destination_port,
-                    "mode": best["mode"],
+                    "from": leg["origin"],
+                    "to": leg["destination"],
+                    "mode": leg["mode"],
                     "carrier": "Primary Carrier",
-                    "transit_days": best["transit_days"]
+                    "transit_days": leg["transit_days"]
                 }
+                for leg in best["legs"]
             ]
         }
 
@@ -217,6 +490,7 @@ def optimize_route(
     alternative_routes = [
         {
             "mode": r["mode"],
+            "via": r["transshipment_ports"],
             "transit_days": r["transit_days"],
             "cost": round(r["cost"], 2),
             "carbon_kg": round(r["carbon_kg"], 2),
@@ -6,11 +6,19 @@ matching, tolerance checks, and exception handling.
 """
 
 import csv
+import re
+from datetime import date
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple, Union
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
 
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -34,6 +42,7 @@ def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[st
     return result
 
 
+@cached_reference_loader
 def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     """Load a CSV file and return as list of dictionaries."""
     csv_path = Path(__file__).parent / filename
@@ -56,6 +65,7 @@ def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     return result
 
 
+@cached_reference_loader
 def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
     """Load parameters CSV as key-value dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -81,6 +91,7 @@ def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
                     result[key] = value
     return result
 
+@cached_reference_loader
 def load_key_value_csv(filename: str) -> Dict[str, Any]:
     """Load a key-value CSV file as a flat dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -324,45 +335,291 @@ def perform_matching(
     return match_results
 
 
+INDEX_COLUMNS = ("invoice_id", "vendor_id", "invoice_number", "invoice_date", "total_amount")
+
+# Match types in order of strength, with their confidence
+DUPLICATE_MATCH_TYPES = {
+    "exact_invoice_number": 1.0,
+    "normalized_invoice_number": 0.95,
+    "amount_vendor_date": 0.9,
+    "transposed_invoice_number": 0.85,
+    "similar_invoice_number": 0.8,
+}
+
+_NON_ALPHANUMERIC = re.compile(r"[\W_]+")
+
+
+def normalize_invoice_number(invoice_number: Any) -> str:
+    """Invoice number reduced to upper-case letters and digits ("inv-0012 " -> "INV0012")."""
+    return _NON_ALPHANUMERIC.sub("", str(invoice_number or "")).upper()
+
+
+_TRAILING_SEQUENCE = re.compile(r"(\d+)[\W_]*$")
+
+
+def sequence_parts(invoice_number: Any) -> Optional[Tuple[str, str]]:
+    """Normalized prefix and trailing sequence digits ("INV-2024-0013" -> ("INV2024", "0013"))."""
+    text = str(invoice_number or "")
+    match = _TRAILING_SEQUENCE.search(text)
+    if not match:
+        return None
+    return normalize_invoice_number(text[:match.start()]), match.group(1)
+
+
+def is_sequence_step(first: Any, second: Any) -> bool:
+    """Whether two invoice numbers differ only in a same-width trailing sequence number."""
+    first_parts, second_parts = sequence_parts(first), sequence_parts(second)
+    return bool(
+        first_parts and second_parts
+        and first_parts[0] == second_parts[0]
+        and len(first_parts[1]) == len(second_parts[1])
+        and int(first_parts[1]) != int(second_parts[1])
+    )
+
+
+def _parse_invoice_date(value: Any) -> Optional[date]:
+    """Invoice date as a date, or None if it is not an ISO date."""
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def is_recurring_invoice(
+    first_number: Any,
+    first_date: Any,
+    second_number: Any,
+    second_date: Any,
+    min_days: int
+) -> bool:
+    """
+    Whether two invoices look like consecutive bills of a recurring charge.
+
+    The numbers must differ only in their trailing sequence number and the
+    invoices must be at least min_days apart, i.e. bill different periods.
+    A re-keyed or transposed number dated close to the original is not
+    exempt (INV-2024-0012 and INV-2024-0021 a day apart are still compared).
+    """
+    if not is_sequence_step(first_number, second_number):
+        return False
+    first, second = _parse_invoice_date(first_date), _parse_invoice_date(second_date)
+    return first is not None and second is not None and abs((first - second).days) >= min_days
+
+
+def is_adjacent_transposition(first: str, second: str) -> bool:
+    """Whether two normalized invoice numbers differ by one swap of adjacent characters."""
+    if len(first) != len(second):
+        return False
+    diffs = [i for i, (a, b) in enumerate(zip(first, second)) if a != b]
+    return (
+        len(diffs) == 2 and diffs[1] == diffs[0] + 1
+        and first[diffs[0]] == second[diffs[1]] and first[diffs[1]] == second[diffs[0]]
+    )
+
+
+def invoice_number_grams(normalized: str, size: int = 3) -> Set[str]:
+    """Character n-grams of a normalized invoice number, padded at both ends."""
+    padded = f"^{normalized}$"
+    if len(padded) <= size:
+        return {padded}
+    return {padded[i:i + size] for i in range(len(padded) - size + 1)}
+
+
+class DuplicateInvoiceIndex:
+    """
+    Hash index over historical invoices for duplicate screening.
+
+    Exact duplicates are found through two hash keys, (vendor, invoice
+    number) and (vendor, amount, date), plus a key on the normalized invoice
+    number that catches formatting variants. Near-duplicate numbers (a
+    re-keyed prefix, a dropped suffix, two swapped characters) are searched
+    only inside the invoice's (vendor, amount) block; swaps are matched
+    directly and the rest scored by n-gram similarity. Numbers that
+    differ only in their trailing sequence number (INV-2024-0012 and
+    INV-2024-0013) and are dated at least ``duplicate_recurring_min_days``
+    apart are the vendor's next bill, as for fixed-amount rent or
+    subscriptions, and are not flagged. Every check touches only the matching
+    buckets, independent of history size.
+
+    Usage::
+
+        index = DuplicateInvoiceIndex.load("ap_history.csv")
+        result = index.check(invoice_data)
+        if not result["is_potential_duplicate"]:
+            index.add(invoice_data)
+    """
+
+    def __init__(
+        self,
+        invoices: Iterable[Dict] = (),
+        ngram_size: Optional[int] = None,
+        similarity_threshold: Optional[float] = None,
+        recurring_min_days: Optional[int] = None
+    ):
+        params = load_parameters()
+        self.ngram_size = int(ngram_size or params.get("duplicate_ngram_size", 3))
+        self.similarity_threshold = (
+            similarity_threshold if similarity_threshold is not None
+            else params.get("duplicate_similarity_threshold", 0.75)
+        )
+        self.recurring_min_days = int(
+            recurring_min_days if recurring_min_days is not None
+            else params.get("duplicate_recurring_min_days", 28)
+        )
+        self.records: List[Tuple] = []
+        self._by_number: Dict[Tuple, List[int]] = {}
+        self._by_normalized: Dict[Tuple, List[int]] = {}
+        self._by_amount_date: Dict[Tuple, List[int]] = {}
+        self._by_amount: Dict[Tuple, List[int]] = {}
+        for invoice in invoices:
+            self.add(invoice)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, invoice: Dict) -> None:
+        """Index one accepted invoice."""
+        vendor_id = invoice.get("vendor_id")
+        invoice_number = invoice.get("invoice_number")
+        invoice_date = invoice.get("invoice_date")
+        amount = invoice.get("total_amount")
+        record = (invoice.get("invoice_id"), vendor_id, invoice_number, invoice_date, amount)
+        position = len(self.records)
+        self.records.append(record)
+        self._by_number.setdefault((vendor_id, invoice_number), []).append(position)
+        normalized = normalize_invoice_number(invoice_number)
+        if normalized:
+            self._by_normalized.setdefault((vendor_id, normalized), []).append(position)
+        self._by_amount_date.setdefault((vendor_id, amount, invoice_date), []).append(position)
+        self._by_amount.setdefault((vendor_id, amount), []).append(position)
+
+    def check(self, invoice_data: Dict) -> Dict[str, Any]:
+        """
+        Screen an invoice against the index.
+
+        Args:
+            invoice_data: Invoice with vendor_id, invoice_number, invoice_date
+                and total_amount
+
+        Returns:
+            Duplicate check result (same shape as check_for_duplicates)
+        """
+        invoice_number = invoice_data.get("invoice_number", "")
+        vendor_id = invoice_data.get("vendor_id", "")
+        invoice_date = invoice_data.get("invoice_date", "")
+        invoice_amount = invoice_data.get("total_amount", 0)
+        normalized = normalize_invoice_number(invoice_number)
+
+        # Position -> (match type, similarity); the strongest match type wins
+        matches: Dict[int, Tuple[str, float]] = {}
+
+        def record_match(positions: Iterable[int], match_type: str, similarity: float = 1.0) -> None:
+            for position in positions:
+                if position not in matches:
+                    matches[position] = (match_type, similarity)
+
+        record_match(self._by_number.get((vendor_id, invoice_number), []), "exact_invoice_number")
+        if normalized:
+            record_match(self._by_normalized.get((vendor_id, normalized), []), "normalized_invoice_number")
+        record_match(
+            self._by_amount_date.get((vendor_id, invoice_amount, invoice_date), []), "amount_vendor_date"
+        )
+
+        if normalized:
+            grams = invoice_number_grams(normalized, self.ngram_size)
+            for position in self._by_amount.get((vendor_id, invoice_amount), []):
+                if position in matches:
+                    continue
+                _, _, other_number, other_date, _ = self.records[position]
+                other = normalize_invoice_number(other_number)
+                if not other or is_recurring_invoice(
+                    invoice_number, invoice_date, other_number, other_date, self.recurring_min_days
+                ):
+                    continue
+                if is_adjacent_transposition(normalized, other):
+                    matches[position] = ("transposed_invoice_number", 1.0)
+                    continue
+                other_grams = invoice_number_grams(other, self.ngram_size)
+                # Dice coefficient on n-grams
+                similarity = 2 * len(grams & other_grams) / (len(grams) + len(other_grams))
+                if similarity >= self.similarity_threshold:
+                    matches[position] = ("similar_invoice_number", similarity)
+
+        potential_duplicates = []
+        for position in sorted(matches):
+            match_type, similarity = matches[position]
+            entry = {
+                "match_type": match_type,
+                "historical_invoice_id": self.records[position][0] or "",
+                "confidence": DUPLICATE_MATCH_TYPES[match_type],
+            }
+            if match_type == "similar_invoice_number":
+                entry["similarity"] = round(similarity, 3)
+            potential_duplicates.append(entry)
+
+        return {
+            "is_potential_duplicate": len(potential_duplicates) > 0,
+            "duplicate_count": len(potential_duplicates),
+            "potential_duplicates": potential_duplicates
+        }
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the indexed invoices to a CSV file."""
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(INDEX_COLUMNS)
+            writer.writerows(self.records)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], **kwargs: Any) -> "DuplicateInvoiceIndex":
+        """Rebuild an index from a CSV file written by save()."""
+        index = cls(**kwargs)
+        with open(path, 'r', newline='') as f:
+            for row in csv.DictReader(f):
+                amount = row.get("total_amount")
+                row["total_amount"] = float(amount) if amount else None
+                index.add({k: (v if v != "" else None) for k, v in row.items()})
+        return index
+
+
 def check_for_duplicates(
     invoice_data: Dict,
-    historical_invoices: List[Dict]
+    historical_invoices: Union[List[Dict], DuplicateInvoiceIndex]
 ) -> Dict[str, Any]:
-    """Check for duplicate invoices."""
-    invoice_number = invoice_data.get("invoice_number", "")
-    vendor_id = invoice_data.get("vendor_id", "")
-    invoice_date = invoice_data.get("invoice_date", "")
-    invoice_amount = invoice_data.get("total_amount", 0)
-
-    potential_duplicates = []
-
-    for hist in historical_invoices:
-        # Same invoice number from same vendor
-        if hist.get("invoice_number") == invoice_number and hist.get("vendor_id") == vendor_id:
-            potential_duplicates.append({
-                "match_type": "exact_invoice_number",
-                "historical_invoice_id": hist.get("invoice_id", ""),
-                "confidence": 1.0
-            })
-            continue
-
-        # Same amount, same vendor, same date
-        if (hist.get("total_amount") == invoice_amount and
-            hist.get("vendor_id") == vendor_id and
-            hist.get("invoice_date") == invoice_date):
-            potential_duplicates.append({
-                "match_type": "amount_vendor_date",
-                "historical_invoice_id": hist.get("invoice_id", ""),
-                "confidence": 0.9
-            })
-
-    is_duplicate = len(potential_duplicates) > 0
+    """Check for duplicate invoices against history or a prebuilt index."""
+    if isinstance(historical_invoices, DuplicateInvoiceIndex):
+        index = historical_invoices
+    else:
+        index = DuplicateInvoiceIndex(historical_invoices)
+    return index.check(invoice_data)
 
-    return {
-        "is_potential_duplicate": is_duplicate,
-        "duplicate_count": len(potential_duplicates),
-        "potential_duplicates": potential_duplicates
-    }
+
+def screen_invoice_batch(
+    invoices: List[Dict],
+    index: DuplicateInvoiceIndex,
+    add_accepted: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Duplicate-screen a batch of invoices against one index.
+
+    Invoices that pass are added to the index as they are accepted, so a
+    duplicate submitted twice within the same batch is caught too.
+
+    Args:
+        invoices: Incoming invoices
+        index: Index of previously accepted invoices
+        add_accepted: Add non-duplicate invoices to the index
+
+    Returns:
+        One duplicate check per invoice, with its invoice_id
+    """
+    results = []
+    for invoice in invoices:
+        result = index.check(invoice)
+        if add_accepted and not result["is_potential_duplicate"]:
+            index.add(invoice)
+        results.append({"invoice_id": invoice.get("invoice_id", ""), **result})
+    return results
 
 
 def check_fraud_indicators(
@@ -466,7 +723,7 @@ def process_invoice_accuracy(
     invoice_data: Dict,
     po_data: Dict,
     receipt_data: Optional[Dict],
-    historical_invoices: List[Dict],
+    historical_invoices: Union[List[Dict], DuplicateInvoiceIndex],
     processing_date: str
 ) -> Dict[str, Any]:
     """
@@ -483,7 +740,8 @@ def process_invoice_accuracy(
         invoice_data: Invoice details
         po_data: Purchase order data
         receipt_data: Optional receipt data for 3-way match
-        historical_invoices: Historical invoices for duplicate check
+        historical_invoices: Historical invoices for duplicate check, or a
+            DuplicateInvoiceIndex built from them
         processing_date: Processing date
 
     Returns:
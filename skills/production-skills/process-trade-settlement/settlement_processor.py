@@ -6,12 +6,27 @@ obligation calculation, and exception management.
 """
 
 import csv
+from bisect import bisect_left, bisect_right
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime, timedelta
 
+try:
+    from skill_runtime.refdata import cached_reference_loader, cached_reference_object
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
+    def cached_reference_object(func):
+        return func
 
+try:
+    from skill_runtime.business_days import BusinessCalendar
+except ImportError:  # standalone copy: settlement dates are stepped day by day
+    BusinessCalendar = None
+
+
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -35,6 +50,7 @@ def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[st
     return result
 
 
+@cached_reference_loader
 def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     """Load a CSV file and return as list of dictionaries."""
     csv_path = Path(__file__).parent / filename
@@ -57,6 +73,7 @@ def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     return result
 
 
+@cached_reference_loader
 def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
     """Load parameters CSV as key-value dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -82,6 +99,7 @@ def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
                     result[key] = value
     return result
 
+@cached_reference_loader
 def load_key_value_csv(filename: str) -> Dict[str, Any]:
     """Load a key-value CSV file as a flat dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -126,12 +144,43 @@ def load_settlement_rules() -> Dict[str, Any]:
     }
 
 
+HOLIDAYS_PATH = Path(__file__).parent / "market_holidays.csv"
+
+DEFAULT_MARKET = "US"
+
+
+@cached_reference_loader
+def load_market_holidays() -> Dict[str, List[str]]:
+    """Load settlement holidays by market."""
+    holidays: Dict[str, List[str]] = {}
+    with open(HOLIDAYS_PATH, 'r') as f:
+        for row in csv.DictReader(f):
+            holidays.setdefault(row["market"], []).append(row["date"])
+    return holidays
+
+
+@cached_reference_object
+def load_market_calendars() -> Dict[str, Any]:
+    """Compiled business-day calendar per market."""
+    return {market: BusinessCalendar(dates) for market, dates in load_market_holidays().items()}
+
+
+# Shared by every market without a holiday table; never stored in the market cache
+WEEKEND_CALENDAR = BusinessCalendar() if BusinessCalendar is not None else None
+
+
+def _market_calendar(market: str) -> Any:
+    """Calendar for a market; unknown markets only skip weekends."""
+    return load_market_calendars().get(market, WEEKEND_CALENDAR)
+
+
 def calculate_settlement_date(
     trade_date: str,
     security_type: str,
-    settlement_cycles: Dict
+    settlement_cycles: Dict,
+    market: str = DEFAULT_MARKET
 ) -> str:
-    """Calculate settlement date based on security type."""
+    """Calculate settlement date based on security type and market holidays."""
     try:
         trade_dt = datetime.strptime(trade_date, "%Y-%m-%d")
     except ValueError:
@@ -139,17 +188,75 @@ def calculate_settlement_date(
 
     cycle_days = settlement_cycles.get(security_type, 2)
 
-    # Add business days (simplified - doesn't account for holidays)
+    if BusinessCalendar is not None:
+        return _market_calendar(market).add_business_days(trade_dt, cycle_days).strftime("%Y-%m-%d")
+
+    # Add business days, skipping weekends and the market's holidays
+    holidays = set(load_market_holidays().get(market, []))
     settlement_dt = trade_dt
     days_added = 0
     while days_added < cycle_days:
         settlement_dt += timedelta(days=1)
-        if settlement_dt.weekday() < 5:  # Monday = 0, Friday = 4
+        if settlement_dt.weekday() < 5 and settlement_dt.strftime("%Y-%m-%d") not in holidays:
             days_added += 1
 
     return settlement_dt.strftime("%Y-%m-%d")
 
 
+def calculate_settlement_dates(
+    trades: List[Dict],
+    settlement_cycles: Optional[Dict] = None
+) -> List[str]:
+    """
+    Settlement dates for a whole trade blotter.
+
+    Trades are grouped by market and each group is shifted in one call to its
+    compiled calendar.
+
+    Args:
+        trades: Records with trade_date, security_type and optional market
+        settlement_cycles: Business days to settle by security type
+            (default: settlement_cycles.csv)
+
+    Returns:
+        Settlement date (YYYY-MM-DD) for each trade, in input order
+    """
+    if settlement_cycles is None:
+        settlement_cycles = load_settlement_rules()["settlement_cycles"]
+    if BusinessCalendar is None:
+        return [
+            calculate_settlement_date(
+                trade.get("trade_date", ""), trade.get("security_type", "equity"),
+                settlement_cycles, trade.get("market", DEFAULT_MARKET)
+            )
+            for trade in trades
+        ]
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    by_market: Dict[str, List[int]] = {}
+    for position, trade in enumerate(trades):
+        by_market.setdefault(trade.get("market", DEFAULT_MARKET), []).append(position)
+
+    settlement_dates: List[str] = [""] * len(trades)
+    for market, positions in by_market.items():
+        trade_dates = []
+        for position in positions:
+            trade_date = trades[position].get("trade_date", "")
+            try:
+                datetime.strptime(trade_date, "%Y-%m-%d")
+            except (TypeError, ValueError):
+                trade_date = today
+            trade_dates.append(trade_date)
+        cycles = [
+            settlement_cycles.get(trades[position].get("security_type", "equity"), 2)
+            for position in positions
+        ]
+        shifted = _market_calendar(market).add_business_days_batch(trade_dates, cycles)
+        for position, settle in zip(positions, shifted):
+            settlement_dates[position] = settle.isoformat()
+    return settlement_dates
+
+
 def validate_trade_matching(
     trade_details: Dict,
     counterparty_info: Dict,
@@ -311,6 +418,354 @@ def validate_settlement_instructions(
     }
 
 
+DEFAULT_MATCH_KEY_FIELDS = ("counterparty_id", "cusip", "trade_date", "side")
+
+OPPOSITE_SIDE = {"buy": "sell", "sell": "buy"}
+
+
+def _split_fields(value: Any, default: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Comma-separated parameter value as a tuple of field names."""
+    if not value:
+        return default
+    if isinstance(value, str):
+        return tuple(field.strip() for field in value.split(",") if field.strip())
+    return tuple(value)
+
+
+def _group_by_quantity(
+    trades: List[Dict],
+    positions: List[int],
+    exclude: Set[int]
+) -> Tuple[List[Any], Dict[Any, List[Tuple[Any, int]]]]:
+    """Sorted quantities, and (price, position) rows sorted per quantity."""
+    by_quantity: Dict[Any, List[Tuple[Any, int]]] = {}
+    for position in positions:
+        if position not in exclude:
+            trade = trades[position]
+            by_quantity.setdefault(trade.get("quantity", 0), []).append((trade.get("price", 0), position))
+    for rows in by_quantity.values():
+        rows.sort()
+    return sorted(by_quantity), by_quantity
+
+
+def match_trade_blotter(
+    our_trades: List[Dict],
+    counterparty_trades: List[Dict],
+    key_fields: Optional[Tuple[str, ...]] = None,
+    price_tolerance: Optional[float] = None,
+    quantity_tolerance: Optional[float] = None,
+    invert_counterparty_side: bool = True
+) -> Dict[str, Any]:
+    """
+    Match our confirmations against counterparty confirmations in bulk.
+
+    Counterparty confirmations are hash-joined to ours on the trade key, so
+    each trade is compared only with confirmations for the same counterparty,
+    security, date and side. Within a key, fills that agree exactly match by
+    hash, then pairs that agree within tolerance match (closest first). Each
+    trade left over is reported as a quantity/price break against the nearest
+    remaining confirmation, and anything without a partner as unmatched.
+
+    Args:
+        our_trades: Our confirmations (trade_id, counterparty_id, cusip,
+            trade_date, side, quantity, price, currency)
+        counterparty_trades: Their confirmations, sides from their perspective
+        key_fields: Fields joined on (default: matching_rules_key_fields)
+        price_tolerance: Absolute price difference allowed per share
+        quantity_tolerance: Absolute quantity difference allowed
+        invert_counterparty_side: Read counterparty sides as the opposite of ours
+
+    Returns:
+        Matched pairs, breaks and a summary
+    """
+    params = load_parameters()
+    key_fields = key_fields or _split_fields(params.get("matching_rules_key_fields"), DEFAULT_MATCH_KEY_FIELDS)
+    if price_tolerance is None:
+        price_tolerance = params.get("matching_rules_price_tolerance", 0.01)
+    if quantity_tolerance is None:
+        quantity_tolerance = params.get("matching_rules_quantity_tolerance", 0)
+
+    def their_key(trade: Dict) -> Tuple:
+        values = []
+        for field in key_fields:
+            value = trade.get(field)
+            if field == "side" and invert_counterparty_side:
+                value = OPPOSITE_SIDE.get(value, value)
+            values.append(value)
+        return tuple(values)
+
+    theirs_by_key: Dict[Tuple, List[int]] = {}
+    for position, trade in enumerate(counterparty_trades):
+        theirs_by_key.setdefault(their_key(trade), []).append(position)
+    ours_by_key: Dict[Tuple, List[int]] = {}
+    for position, trade in enumerate(our_trades):
+        ours_by_key.setdefault(tuple(trade.get(field) for field in key_fields), []).append(position)
+
+    matched = []
+    breaks = []
+    for key, ours in ours_by_key.items():
+        theirs = theirs_by_key.pop(key, [])
+        if not theirs:
+            breaks.extend({"break_type": "unmatched_ours", "trade_id": our_trades[i].get("trade_id"),
+                           "key": dict(zip(key_fields, key))} for i in ours)
+            continue
+
+        def economics(trade: Dict) -> Tuple[Any, Any]:
+            return trade.get("quantity", 0), trade.get("price", 0)
+
+        def pair(i: int, j: int) -> Tuple[Any, float]:
+            (our_quantity, our_price), (their_quantity, their_price) = (
+                economics(our_trades[i]), economics(counterparty_trades[j]))
+            return abs(our_quantity - their_quantity), abs(our_price - their_price)
+
+        def record_match(i: int, j: int) -> None:
+            qty_diff, price_diff = pair(i, j)
+            used_ours.add(i)
+            used_theirs.add(j)
+            matched.append({
+                "trade_id": our_trades[i].get("trade_id"),
+                "counterparty_trade_id": counterparty_trades[j].get("trade_id"),
+                "quantity_difference": qty_diff,
+                "price_difference": round(price_diff, 6),
+            })
+
+        # Fills that agree exactly are matched by hash, in trade order
+        used_ours, used_theirs = set(), set()
+        exact: Dict[Tuple, List[int]] = {}
+        for j in reversed(theirs):
+            exact.setdefault(economics(counterparty_trades[j]), []).append(j)
+        for i in ours:
+            candidates = exact.get(economics(our_trades[i]))
+            if candidates:
+                record_match(i, candidates.pop())
+
+        # Then pairs within tolerance, closest first so one stray confirmation
+        # cannot steal a good match. Candidates are looked up by quantity and
+        # by price within quantity, so a busy key never builds every pair.
+        quantities, by_quantity = _group_by_quantity(counterparty_trades, theirs, used_theirs)
+        pairs = []
+        for i in ours:
+            if i in used_ours:
+                continue
+            quantity, price = economics(our_trades[i])
+            lo = bisect_left(quantities, quantity - quantity_tolerance)
+            hi = bisect_right(quantities, quantity + quantity_tolerance)
+            for their_quantity in quantities[lo:hi]:
+                rows = by_quantity[their_quantity]
+                for their_price, j in rows[bisect_left(rows, (price - price_tolerance - 1e-9,)):]:
+                    if their_price > price + price_tolerance + 1e-9:
+                        break
+                    qty_diff, price_diff = pair(i, j)
+                    if qty_diff <= quantity_tolerance and price_diff <= price_tolerance + 1e-9:
+                        pairs.append((qty_diff, price_diff, i, j))
+        pairs.sort()
+        for qty_diff, price_diff, i, j in pairs:
+            if i not in used_ours and j not in used_theirs:
+                record_match(i, j)
+
+        # Remaining same-key trades disagree on economics: each is reported as
+        # a break against the nearest remaining confirmation (quantity first)
+        quantities, by_quantity = _group_by_quantity(counterparty_trades, theirs, used_theirs)
+        for i in ours:
+            if not quantities:
+                break
+            if i in used_ours:
+                continue
+            quantity, price = economics(our_trades[i])
+            q = bisect_left(quantities, quantity)
+            their_quantity = min(quantities[max(0, q - 1):q + 1], key=lambda value: abs(value - quantity))
+            rows = by_quantity[their_quantity]
+            k = bisect_left(rows, (price,))
+            k = min(range(max(0, k - 1), min(len(rows), k + 1)), key=lambda index: abs(rows[index][0] - price))
+            j = rows.pop(k)[1]
+            if not rows:
+                del by_quantity[their_quantity]
+                quantities.remove(their_quantity)
+            qty_diff, price_diff = pair(i, j)
+            used_ours.add(i)
+            used_theirs.add(j)
+            breaks.append({
+                "break_type": "quantity_break" if qty_diff > quantity_tolerance else "price_break",
+                "trade_id": our_trades[i].get("trade_id"),
+                "counterparty_trade_id": counterparty_trades[j].get("trade_id"),
+                "our_quantity": our_trades[i].get("quantity", 0),
+                "their_quantity": counterparty_trades[j].get("quantity", 0),
+                "our_price": our_trades[i].get("price", 0),
+                "their_price": counterparty_trades[j].get("price", 0),
+            })
+        breaks.extend({"break_type": "unmatched_ours", "trade_id": our_trades[i].get("trade_id"),
+                       "key": dict(zip(key_fields, key))} for i in ours if i not in used_ours)
+        theirs_left = [j for j in theirs if j not in used_theirs]
+        if theirs_left:
+            theirs_by_key[key] = theirs_left
+
+    for key, theirs in theirs_by_key.items():
+        breaks.extend({"break_type": "unmatched_theirs", "counterparty_trade_id": counterparty_trades[j].get("trade_id"),
+                       "key": dict(zip(key_fields, key))} for j in theirs)
+
+    break_counts: Dict[str, int] = {}
+    for item in breaks:
+        break_counts[item["break_type"]] = break_counts.get(item["break_type"], 0) + 1
+
+    return {
+        "matched": matched,
+        "breaks": breaks,
+        "summary": {
+            "our_trades": len(our_trades),
+            "counterparty_trades": len(counterparty_trades),
+            "matched": len(matched),
+            "match_rate_pct": round(len(matched) / len(our_trades) * 100, 2) if our_trades else 100.0,
+            "breaks_by_type": break_counts,
+        },
+    }
+
+
+def calculate_multilateral_netting(
+    trades: List[Dict],
+    sec_fee_rate: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Net settlement obligations across a blotter in one aggregation pass.
+
+    Cash nets per (counterparty, currency) and securities per (counterparty,
+    security), with the same sign conventions as calculate_net_obligation:
+    buys pay cash and receive securities, sells receive cash net of the SEC
+    fee and deliver securities.
+
+    Args:
+        trades: Trades with counterparty_id, cusip, side, quantity, price
+            and currency
+        sec_fee_rate: SEC fee rate on sales (default: fee_schedules.csv)
+
+    Returns:
+        Cash and securities net positions
+    """
+    if sec_fee_rate is None:
+        sec_fee_rate = load_settlement_rules()["fee_schedules"].get("sec_fee_rate", 0.0000278)
+
+    cash: Dict[Tuple[Any, str], List[float]] = {}
+    securities: Dict[Tuple[Any, Any], List[int]] = {}
+    for trade in trades:
+        counterparty = trade.get("counterparty_id")
+        quantity = trade.get("quantity", 0)
+        gross = quantity * trade.get("price", 0)
+        # [gross buys, gross sells, fees, trade count]
+        position = cash.setdefault((counterparty, trade.get("currency", "USD")), [0.0, 0.0, 0.0, 0])
+        # [quantity received, quantity delivered]
+        holding = securities.setdefault((counterparty, trade.get("cusip")), [0, 0])
+        if trade.get("side", "buy") == "buy":
+            position[0] += gross
+            holding[0] += quantity
+        else:
+            position[1] += gross
+            position[2] += gross * sec_fee_rate
+            holding[1] += quantity
+        position[3] += 1
+
+    cash_positions = [
+        {
+            "counterparty_id": counterparty,
+            "currency": currency,
+            "gross_buys": round(buys, 2),
+            "gross_sells": round(sells, 2),
+            "sec_fees": round(fees, 2),
+            "net_cash_obligation": round(sells - fees - buys, 2),
+            "trade_count": count,
+        }
+        for (counterparty, currency), (buys, sells, fees, count) in cash.items()
+    ]
+    securities_positions = [
+        {
+            "counterparty_id": counterparty,
+            "cusip": cusip,
+            "received": received,
+            "delivered": delivered,
+            "net_securities_obligation": received - delivered,
+        }
+        for (counterparty, cusip), (received, delivered) in securities.items()
+    ]
+    gross_value = sum(p["gross_buys"] + p["gross_sells"] for p in cash_positions)
+    net_value = sum(abs(p["net_cash_obligation"]) for p in cash_positions)
+
+    return {
+        "cash_positions": cash_positions,
+        "securities_positions": securities_positions,
+        "gross_value": round(gross_value, 2),
+        "net_value": round(net_value, 2),
+        "netting_efficiency_pct": round((1 - net_value / gross_value) * 100, 2) if gross_value else 0.0,
+    }
+
+
+def process_settlement_blotter(
+    our_trades: List[Dict],
+    counterparty_trades: List[Dict],
+    counterparties: Optional[Dict[str, Dict]] = None,
+    positions: Optional[Dict[str, Dict]] = None
+) -> Dict[str, Any]:
+    """
+    Match, net and risk-assess a full settlement cycle.
+
+    Only matched trades are netted. Fail risk is assessed once per netted
+    securities position: a net delivery is checked like a single sell in
+    assess_fail_risk. Deliveries of the same security to different
+    counterparties draw on one available and pending balance, allocated to
+    them in turn, so the balance is never counted twice.
+
+    Args:
+        our_trades: Our confirmations
+        counterparty_trades: Counterparty confirmations
+        counterparties: Counterparty id -> details (credit_rating, ...)
+        positions: CUSIP -> position data (available, pending_receipts)
+
+    Returns:
+        Matching results, net obligations with fail risk, and a summary
+    """
+    rules = load_settlement_rules()
+    counterparties = counterparties or {}
+    positions = positions or {}
+
+    matching = match_trade_blotter(our_trades, counterparty_trades)
+    matched_ids = {pair["trade_id"] for pair in matching["matched"]}
+    netting = calculate_multilateral_netting([t for t in our_trades if t.get("trade_id") in matched_ids])
+
+    at_risk = 0
+    # CUSIP -> [available, pending receipts] not yet allocated to a delivery
+    balances: Dict[Any, List[float]] = {}
+    for position in netting["securities_positions"]:
+        net = position["net_securities_obligation"]
+        position_data = positions.get(position["cusip"], {})
+        if net < 0:
+            balance = balances.setdefault(position["cusip"], [
+                max(0, position_data.get("available", 0)),
+                max(0, position_data.get("pending_receipts", 0)),
+            ])
+            position_data = {"available": balance[0], "pending_receipts": balance[1]}
+            from_available = min(balance[0], -net)
+            balance[0] -= from_available
+            balance[1] = max(0, balance[1] + net + from_available)
+        risk = assess_fail_risk(
+            {"side": "sell" if net < 0 else "buy", "quantity": abs(net)},
+            position_data,
+            counterparties.get(position["counterparty_id"], {}),
+            rules.get("risk_factors", {})
+        )
+        position["fail_risk"] = risk
+        if risk["fail_risk_level"] == "high":
+            at_risk += 1
+
+    return {
+        "matching": matching,
+        "netting": netting,
+        "summary": {
+            **matching["summary"],
+            "net_cash_positions": len(netting["cash_positions"]),
+            "net_securities_positions": len(netting["securities_positions"]),
+            "positions_at_risk": at_risk,
+            "netting_efficiency_pct": netting["netting_efficiency_pct"],
+        },
+    }
+
+
 def process_settlement(
     trade_id: str,
     trade_details: Dict,
@@ -348,7 +803,8 @@ def process_settlement(
     settlement_date = calculate_settlement_date(
         trade_date,
         security_type,
-        rules.get("settlement_cycles", {})
+        rules.get("settlement_cycles", {}),
+        security_info.get("market", DEFAULT_MARKET)
     )
 
     # Validate matching
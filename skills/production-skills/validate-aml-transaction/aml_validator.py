@@ -6,12 +6,19 @@ using risk scoring, pattern detection, and regulatory thresholds.
 """
 
 import csv
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Deque, Tuple
+from datetime import datetime
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
 
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -35,6 +42,7 @@ def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[st
     return result
 
 
+@cached_reference_loader
 def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     """Load a CSV file and return as list of dictionaries."""
     csv_path = Path(__file__).parent / filename
@@ -57,6 +65,7 @@ def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     return result
 
 
+@cached_reference_loader
 def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
     """Load parameters CSV as key-value dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -82,6 +91,7 @@ def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
                     result[key] = value
     return result
 
+@cached_reference_loader
 def load_key_value_csv(filename: str) -> Dict[str, Any]:
     """Load a key-value CSV file as a flat dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -248,58 +258,90 @@ def calculate_geographic_risk_score(
     }
 
 
-def detect_structuring(
-    transaction: Dict,
-    recent_transactions: List[Dict],
+def parse_timestamp(timestamp: str) -> float:
+    """
+    Convert a 'YYYY-MM-DD HH:MM:SS' timestamp to seconds on a naive epoch.
+
+    Uses datetime.fromisoformat, which is implemented in C and much cheaper
+    than strptime on hot paths.
+    """
+    dt = datetime.fromisoformat(timestamp)
+    return (
+        dt.toordinal() * 86400
+        + dt.hour * 3600 + dt.minute * 60 + dt.second
+        + dt.microsecond / 1e6
+    )
+
+
+def is_structuring_amount(amount: float, ctr_threshold: float) -> bool:
+    """Whether an amount sits just below the CTR threshold (80-100%)."""
+    return ctr_threshold * 0.8 <= amount < ctr_threshold
+
+
+def summarize_structuring(
+    current_amount: float,
+    prior_count: int,
+    prior_amount: float,
     thresholds: Dict
 ) -> Dict[str, Any]:
-    """Detect potential structuring activity."""
+    """
+    Build the structuring result from the just-below-threshold transactions
+    already seen in the window plus the current transaction.
+    """
     ctr_threshold = thresholds.get("ctr_threshold", 10000)
     structuring_window = thresholds.get("structuring_window_hours", 24)
     structuring_count = thresholds.get("structuring_count", 3)
 
-    current_amount = transaction.get("amount", 0)
-    current_time = datetime.strptime(transaction.get("timestamp", ""), "%Y-%m-%d %H:%M:%S")
-
-    # Check for transactions just below threshold
-    suspicious_transactions = []
-    window_start = current_time - timedelta(hours=structuring_window)
-
-    for txn in recent_transactions:
-        txn_amount = txn.get("amount", 0)
-        txn_time = datetime.strptime(txn.get("timestamp", ""), "%Y-%m-%d %H:%M:%S")
-
-        # Transaction within window and just below threshold
-        if txn_time >= window_start:
-            if ctr_threshold * 0.8 <= txn_amount < ctr_threshold:
-                suspicious_transactions.append(txn)
+    suspicious_count = prior_count
+    suspicious_amount = prior_amount
 
     # Include current transaction if it fits pattern
-    if ctr_threshold * 0.8 <= current_amount < ctr_threshold:
-        suspicious_transactions.append(transaction)
-
-    is_structuring = len(suspicious_transactions) >= structuring_count
+    if is_structuring_amount(current_amount, ctr_threshold):
+        suspicious_count += 1
+        suspicious_amount += current_amount
 
     return {
-        "structuring_detected": is_structuring,
-        "suspicious_transaction_count": len(suspicious_transactions),
+        "structuring_detected": suspicious_count >= structuring_count,
+        "suspicious_transaction_count": suspicious_count,
         "window_hours": structuring_window,
-        "total_suspicious_amount": sum(t.get("amount", 0) for t in suspicious_transactions)
+        "total_suspicious_amount": suspicious_amount
     }
 
 
-def check_velocity(
-    customer_id: str,
+def detect_structuring(
+    transaction: Dict,
     recent_transactions: List[Dict],
+    thresholds: Dict
+) -> Dict[str, Any]:
+    """Detect potential structuring activity."""
+    ctr_threshold = thresholds.get("ctr_threshold", 10000)
+    structuring_window = thresholds.get("structuring_window_hours", 24)
+
+    current_time = parse_timestamp(transaction.get("timestamp", ""))
+    window_start = current_time - structuring_window * 3600
+
+    # Check for transactions within window and just below threshold
+    prior_count = 0
+    prior_amount = 0
+    for txn in recent_transactions:
+        txn_amount = txn.get("amount", 0)
+        if not is_structuring_amount(txn_amount, ctr_threshold):
+            continue
+        if parse_timestamp(txn.get("timestamp", "")) >= window_start:
+            prior_count += 1
+            prior_amount += txn_amount
+
+    return summarize_structuring(transaction.get("amount", 0), prior_count, prior_amount, thresholds)
+
+
+def summarize_velocity(
+    daily_count: int,
+    daily_amount: float,
     velocity_rules: Dict
 ) -> Dict[str, Any]:
-    """Check transaction velocity against limits."""
+    """Build the velocity result from the recent transaction count and amount."""
     violations = []
 
-    # Daily checks
-    daily_count = len(recent_transactions)
-    daily_amount = sum(t.get("amount", 0) for t in recent_transactions)
-
     if daily_count > velocity_rules.get("daily_transaction_count", 10):
         violations.append({
             "rule": "daily_transaction_count",
@@ -321,6 +363,19 @@ def check_velocity(
     }
 
 
+def check_velocity(
+    customer_id: str,
+    recent_transactions: List[Dict],
+    velocity_rules: Dict
+) -> Dict[str, Any]:
+    """Check transaction velocity against limits."""
+    return summarize_velocity(
+        len(recent_transactions),
+        sum(t.get("amount", 0) for t in recent_transactions),
+        velocity_rules
+    )
+
+
 def detect_red_flags(
     transaction: Dict,
     customer_data: Dict,
@@ -328,6 +383,23 @@ def detect_red_flags(
     red_flag_config: Dict
 ) -> List[Dict]:
     """Detect red flags in transaction."""
+    return flag_red_flags(
+        transaction,
+        customer_data,
+        len(recent_transactions),
+        sum(t.get("amount", 0) for t in recent_transactions),
+        red_flag_config
+    )
+
+
+def flag_red_flags(
+    transaction: Dict,
+    customer_data: Dict,
+    recent_count: int,
+    recent_amount: float,
+    red_flag_config: Dict
+) -> List[Dict]:
+    """Detect red flags from the transaction and recent activity totals."""
     detected_flags = []
 
     # Check for unusual volume
@@ -340,9 +412,8 @@ def detect_red_flags(
         })
 
     # Check for rapid movement
-    if recent_transactions:
-        recent_amounts = sum(t.get("amount", 0) for t in recent_transactions)
-        if recent_amounts > customer_data.get("monthly_avg_volume", 10000) * 3:
+    if recent_count:
+        if recent_amount > customer_data.get("monthly_avg_volume", 10000) * 3:
             detected_flags.append({
                 "flag": "rapid_movement",
                 "severity": red_flag_config.get("rapid_movement", {}).get("severity", "high"),
@@ -401,11 +472,6 @@ def validate_aml_transaction(
     """
     rules = load_aml_rules()
 
-    # Calculate risk scores
-    customer_risk = calculate_customer_risk_score(customer_data, rules)
-    transaction_risk = calculate_transaction_risk_score(transaction, rules)
-    geographic_risk = calculate_geographic_risk_score(countries_involved, rules)
-
     # Detect structuring
     structuring = detect_structuring(
         transaction,
@@ -428,6 +494,29 @@ def validate_aml_transaction(
         rules.get("red_flags", {})
     )
 
+    return build_aml_result(
+        transaction_id, transaction, customer_data, countries_involved,
+        validation_timestamp, rules, structuring, velocity, red_flags
+    )
+
+
+def build_aml_result(
+    transaction_id: str,
+    transaction: Dict,
+    customer_data: Dict,
+    countries_involved: List[str],
+    validation_timestamp: str,
+    rules: Dict[str, Any],
+    structuring: Dict[str, Any],
+    velocity: Dict[str, Any],
+    red_flags: List[Dict]
+) -> Dict[str, Any]:
+    """Score a transaction and assemble the validation result."""
+    # Calculate risk scores
+    customer_risk = calculate_customer_risk_score(customer_data, rules)
+    transaction_risk = calculate_transaction_risk_score(transaction, rules)
+    geographic_risk = calculate_geographic_risk_score(countries_involved, rules)
+
     # Calculate total risk score
     total_score = (
         customer_risk["customer_risk_score"] * 0.30 +
@@ -470,6 +559,191 @@ def validate_aml_transaction(
     }
 
 
+class SlidingWindow:
+    """
+    Time-bounded window of (epoch, amount) entries with running totals.
+
+    Entries are appended in non-decreasing time order, so expiring old ones
+    only ever pops from the left: each entry is added and removed once, for
+    O(1) amortized updates instead of rescanning the history per transaction.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.entries: Deque[Tuple[float, float]] = deque()
+        self.amount = 0
+
+    @property
+    def count(self) -> int:
+        return len(self.entries)
+
+    def evict(self, now: float) -> None:
+        """Drop entries older than the window ending at now (the start is inclusive)."""
+        cutoff = now - self.seconds
+        entries = self.entries
+        while entries and entries[0][0] < cutoff:
+            self.amount -= entries.popleft()[1]
+        if not entries:
+            # Reset so float rounding from the running sum cannot accumulate
+            self.amount = 0
+
+    def add(self, epoch: float, amount: float) -> None:
+        self.entries.append((epoch, amount))
+        self.amount += amount
+
+
+class CustomerActivity:
+    """Sliding windows over one customer's transaction stream."""
+
+    def __init__(self, history_seconds: float, structuring_seconds: float):
+        # All transactions: drives the velocity check and rapid-movement flag
+        self.history = SlidingWindow(history_seconds)
+        # Only just-below-CTR transactions: drives structuring detection
+        self.structuring = SlidingWindow(structuring_seconds)
+        self.last_seen: Optional[float] = None
+
+
+class AMLStreamMonitor:
+    """
+    Stateful AML screening over a time-ordered transaction stream.
+
+    Keeps per-customer sliding windows instead of receiving each customer's
+    recent history with every call. Screening a transaction gives the same
+    result as validate_aml_transaction() called with recent_transactions set
+    to that customer's earlier transactions from the last history_hours
+    (24 by default, the "daily" velocity window). Running sums are exact for
+    integer amounts and equal up to float rounding for fractional ones.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, Any]] = None, history_hours: float = 24):
+        self.rules = rules if rules is not None else load_aml_rules()
+        self.thresholds = self.rules.get("transaction_thresholds", {})
+        self.velocity_rules = self.rules.get("velocity_rules", {})
+        self.red_flag_config = self.rules.get("red_flags", {})
+        self.ctr_threshold = self.thresholds.get("ctr_threshold", 10000)
+        self.history_seconds = history_hours * 3600
+        self.structuring_seconds = self.thresholds.get("structuring_window_hours", 24) * 3600
+        self.customers: Dict[str, CustomerActivity] = {}
+
+    def screen(
+        self,
+        transaction_id: str,
+        transaction: Dict,
+        customer_data: Dict,
+        countries_involved: List[str],
+        validation_timestamp: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Screen the next transaction of the stream and add it to the customer's windows.
+
+        Args:
+            transaction_id: Transaction identifier
+            transaction: Transaction details (amount, timestamp, ...)
+            customer_data: Customer profile data (customer_id keys the windows)
+            countries_involved: Countries in transaction
+            validation_timestamp: Validation timestamp (default: transaction timestamp)
+
+        Returns:
+            AML validation results, as from validate_aml_transaction()
+
+        Raises:
+            ValueError: If the transaction is older than the customer's previous one
+        """
+        customer_id = customer_data.get("customer_id", "")
+        timestamp = transaction.get("timestamp", "")
+        now = parse_timestamp(timestamp)
+        amount = transaction.get("amount", 0)
+
+        activity = self.customers.get(customer_id)
+        if activity is None:
+            activity = CustomerActivity(self.history_seconds, self.structuring_seconds)
+            self.customers[customer_id] = activity
+        elif now < activity.last_seen:
+            raise ValueError(
+                f"Transaction {transaction_id} at {timestamp} is out of order for customer {customer_id}"
+            )
+
+        history = activity.history
+        structuring_window = activity.structuring
+        history.evict(now)
+        structuring_window.evict(now)
+
+        structuring = summarize_structuring(
+            amount, structuring_window.count, structuring_window.amount, self.thresholds
+        )
+        velocity = summarize_velocity(history.count, history.amount, self.velocity_rules)
+        red_flags = flag_red_flags(
+            transaction, customer_data, history.count, history.amount, self.red_flag_config
+        )
+
+        result = build_aml_result(
+            transaction_id, transaction, customer_data, countries_involved,
+            validation_timestamp or timestamp, self.rules, structuring, velocity, red_flags
+        )
+
+        history.add(now, amount)
+        if is_structuring_amount(amount, self.ctr_threshold):
+            structuring_window.add(now, amount)
+        activity.last_seen = now
+        return result
+
+    def expire(self, now: float) -> int:
+        """
+        Forget customers with no activity inside either window.
+
+        Args:
+            now: Current stream time (epoch seconds from parse_timestamp)
+
+        Returns:
+            Number of customers removed
+        """
+        horizon = now - max(self.history_seconds, self.structuring_seconds)
+        idle = [
+            customer_id for customer_id, activity in self.customers.items()
+            if activity.last_seen is not None and activity.last_seen < horizon
+        ]
+        for customer_id in idle:
+            del self.customers[customer_id]
+        return len(idle)
+
+
+def screen_transaction_stream(
+    transactions: Iterable[Dict[str, Any]],
+    rules: Optional[Dict[str, Any]] = None,
+    history_hours: float = 24,
+    expire_every: int = 10000
+) -> Iterator[Dict[str, Any]]:
+    """
+    Screen a time-ordered stream of transactions end to end.
+
+    Each record holds the arguments of validate_aml_transaction() except
+    recent_transactions, which comes from the sliding windows:
+    transaction_id, transaction, customer_data, countries_involved and
+    (optionally) validation_timestamp.
+
+    Args:
+        transactions: Records in non-decreasing transaction timestamp order
+        rules: AML rules (default: load_aml_rules())
+        history_hours: Look-back window for velocity and rapid-movement checks
+        expire_every: Drop idle customers' state after this many records
+
+    Returns:
+        Iterator of AML validation results, one per record
+    """
+    monitor = AMLStreamMonitor(rules, history_hours)
+    for index, record in enumerate(transactions, 1):
+        transaction = record.get("transaction", {})
+        yield monitor.screen(
+            record.get("transaction_id", ""),
+            transaction,
+            record.get("customer_data", {}),
+            record.get("countries_involved", []),
+            record.get("validation_timestamp")
+        )
+        if expire_every and index % expire_every == 0:
+            monitor.expire(parse_timestamp(transaction.get("timestamp", "")))
+
+
 if __name__ == "__main__":
     import json
     result = validate_aml_transaction(
@@ -6,13 +6,22 @@ completeness, accuracy, consistency, and anomaly detection.
 """
 
 import csv
+import hashlib
+import heapq
+import random
 import re
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Optional, Tuple, Union
 import math
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
 
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -36,6 +45,7 @@ def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[st
     return result
 
 
+@cached_reference_loader
 def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     """Load a CSV file and return as list of dictionaries."""
     csv_path = Path(__file__).parent / filename
@@ -58,6 +68,7 @@ def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     return result
 
 
+@cached_reference_loader
 def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
     """Load parameters CSV as key-value dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -83,6 +94,7 @@ def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
                     result[key] = value
     return result
 
+@cached_reference_loader
 def load_key_value_csv(filename: str) -> Dict[str, Any]:
     """Load a key-value CSV file as a flat dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -131,20 +143,293 @@ def load_quality_rules() -> Dict[str, Any]:
     }
 
 
-def check_completeness(
-    records: List[Dict],
-    required_fields: List[str]
+DEFAULT_QUANTILES = (5, 25, 50, 75, 95)
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch (about 1% error at precision 14).
+
+    Values are hashed with BLAKE2b, so estimates are stable across processes.
+    """
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+        self._rest_bits = 64 - precision
+
+    def add(self, value: Any) -> None:
+        """Add one value to the sketch."""
+        digest = hashlib.blake2b(repr(value).encode(), digest_size=8).digest()
+        hashed = int.from_bytes(digest, "big")
+        register = hashed >> self._rest_bits
+        rest = hashed & ((1 << self._rest_bits) - 1)
+        rank = self._rest_bits - rest.bit_length() + 1
+        if rank > self.registers[register]:
+            self.registers[register] = rank
+
+    def count(self) -> int:
+        """Estimated number of distinct values added."""
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / math.fsum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+def _interpolated_percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentile of sorted values with linear interpolation."""
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+class _FieldStats:
+    """Running statistics of one column, updated a chunk at a time."""
+
+    def __init__(self, numeric: bool, distinct_limit: int, hll_precision: int,
+                 sample_size: int, candidate_limit: int, seed: int):
+        self.numeric = numeric
+        self.distinct_limit = distinct_limit
+        self.hll_precision = hll_precision
+        self.count = 0
+        self.non_null = 0
+        self.empty = 0
+        self.distinct: Optional[set] = set()
+        self.sketch: Optional[HyperLogLog] = None
+
+        # Numeric columns: Chan et al. merge of chunk moments, a reservoir
+        # sample for quantiles and the most extreme values for outliers
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.sample: List[float] = []
+        self.sample_size = sample_size
+        self.candidate_limit = candidate_limit
+        self.high: List[Tuple[float, int]] = []
+        self.low: List[Tuple[float, int]] = []
+        self.rng = random.Random(seed)
+
+    def update(self, column: List[Any]) -> None:
+        present = [value for value in column if value is not None]
+        self.count += len(column)
+        self.non_null += len(present)
+        self.empty += sum(1 for value in present if value == "")
+
+        if self.distinct is not None:
+            try:
+                self.distinct.update(present)
+            except TypeError:  # unhashable values (lists, dicts)
+                self.distinct.update(repr(value) for value in present)
+            if len(self.distinct) > self.distinct_limit:
+                self.sketch = HyperLogLog(self.hll_precision)
+                for value in self.distinct:
+                    self.sketch.add(value)
+                self.distinct = None
+        else:
+            for value in present:
+                self.sketch.add(value)
+
+        if self.numeric:
+            self._update_numeric(present)
+
+    def _update_numeric(self, present: List[Any]) -> None:
+        values = []
+        for value in present:
+            try:
+                values.append(float(value))
+            except (ValueError, TypeError):
+                pass
+        if not values:
+            return
+
+        offset, n = self.n, len(values)
+        chunk_mean = math.fsum(values) / n
+        chunk_m2 = math.fsum((v - chunk_mean) ** 2 for v in values)
+        total = offset + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * offset * n / total
+        self.n = total
+        self.minimum = min(self.minimum, min(values))
+        self.maximum = max(self.maximum, max(values))
+
+        for i, value in enumerate(values, offset):
+            if i < self.sample_size:
+                self.sample.append(value)
+            else:
+                j = self.rng.randrange(i + 1)
+                if j < self.sample_size:
+                    self.sample[j] = value
+
+        indexed = list(zip(values, range(offset, total)))
+        self.high = heapq.nlargest(self.candidate_limit, self.high + indexed)
+        self.low = heapq.nsmallest(self.candidate_limit, self.low + indexed)
+
+    def distinct_count(self) -> int:
+        return len(self.distinct) if self.distinct is not None else self.sketch.count()
+
+    def result(self, std_dev_threshold: float, quantiles: Tuple[float, ...]) -> Dict[str, Any]:
+        missing = self.count - self.non_null + self.empty
+        distinct = self.distinct_count()
+        profile: Dict[str, Any] = {
+            "count": self.count,
+            "null_count": self.count - self.non_null,
+            "missing_count": missing,
+            "completeness_pct": round((self.count - missing) / self.count * 100, 2) if self.count else 0,
+            "non_null_count": self.non_null,
+            "distinct_count": distinct,
+            "distinct_exact": self.distinct is not None,
+            "duplicate_count": max(0, self.non_null - distinct),
+        }
+        if not self.numeric or not self.n:
+            return profile
+
+        std_dev = math.sqrt(self.m2 / self.n) if self.m2 > 0 else 0
+        ordered = sorted(self.sample)
+        candidates = {index: value for value, index in self.high + self.low}
+        outliers = []
+        if std_dev > 0:
+            for index in sorted(candidates):
+                z_score = abs((candidates[index] - self.mean) / std_dev)
+                if z_score > std_dev_threshold:
+                    outliers.append({"index": index, "value": candidates[index], "z_score": round(z_score, 2)})
+
+        def all_outliers(side: List[Tuple[float, int]]) -> bool:
+            return len(side) == self.candidate_limit and all(
+                abs(value - self.mean) / std_dev > std_dev_threshold for value, _ in side
+            )
+
+        profile.update({
+            "numeric_count": self.n,
+            "mean": self.mean,
+            "std_dev": std_dev,
+            "min": self.minimum,
+            "max": self.maximum,
+            "quantiles": {f"p{pct:g}": _interpolated_percentile(ordered, pct) for pct in quantiles},
+            "quantiles_exact": self.n <= self.sample_size,
+            "outlier_count": len(outliers),
+            # More outliers than tracked candidates: the count is a lower bound
+            "outlier_count_capped": std_dev > 0 and self.n > self.candidate_limit
+                                    and (all_outliers(self.high) or all_outliers(self.low)),
+            "outliers": outliers,
+        })
+        return profile
+
+
+class ColumnProfiler:
+    """
+    Single-pass columnar profile of a record stream.
+
+    Each chunk of records is split into one column per field and folded into
+    running statistics: null and empty counts, distinct counts (exact up to
+    distinct_exact_limit values per field, HyperLogLog beyond), and for
+    numeric fields mean, population standard deviation, min/max, quantiles
+    from a reservoir sample and z-score outliers from the most extreme
+    values seen. Memory is bounded per field, so extracts of any size can be
+    profiled chunk by chunk.
+
+    Usage::
+
+        profiler = ColumnProfiler(["id", "email", "amount"], numeric_fields=["amount"])
+        for chunk in read_in_chunks(path):
+            profiler.update(chunk)
+        profile = profiler.result()
+    """
+
+    def __init__(
+        self,
+        fields: List[str],
+        numeric_fields: Optional[List[str]] = None,
+        std_dev_threshold: Optional[float] = None,
+        quantiles: Tuple[float, ...] = DEFAULT_QUANTILES,
+        seed: int = 0
+    ):
+        rules = load_quality_rules()
+        anomaly_config = rules.get("anomaly_detection", {})
+        profiling = rules.get("data_profiling", {})
+        numeric = set(numeric_fields or [])
+
+        self.fields = list(dict.fromkeys(list(fields) + list(numeric_fields or [])))
+        self.std_dev_threshold = (
+            std_dev_threshold if std_dev_threshold is not None
+            else anomaly_config.get("outlier_std_dev", 3.0)
+        )
+        self.quantiles = tuple(quantiles)
+        self.records = 0
+        self.stats = {
+            field: _FieldStats(
+                numeric=field in numeric,
+                distinct_limit=rules.get("distinct_exact_limit", 100000),
+                hll_precision=rules.get("hll_precision", 14),
+                sample_size=profiling.get("max_sample_size", 100000),
+                candidate_limit=rules.get("outlier_candidate_limit", 1000),
+                seed=seed,
+            )
+            for field in self.fields
+        }
+
+    def update(self, records: List[Dict]) -> None:
+        """Fold one chunk of records into the profile."""
+        self.records += len(records)
+        for field, stats in self.stats.items():
+            stats.update([record.get(field) for record in records])
+
+    def result(self) -> Dict[str, Any]:
+        """Profile of every field seen so far."""
+        return {
+            "records": self.records,
+            "fields": {
+                field: stats.result(self.std_dev_threshold, self.quantiles)
+                for field, stats in self.stats.items()
+            },
+        }
+
+
+def profile_records(
+    records: Union[List[Dict], Iterable[List[Dict]]],
+    fields: List[str],
+    numeric_fields: Optional[List[str]] = None,
+    std_dev_threshold: Optional[float] = None
 ) -> Dict[str, Any]:
-    """Check data completeness."""
-    total_records = len(records)
+    """
+    Profile a list of records or an iterable of record chunks.
+
+    Args:
+        records: Records, or chunks of records (e.g. from a chunked CSV reader)
+        fields: Fields to profile
+        numeric_fields: Fields to treat as numeric
+        std_dev_threshold: Z-score above which a value is an outlier
+
+    Returns:
+        Profile with per-field statistics
+    """
+    profiler = ColumnProfiler(fields, numeric_fields, std_dev_threshold)
+    if isinstance(records, list) and (not records or isinstance(records[0], dict)):
+        profiler.update(records)
+    else:
+        for chunk in records:
+            profiler.update(chunk)
+    return profiler.result()
+
+
+def completeness_from_profile(profile: Dict[str, Any], required_fields: List[str]) -> Dict[str, Any]:
+    """Completeness dimension from a column profile."""
+    total_records = profile["records"]
     field_completeness = {}
     missing_counts = {}
-
     for field in required_fields:
-        missing = sum(1 for r in records if r.get(field) is None or r.get(field) == "")
-        completeness = ((total_records - missing) / total_records * 100) if total_records > 0 else 0
-        field_completeness[field] = round(completeness, 2)
-        missing_counts[field] = missing
+        stats = profile["fields"][field]
+        field_completeness[field] = stats["completeness_pct"]
+        missing_counts[field] = stats["missing_count"]
 
     overall_completeness = sum(field_completeness.values()) / len(field_completeness) if field_completeness else 0
 
@@ -158,6 +443,63 @@ def check_completeness(
     }
 
 
+def uniqueness_from_profile(profile: Dict[str, Any], unique_fields: List[str]) -> Dict[str, Any]:
+    """Uniqueness dimension from a column profile."""
+    duplicate_info = {}
+    for field in unique_fields:
+        stats = profile["fields"][field]
+        total_values = stats["non_null_count"]
+        unique_values = min(stats["distinct_count"], total_values)
+        uniqueness = (unique_values / total_values * 100) if total_values else 100
+        duplicate_info[field] = {
+            "total_values": total_values,
+            "unique_values": unique_values,
+            "duplicate_count": total_values - unique_values,
+            "uniqueness_pct": round(uniqueness, 2)
+        }
+        if not stats["distinct_exact"]:
+            duplicate_info[field]["estimated"] = True
+
+    overall_uniqueness = sum(d["uniqueness_pct"] for d in duplicate_info.values()) / len(duplicate_info) if duplicate_info else 100
+
+    return {
+        "dimension": "uniqueness",
+        "overall_score": round(overall_uniqueness, 2),
+        "field_analysis": duplicate_info,
+        "total_records": profile["records"]
+    }
+
+
+def anomalies_from_profile(profile: Dict[str, Any], numeric_fields: List[str]) -> Dict[str, Any]:
+    """Anomaly detection results from a column profile."""
+    anomalies = {}
+    for field in numeric_fields:
+        stats = profile["fields"][field]
+        if stats.get("numeric_count", 0) < 10:
+            continue
+        anomalies[field] = {
+            "mean": round(stats["mean"], 2),
+            "std_dev": round(stats["std_dev"], 2),
+            "outlier_count": stats["outlier_count"],
+            "outliers_sample": stats["outliers"][:5]
+        }
+        if stats["outlier_count_capped"]:
+            anomalies[field]["outlier_count_is_lower_bound"] = True
+
+    return {
+        "anomaly_detection": anomalies,
+        "fields_analyzed": numeric_fields
+    }
+
+
+def check_completeness(
+    records: List[Dict],
+    required_fields: List[str]
+) -> Dict[str, Any]:
+    """Check data completeness."""
+    return completeness_from_profile(profile_records(records, required_fields), required_fields)
+
+
 def check_accuracy(
     records: List[Dict],
     field_rules: Dict
@@ -274,30 +616,7 @@ def check_uniqueness(
     unique_fields: List[str]
 ) -> Dict[str, Any]:
     """Check for duplicate records."""
-    total_records = len(records)
-    duplicate_info = {}
-
-    for field in unique_fields:
-        values = [r.get(field) for r in records if r.get(field) is not None]
-        unique_values = len(set(values))
-        duplicates = len(values) - unique_values
-
-        uniqueness = (unique_values / len(values) * 100) if values else 100
-        duplicate_info[field] = {
-            "total_values": len(values),
-            "unique_values": unique_values,
-            "duplicate_count": duplicates,
-            "uniqueness_pct": round(uniqueness, 2)
-        }
-
-    overall_uniqueness = sum(d["uniqueness_pct"] for d in duplicate_info.values()) / len(duplicate_info) if duplicate_info else 100
-
-    return {
-        "dimension": "uniqueness",
-        "overall_score": round(overall_uniqueness, 2),
-        "field_analysis": duplicate_info,
-        "total_records": total_records
-    }
+    return uniqueness_from_profile(profile_records(records, unique_fields), unique_fields)
 
 
 def check_timeliness(
@@ -357,43 +676,8 @@ def detect_anomalies(
     std_dev_threshold: float
 ) -> Dict[str, Any]:
     """Detect statistical anomalies."""
-    anomalies = {}
-
-    for field in numeric_fields:
-        values = []
-        for r in records:
-            val = r.get(field)
-            if val is not None:
-                try:
-                    values.append(float(val))
-                except (ValueError, TypeError):
-                    pass
-
-        if len(values) < 10:
-            continue
-
-        mean = sum(values) / len(values)
-        variance = sum((x - mean) ** 2 for x in values) / len(values)
-        std_dev = math.sqrt(variance) if variance > 0 else 0
-
-        outliers = []
-        for i, v in enumerate(values):
-            if std_dev > 0:
-                z_score = abs((v - mean) / std_dev)
-                if z_score > std_dev_threshold:
-                    outliers.append({"index": i, "value": v, "z_score": round(z_score, 2)})
-
-        anomalies[field] = {
-            "mean": round(mean, 2),
-            "std_dev": round(std_dev, 2),
-            "outlier_count": len(outliers),
-            "outliers_sample": outliers[:5]
-        }
-
-    return {
-        "anomaly_detection": anomalies,
-        "fields_analyzed": numeric_fields
-    }
+    profile = profile_records(records, numeric_fields, numeric_fields, std_dev_threshold)
+    return anomalies_from_profile(profile, numeric_fields)
 
 
 def calculate_overall_score(
@@ -483,19 +767,23 @@ def validate_data_quality(
     thresholds = rules.get("scoring_thresholds", {})
     anomaly_config = rules.get("anomaly_detection", {})
 
+    # Profile every field once for completeness, uniqueness and anomalies
+    profile = profile_records(
+        records,
+        required_fields + unique_fields,
+        numeric_fields,
+        anomaly_config.get("outlier_std_dev", 3.0)
+    )
+
     # Check each dimension
-    completeness = check_completeness(records, required_fields)
+    completeness = completeness_from_profile(profile, required_fields)
     accuracy = check_accuracy(records, field_rules)
     consistency = check_consistency(records, consistency_rules)
-    uniqueness = check_uniqueness(records, unique_fields)
+    uniqueness = uniqueness_from_profile(profile, unique_fields)
     timeliness = check_timeliness(records, timestamp_field, freshness_threshold_hours)
 
     # Detect anomalies
-    anomalies = detect_anomalies(
-        records,
-        numeric_fields,
-        anomaly_config.get("outlier_std_dev", 3.0)
-    )
+    anomalies = anomalies_from_profile(profile, numeric_fields)
 
     # Aggregate dimension scores
     dimension_scores = {
@@ -10,7 +10,14 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
+
+@cached_reference_loader
 def load_duty_limits() -> Dict[str, Any]:
     """Load duty time limits from CSV configuration."""
     limits_path = Path(__file__).parent / "duty_limits.csv"
@@ -6,10 +6,21 @@ industry standards and customer specifications.
 """
 
 import csv
+from bisect import bisect_left, bisect_right
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
+try:
+    from skill_runtime.refdata import cached_reference_loader, cached_reference_object
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
+    def cached_reference_object(func):
+        return func
+
+
+@cached_reference_loader
 def load_alloy_specs() -> Dict[str, Any]:
     """Load alloy specification data."""
     specs_path = Path(__file__).parent / "alloy_specs.csv"
@@ -36,6 +47,74 @@ def load_alloy_specs() -> Dict[str, Any]:
     return specs
 
 
+class _ElementBounds:
+    """
+    Sorted min and max limits of one element across a family's grades.
+
+    Each limit array carries cumulative grade bitmasks, so the grades a value
+    falls outside of are found with two binary searches.
+    """
+
+    def __init__(self, limits: List[Tuple[Optional[float], Optional[float], int]]):
+        lows = sorted((low, bit) for low, _, bit in limits if low is not None)
+        highs = sorted((high, bit) for _, high, bit in limits if high is not None)
+        self.mins = [low for low, _ in lows]
+        self.maxes = [high for high, _ in highs]
+
+        # above_min[i]: grades whose minimum is mins[i] or higher
+        self.above_min = [0] * (len(lows) + 1)
+        for i in range(len(lows) - 1, -1, -1):
+            self.above_min[i] = self.above_min[i + 1] | lows[i][1]
+        # below_max[i]: grades whose maximum is below maxes[i]
+        self.below_max = [0] * (len(highs) + 1)
+        for i, (_, bit) in enumerate(highs):
+            self.below_max[i + 1] = self.below_max[i] | bit
+
+    def failing(self, value: float) -> int:
+        """Bitmask of grades that reject this value."""
+        return self.above_min[bisect_right(self.mins, value)] | self.below_max[bisect_left(self.maxes, value)]
+
+
+class GradeIndex:
+    """
+    Per-element interval index over grade specifications.
+
+    Grades of each family are numbered as bits of an integer. A composition
+    is screened by removing, element by element, the grades whose limits it
+    falls outside of; an element a grade does not specify never rules it out,
+    matching find_alternative_grades.
+    """
+
+    def __init__(self, specs: Dict[str, Any]):
+        self.grades: Dict[str, List[str]] = {}
+        self.elements: Dict[str, Dict[str, _ElementBounds]] = {}
+        for family, family_specs in specs.items():
+            grades = list(family_specs)
+            limits: Dict[str, List[Tuple[Optional[float], Optional[float], int]]] = {}
+            for position, grade in enumerate(grades):
+                for element, spec in family_specs[grade]["elements"].items():
+                    limits.setdefault(element, []).append((spec.get("min"), spec.get("max"), 1 << position))
+            self.grades[family] = grades
+            self.elements[family] = {element: _ElementBounds(bounds) for element, bounds in limits.items()}
+
+    def matching_grades(self, composition: Dict[str, float], alloy_family: str) -> List[str]:
+        """Grades of a family whose specified limits the composition meets, in spec order."""
+        grades = self.grades.get(alloy_family, [])
+        bounds = self.elements.get(alloy_family, {})
+        rejected = 0
+        for element, value in composition.items():
+            element_bounds = bounds.get(element)
+            if element_bounds is not None:
+                rejected |= element_bounds.failing(value)
+        return [grade for position, grade in enumerate(grades) if not rejected >> position & 1]
+
+
+@cached_reference_object
+def load_grade_index() -> GradeIndex:
+    """Grade index for the alloy specs."""
+    return GradeIndex(load_alloy_specs())
+
+
 def check_element_compliance(
     actual: float,
     spec: Dict
@@ -76,26 +155,47 @@ def check_element_compliance(
 def find_alternative_grades(
     composition: Dict[str, float],
     alloy_family: str,
-    specs: Dict
+    specs: Dict,
+    index: Optional[GradeIndex] = None
 ) -> List[str]:
     """Find alternative grades that match this composition."""
-    alternatives = []
+    if index is None:
+        index = GradeIndex({alloy_family: specs.get(alloy_family, {})})
+    return index.matching_grades(composition, alloy_family)
 
-    family_specs = specs.get(alloy_family, {})
 
-    for grade, grade_spec in family_specs.items():
-        all_match = True
-        for element, value in composition.items():
-            if element in grade_spec["elements"]:
-                check = check_element_compliance(value, grade_spec["elements"][element])
-                if not check["in_spec"]:
-                    all_match = False
-                    break
+def screen_compositions(
+    heats: List[Dict[str, Any]],
+    alloy_family: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Screen a batch of mill-cert compositions against every grade at once.
 
-        if all_match:
-            alternatives.append(grade)
+    Args:
+        heats: Records with composition, alloy_family (unless given for the
+            whole batch) and optional heat_number and target_grade
+        alloy_family: Family applied to every heat
 
-    return alternatives
+    Returns:
+        One result per heat with its matching grades and, when a target
+        grade is given, whether the heat meets it
+    """
+    index = load_grade_index()
+    results = []
+    for heat in heats:
+        family = alloy_family or heat.get("alloy_family", "")
+        matches = index.matching_grades(heat.get("composition", {}), family)
+        result = {
+            "heat_number": heat.get("heat_number"),
+            "alloy_family": family,
+            "matching_grades": matches,
+        }
+        target = heat.get("target_grade")
+        if target is not None:
+            result["target_grade"] = target
+            result["meets_target"] = target in matches
+        results.append(result)
+    return results
 
 
 def apply_customer_spec(
@@ -238,7 +338,7 @@ def validate_composition(
         grade_verified = True
 
     # Find alternative grades
-    alternative_grades = find_alternative_grades(composition, alloy_family, specs)
+    alternative_grades = find_alternative_grades(composition, alloy_family, specs, load_grade_index())
     alternative_grades = [g for g in alternative_grades if g != target_grade]
 
     return {
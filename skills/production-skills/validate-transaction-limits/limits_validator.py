@@ -7,12 +7,22 @@ tier-based limits, velocity checks, and exception handling.
 
 import csv
 import ast
+import math
+import os
+import threading
+from bisect import bisect_left, bisect_right
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Any, Iterable, Optional, Tuple, Union
+from datetime import datetime, timedelta, timezone
 
+try:
+    from skill_runtime.refdata import cached_reference_loader
+except ImportError:  # standalone copy without the shared runtime
+    def cached_reference_loader(func):
+        return func
 
 
+@cached_reference_loader
 def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[str, Any]]:
     """Load a CSV file and return as dictionary keyed by specified column."""
     csv_path = Path(__file__).parent / filename
@@ -44,6 +54,7 @@ def load_csv_as_dict(filename: str, key_column: str = 'id') -> Dict[str, Dict[st
     return result
 
 
+@cached_reference_loader
 def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     """Load a CSV file and return as list of dictionaries."""
     csv_path = Path(__file__).parent / filename
@@ -74,6 +85,7 @@ def load_csv_as_list(filename: str) -> List[Dict[str, Any]]:
     return result
 
 
+@cached_reference_loader
 def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
     """Load parameters CSV as key-value dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -99,6 +111,7 @@ def load_parameters(filename: str = 'parameters.csv') -> Dict[str, Any]:
                     result[key] = value
     return result
 
+@cached_reference_loader
 def load_key_value_csv(filename: str) -> Dict[str, Any]:
     """Load a key-value CSV file as a flat dictionary."""
     csv_path = Path(__file__).parent / filename
@@ -374,6 +387,328 @@ def check_override_authority(
     }
 
 
+LEDGER_COLUMNS = ["customer_id", "channel", "bucket_start", "amount", "count"]
+
+# Rolling windows the ledger keeps running totals for, by name
+LEDGER_WINDOWS = ("daily", "weekly", "monthly")
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class _LedgerAccount:
+    """Bucketed approved volume for one customer and channel."""
+
+    __slots__ = ("buckets", "cents", "counts", "offset", "latest", "windows")
+
+    def __init__(self):
+        self.buckets: List[int] = []  # bucket numbers, ascending
+        self.cents: List[int] = []
+        self.counts: List[int] = []
+        self.offset = 0  # absolute position of buckets[0]
+        self.latest: Optional[int] = None  # bucket the running totals are aligned to
+        # Window length in buckets -> [cents, count, absolute position of oldest bucket inside]
+        self.windows: Dict[int, List[int]] = {}
+
+    def window(self, length: int) -> List[int]:
+        """Running totals for a window, started from the stored buckets on first use."""
+        state = self.windows.get(length)
+        if state is None:
+            start = bisect_right(self.buckets, self.latest - length) if self.latest is not None else len(self.buckets)
+            state = [sum(self.cents[start:]), sum(self.counts[start:]), self.offset + start]
+            self.windows[length] = state
+        return state
+
+    def advance(self, bucket: int, horizon: int) -> None:
+        """Move the running totals forward to a newer bucket, expiring old ones."""
+        if self.latest is not None and bucket <= self.latest:
+            return
+        self.latest = bucket
+        buckets, cents, counts, offset = self.buckets, self.cents, self.counts, self.offset
+        end = offset + len(buckets)
+        for length, state in self.windows.items():
+            cutoff = bucket - length
+            tail = state[2]
+            while tail < end and buckets[tail - offset] <= cutoff:
+                state[0] -= cents[tail - offset]
+                state[1] -= counts[tail - offset]
+                tail += 1
+            state[2] = tail
+
+        # Drop buckets no accepted booking or query can reach; trim in chunks
+        # to keep appends cheap
+        expired = bisect_right(buckets, bucket - horizon)
+        if expired >= 64 and expired * 2 >= len(buckets):
+            del buckets[:expired], cents[:expired], counts[:expired]
+            self.offset += expired
+
+    def is_late(self, bucket: int, lateness: int) -> bool:
+        """Whether a bucket is further behind the newest one than the allowed lateness."""
+        return self.latest is not None and bucket < self.latest - lateness
+
+    def add(self, bucket: int, cents: int, lateness: int, horizon: int) -> bool:
+        """Book one approved transaction; False if it is too late and was not booked."""
+        if self.is_late(bucket, lateness):
+            return False
+        self.advance(bucket, horizon)
+
+        buckets = self.buckets
+        position = len(buckets) if not buckets or bucket > buckets[-1] else bisect_left(buckets, bucket)
+        created = position == len(buckets) or buckets[position] != bucket
+        if created:
+            buckets.insert(position, bucket)
+            self.cents.insert(position, cents)
+            self.counts.insert(position, 1)
+        else:
+            self.cents[position] += cents
+            self.counts[position] += 1
+
+        for length, state in self.windows.items():
+            if bucket > self.latest - length:
+                state[0] += cents
+                state[1] += 1
+            elif created:
+                # A late bucket older than the window shifts the window's start
+                state[2] += 1
+        return True
+
+    def totals(self, bucket: int, length: int, lateness: int, horizon: int) -> Tuple[int, int]:
+        """Cents and count in the window of the given length ending at bucket."""
+        if self.latest is None or bucket >= self.latest:
+            self.advance(bucket, horizon)
+            state = self.window(length)
+            return state[0], state[1]
+        if self.is_late(bucket, lateness):
+            raise ValueError("timestamp is older than the ledger's allowed lateness")
+        # Query behind the stream, within the allowed lateness: every bucket
+        # the window can reach is still stored, so sum them directly
+        start = bisect_right(self.buckets, bucket - length)
+        stop = bisect_right(self.buckets, bucket)
+        return sum(self.cents[start:stop]), sum(self.counts[start:stop])
+
+
+class LimitLedger:
+    """
+    In-process ledger of approved volume for cumulative and velocity limits.
+
+    Approved transactions are booked into time buckets (hourly by default)
+    per customer and channel, and each account keeps running amount and
+    count totals for the daily, weekly and monthly rolling windows. As time
+    moves forward the oldest buckets are subtracted out, so reading the prior
+    amounts and transaction count for a new transaction costs the same
+    however long the customer's history is. Windows are rolling and resolved
+    to the bucket: with hourly buckets a 24-hour window at 14:30 starts with
+    the 15:00 bucket of the previous day. Amounts are held in integer cents.
+
+    Transactions may arrive out of order by up to the allowed lateness
+    (``ledger_allowed_lateness_hours``) behind the newest bucket seen for the
+    account. Each account keeps the longest window plus that margin of
+    buckets, in memory and in snapshots, so a late transaction is scored
+    against complete totals. Anything later than that is refused: record()
+    does not book it, window_totals() raises ValueError, and
+    validate_with_ledger() sends it to review instead of scoring it against
+    totals that could be undercounted.
+
+    ``lock`` makes a check-then-record sequence atomic across threads;
+    validate_with_ledger holds it while it scores and books a transaction.
+
+    Usage::
+
+        ledger = LimitLedger.load("limit_ledger.csv")
+        result = validate_with_ledger(ledger, **transaction)
+        ledger.save("limit_ledger.csv")
+    """
+
+    def __init__(
+        self,
+        bucket_minutes: Optional[int] = None,
+        window_hours: Optional[Dict[str, float]] = None,
+        allowed_lateness_hours: Optional[float] = None
+    ):
+        params = load_parameters()
+        self.bucket_minutes = int(bucket_minutes or params.get("ledger_bucket_minutes", 60))
+        if self.bucket_minutes <= 0:
+            raise ValueError("bucket_minutes must be positive")
+        defaults = {"daily": 24, "weekly": 168, "monthly": 720}
+        self.window_hours = dict(window_hours) if window_hours else {
+            name: params.get(f"ledger_{name}_window_hours", defaults[name]) for name in LEDGER_WINDOWS
+        }
+        self._bucket_seconds = self.bucket_minutes * 60
+        self._lengths: Dict[float, int] = {}
+        self._retention = max(self._window_length(hours) for hours in self.window_hours.values())
+        self.allowed_lateness_hours = (
+            allowed_lateness_hours if allowed_lateness_hours is not None
+            else params.get("ledger_allowed_lateness_hours", 24)
+        )
+        if self.allowed_lateness_hours < 0:
+            raise ValueError("allowed_lateness_hours must not be negative")
+        self._lateness = math.ceil(self.allowed_lateness_hours * 60 / self.bucket_minutes)
+        # Buckets kept per account: the longest window behind the oldest accepted time
+        self._horizon = self._retention + self._lateness
+        self._accounts: Dict[Tuple[str, str], _LedgerAccount] = {}
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    def _window_length(self, hours: float) -> int:
+        """Window length in whole buckets."""
+        length = self._lengths.get(hours)
+        if length is None:
+            length = math.ceil(hours * 60 / self.bucket_minutes)
+            if length <= 0:
+                raise ValueError("window_hours must be positive")
+            self._lengths[hours] = length
+        return length
+
+    def _bucket(self, timestamp: Union[str, datetime, float]) -> int:
+        """Bucket number of an ISO timestamp, datetime or epoch seconds (UTC if naive)."""
+        if isinstance(timestamp, (int, float)):
+            return int(timestamp // self._bucket_seconds)
+        if not isinstance(timestamp, datetime):
+            text = str(timestamp)
+            # fromisoformat only accepts a trailing "Z" from Python 3.11
+            if text.endswith("Z"):
+                text = text[:-1] + "+00:00"
+            timestamp = datetime.fromisoformat(text)
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return int((timestamp - EPOCH).total_seconds() // self._bucket_seconds)
+
+    def record(
+        self,
+        customer_id: str,
+        channel: str,
+        amount: float,
+        timestamp: Union[str, datetime, float]
+    ) -> bool:
+        """
+        Book an approved transaction.
+
+        Args:
+            customer_id: Customer identifier
+            channel: Transaction channel
+            amount: Approved amount
+            timestamp: Transaction time
+
+        Returns:
+            False if the transaction is later than the allowed lateness and was not booked
+        """
+        bucket = self._bucket(timestamp)
+        with self.lock:
+            account = self._accounts.get((customer_id, channel))
+            if account is None:
+                account = self._accounts[(customer_id, channel)] = _LedgerAccount()
+            return account.add(bucket, int(round(amount * 100)), self._lateness, self._horizon)
+
+    def is_late(
+        self,
+        customer_id: str,
+        channel: str,
+        timestamp: Union[str, datetime, float]
+    ) -> bool:
+        """Whether a transaction is further behind the account's newest one than the allowed lateness."""
+        bucket = self._bucket(timestamp)
+        with self.lock:
+            account = self._accounts.get((customer_id, channel))
+            return account is not None and account.is_late(bucket, self._lateness)
+
+    def window_totals(
+        self,
+        customer_id: str,
+        channel: str,
+        timestamp: Union[str, datetime, float],
+        window_hours: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Approved amount and count in each rolling window ending at a time.
+
+        Args:
+            customer_id: Customer identifier
+            channel: Transaction channel
+            timestamp: End of the windows (normally the new transaction's time)
+            window_hours: Window name -> hours (default: the ledger's windows);
+                windows may not be longer than the ledger's longest window
+
+        Returns:
+            Window name -> {"amount", "count"}
+
+        Raises:
+            ValueError: If a window is longer than the ledger's longest window,
+                or the timestamp is later than the allowed lateness
+        """
+        windows = self.window_hours if window_hours is None else window_hours
+        lengths = {name: self._window_length(hours) for name, hours in windows.items()}
+        if any(length > self._retention for length in lengths.values()):
+            raise ValueError("window is longer than the ledger's longest window")
+
+        bucket = self._bucket(timestamp)
+        with self.lock:
+            account = self._accounts.get((customer_id, channel))
+            totals = {}
+            for name, length in lengths.items():
+                cents, count = (
+                    account.totals(bucket, length, self._lateness, self._horizon) if account else (0, 0)
+                )
+                totals[name] = {"amount": cents / 100, "count": count}
+        return totals
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Snapshot the ledger to a CSV file, replacing it atomically.
+
+        Every bucket within the longest window plus the allowed lateness is
+        written, and an empty row marks how far each account's time has
+        advanced, so a restored ledger scores late transactions the same way.
+        """
+        path = Path(path)
+        temp_path = path.with_name(path.name + ".tmp")
+        with self.lock, open(temp_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(LEDGER_COLUMNS)
+            for (customer_id, channel), account in self._accounts.items():
+                oldest = account.latest - self._horizon
+                rows = [
+                    (bucket, cents, count)
+                    for bucket, cents, count in zip(account.buckets, account.cents, account.counts)
+                    if bucket > oldest
+                ]
+                if not rows or rows[-1][0] != account.latest:
+                    rows.append((account.latest, 0, 0))
+                for bucket, cents, count in rows:
+                    start = EPOCH + timedelta(seconds=bucket * self._bucket_seconds)
+                    writer.writerow([
+                        customer_id, channel, start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                        f"{cents / 100:.2f}", count
+                    ])
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], **kwargs: Any) -> "LimitLedger":
+        """Restore a ledger from a CSV snapshot written by save()."""
+        ledger = cls(**kwargs)
+        with open(path, 'r', newline='') as f:
+            rows = sorted(
+                (row["customer_id"], row["channel"], ledger._bucket(row["bucket_start"]),
+                 int(round(float(row["amount"]) * 100)), int(row["count"]))
+                for row in csv.DictReader(f)
+            )
+        for customer_id, channel, bucket, cents, count in rows:
+            account = ledger._accounts.get((customer_id, channel))
+            if account is None:
+                account = ledger._accounts[(customer_id, channel)] = _LedgerAccount()
+            account.latest = bucket
+            if not count:
+                continue  # marks how far the account's time had advanced
+            if account.buckets and account.buckets[-1] == bucket:
+                account.cents[-1] += cents
+                account.counts[-1] += count
+            else:
+                account.buckets.append(bucket)
+                account.cents.append(cents)
+                account.counts.append(count)
+        return ledger
+
+
 def validate_transaction_limits(
     transaction_id: str,
     customer_id: str,
@@ -386,7 +721,8 @@ def validate_transaction_limits(
     monthly_prior_amount: float,
     transactions_in_window: int,
     exception_flags: Dict,
-    validation_timestamp: str
+    validation_timestamp: str,
+    config: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Validate transaction against limits.
@@ -410,11 +746,14 @@ def validate_transaction_limits(
         transactions_in_window: Number of transactions in velocity window
         exception_flags: Exception condition flags
         validation_timestamp: Validation timestamp
+        config: Loaded limit configuration, to reuse across a stream
+            (default: load_transaction_limits())
 
     Returns:
         Transaction limit validation results
     """
-    config = load_transaction_limits()
+    if config is None:
+        config = load_transaction_limits()
     customer_tiers = config.get("customer_tiers", {})
     channel_limits = config.get("channel_limits", {})
     transaction_types = config.get("transaction_types", {})
@@ -522,6 +861,127 @@ def validate_transaction_limits(
     }
 
 
+def validate_with_ledger(
+    ledger: LimitLedger,
+    transaction_id: str,
+    customer_id: str,
+    customer_tier: str,
+    channel: str,
+    transaction_type: str,
+    amount: float,
+    exception_flags: Dict,
+    validation_timestamp: str,
+    config: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Validate a transaction with prior amounts and count taken from a ledger.
+
+    The ledger is read, the transaction scored and, if approved, booked
+    under the ledger's lock, so concurrent transactions for the same
+    customer cannot both pass against the same headroom. A transaction later
+    than the ledger's allowed lateness is not scored or booked; it comes back
+    as REVIEW_REQUIRED for manual handling.
+
+    Args:
+        ledger: Ledger of approved volume
+        transaction_id: Transaction identifier
+        customer_id: Customer identifier
+        customer_tier: Customer tier level
+        channel: Transaction channel
+        transaction_type: Type of transaction
+        amount: Transaction amount
+        exception_flags: Exception condition flags
+        validation_timestamp: Transaction time; the rolling windows end here
+        config: Loaded limit configuration (default: load_transaction_limits())
+
+    Returns:
+        Transaction limit validation results (same shape as validate_transaction_limits)
+    """
+    if config is None:
+        config = load_transaction_limits()
+    tier_limits = get_customer_limits(customer_tier, config.get("customer_tiers", {}))
+    velocity_hours = tier_limits.get("velocity_limit", {}).get("window_hours", 24)
+    windows = {**ledger.window_hours, "velocity": velocity_hours}
+
+    with ledger.lock:
+        if ledger.is_late(customer_id, channel, validation_timestamp):
+            action_config = config.get("validation_actions", {}).get("review_required", {})
+            return {
+                "transaction_id": transaction_id,
+                "customer_id": customer_id,
+                "validation_timestamp": validation_timestamp,
+                "transaction_details": {
+                    "amount": amount,
+                    "channel": channel,
+                    "transaction_type": transaction_type,
+                    "customer_tier": customer_tier
+                },
+                "limit_checks": [],
+                "validation_result": {
+                    "action": "REVIEW_REQUIRED",
+                    "code": action_config.get("code", "REVIEW"),
+                    "description": action_config.get("description", ""),
+                    "reason": "Transaction is older than the limit ledger's allowed lateness"
+                }
+            }
+        totals = ledger.window_totals(customer_id, channel, validation_timestamp, windows)
+        result = validate_transaction_limits(
+            transaction_id=transaction_id,
+            customer_id=customer_id,
+            customer_tier=customer_tier,
+            channel=channel,
+            transaction_type=transaction_type,
+            amount=amount,
+            daily_prior_amount=totals["daily"]["amount"],
+            weekly_prior_amount=totals["weekly"]["amount"],
+            monthly_prior_amount=totals["monthly"]["amount"],
+            transactions_in_window=totals["velocity"]["count"],
+            exception_flags=exception_flags,
+            validation_timestamp=validation_timestamp,
+            config=config
+        )
+        if result["validation_result"]["action"] == "APPROVED":
+            ledger.record(customer_id, channel, amount, validation_timestamp)
+    return result
+
+
+def validate_transaction_stream(
+    transactions: Iterable[Dict],
+    ledger: LimitLedger
+) -> List[Dict[str, Any]]:
+    """
+    Validate a stream of transactions in arrival order against one ledger.
+
+    Each transaction is a dictionary with the validate_with_ledger arguments
+    (transaction_id, customer_id, customer_tier, channel, transaction_type,
+    amount, exception_flags, validation_timestamp). Approved transactions are
+    booked as they pass, so later transactions see them.
+
+    Args:
+        transactions: Transactions in arrival order
+        ledger: Ledger of approved volume
+
+    Returns:
+        One validation result per transaction
+    """
+    config = load_transaction_limits()
+    return [
+        validate_with_ledger(
+            ledger,
+            transaction_id=txn.get("transaction_id", ""),
+            customer_id=txn["customer_id"],
+            customer_tier=txn.get("customer_tier", "basic"),
+            channel=txn.get("channel", "online"),
+            transaction_type=txn.get("transaction_type", "purchase"),
+            amount=txn["amount"],
+            exception_flags=txn.get("exception_flags", {}),
+            validation_timestamp=txn["validation_timestamp"],
+            config=config
+        )
+        for txn in transactions
+    ]
+
+
 if __name__ == "__main__":
     import json
     result = validate_transaction_limits(
@@ -270,3 +270,209 @@ class TestResponseFormat:
         # Check ISO 8601 format: YYYY-MM-DDTHH:MM:SSZ
         iso_pattern = r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$"
         assert re.match(iso_pattern, data["timestamp"])
+
+
+class TestJobTracking:
+    """Tests for background job execution of ops endpoints."""
+
+    @staticmethod
+    def _wait_for_job(client, job_id, timeout=5.0):
+        import time
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            job = client.get(f"/api/v1/jobs/{job_id}").json()
+            if job["status"] in ("COMPLETED", "FAILED"):
+                return job
+            time.sleep(0.02)
+        pytest.fail(f"Job {job_id} did not finish")
+
+    @patch("api.main.get_es_client")
+    def test_teardown_returns_job_and_completes(self, mock_get_es):
+        """Test that ops run in the background and report their result."""
+        from api.main import app
+
+        mock_es = MagicMock()
+        mock_es.indices.exists.return_value = False
+        mock_get_es.return_value = mock_es
+
+        client = TestClient(app)
+        response = client.post("/api/v1/ops/teardown-skills")
+
+        assert response.status_code == 202
+        data = response.json()
+        assert data["operation"] == "teardown-skills"
+        assert data["status_url"] == f"/api/v1/jobs/{data['job_id']}"
+
+        job = self._wait_for_job(client, data["job_id"])
+        assert job["status"] == "COMPLETED"
+        assert job["progress"] == {"completed": 2, "total": 2}
+        assert job["result"]["status"] == "completed"
+
+    @patch("api.main.get_es_client")
+    def test_failed_job_reports_error(self, mock_get_es):
+        """Test that an operation failure is recorded on the job."""
+        from api.main import app
+
+        mock_get_es.side_effect = Exception("Cannot connect to Elasticsearch")
+
+        client = TestClient(app)
+        response = client.post("/api/v1/ops/teardown-skills")
+
+        job = self._wait_for_job(client, response.json()["job_id"])
+        assert job["status"] == "FAILED"
+        assert "Cannot connect to Elasticsearch" in job["error"]
+
+    @patch("api.main.get_es_client")
+    def test_sync_flag_waits_for_result(self, mock_get_es):
+        """Test that ?sync=true keeps the blocking request/response mode."""
+        from api.main import app
+
+        mock_es = MagicMock()
+        mock_es.indices.exists.return_value = False
+        mock_get_es.return_value = mock_es
+
+        client = TestClient(app)
+        response = client.post("/api/v1/ops/teardown-skills?sync=true")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "completed"
+        assert "teardown complete" in data["message"].lower()
+
+    def test_update_skills_missing_directory_is_rejected(self):
+        """Test that an invalid skills_path fails before a job is queued."""
+        from api.main import app
+
+        client = TestClient(app)
+        response = client.post(
+            "/api/v1/ops/update-skills",
+            json={"skills_path": "nonexistent_folder_xyz123"},
+        )
+
+        assert response.status_code == 400
+        assert "not found" in response.json()["detail"].lower()
+
+    def test_unknown_job_returns_404(self):
+        """Test that polling an unknown job id returns 404."""
+        from api.main import app
+
+        client = TestClient(app)
+        response = client.get("/api/v1/jobs/does-not-exist")
+
+        assert response.status_code == 404
+
+
+class TestSharedElasticsearchClient:
+    """Tests for the process-wide Elasticsearch client."""
+
+    @pytest.fixture(autouse=True)
+    def reset_client(self):
+        import api.main
+
+        api.main.close_es_client()
+        yield
+        api.main.close_es_client()
+
+    @patch("api.main.Elasticsearch")
+    def test_client_is_created_once(self, mock_es_class):
+        """Test that repeated calls reuse one client and connection pool."""
+        from api.main import ES_CONNECTIONS_PER_NODE, get_es_client
+
+        first = get_es_client()
+        second = get_es_client()
+
+        assert first is second
+        mock_es_class.assert_called_once()
+        kwargs = mock_es_class.call_args.kwargs
+        assert kwargs["connections_per_node"] == ES_CONNECTIONS_PER_NODE
+        assert kwargs["retry_on_timeout"] in (True, False)
+        first.ping.assert_called_once()
+
+    @patch("api.main.Elasticsearch")
+    def test_failed_ping_does_not_cache_client(self, mock_es_class):
+        """Test that an unreachable cluster is retried on the next call."""
+        from api.main import get_es_client
+
+        mock_es_class.return_value.ping.return_value = False
+        with pytest.raises(Exception, match="Cannot connect"):
+            get_es_client()
+
+        mock_es_class.return_value.ping.return_value = True
+        get_es_client()
+        assert mock_es_class.call_count == 2
+
+    def test_pool_metrics_before_first_use(self):
+        """Test that pool metrics are available before a client exists."""
+        from api.main import app
+
+        client = TestClient(app)
+        response = client.get("/api/v1/metrics/es-pool")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["client_initialized"] is False
+        assert data["nodes"] == []
+        assert data["totals"]["in_use"] == 0
+
+
+class TestSkillBatchEndpoint:
+    """Tests for the batch skill execution endpoint."""
+
+    def test_batch_streams_one_result_per_line(self):
+        """Test that each JSONL input line yields one JSONL result, in order."""
+        import json
+        from api.main import app
+
+        record = {
+            "transaction_id": "TXN-001",
+            "transaction": {"amount": 9500, "is_cash": True, "timestamp": "2026-01-20 14:30:00"},
+            "customer_data": {"customer_id": "CUST-001", "country": "US"},
+            "recent_transactions": [],
+            "countries_involved": ["US"],
+            "validation_timestamp": "2026-01-20 14:30:00",
+        }
+        body = "\n".join([json.dumps(record), json.dumps({"unexpected": 1})])
+
+        client = TestClient(app)
+        response = client.post(
+            "/api/v1/skills/validate-aml-transaction/batch?processes=1",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 200
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert len(results) == 2
+        assert results[0]["transaction_id"] == "TXN-001"
+        assert results[1]["error_type"] == "TypeError"
+
+    def test_batch_spools_large_body(self, monkeypatch):
+        """Test that a body over the spool threshold is streamed from disk line by line."""
+        import json
+        import api.main
+        from api.main import app
+
+        monkeypatch.setattr(api.main, "BATCH_SPOOL_BYTES", 64)
+        body = "\n".join(json.dumps({"unexpected": i}) for i in range(50))
+
+        client = TestClient(app)
+        response = client.post(
+            "/api/v1/skills/validate-aml-transaction/batch?processes=1",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 200
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert len(results) == 50
+        assert results[-1]["record"] == 50
+
+    def test_batch_unknown_skill_returns_404(self):
+        """Test that an unknown or out-of-tree skill name is rejected."""
+        from api.main import app
+
+        client = TestClient(app)
+        response = client.post("/api/v1/skills/no-such-skill/batch", content="")
+
+        assert response.status_code == 404
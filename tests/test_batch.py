@@ -0,0 +1,69 @@
+"""
+Tests for the batch skill runner (skill_runtime.batch).
+"""
+
+import pytest
+
+from skill_runtime.batch import read_jsonl, resolve_entry_point, run_batch
+
+
+SKILL_MODULE = '''
+def load_rates():
+    return {"standard": 0.1}
+
+
+def score_record(record_id, amount):
+    if amount < 0:
+        raise ValueError("amount must be positive")
+    return {"record_id": record_id, "fee": amount * load_rates()["standard"]}
+
+
+if __name__ == "__main__":
+    print(load_rates())
+    print(score_record("R-1", 100))
+'''
+
+
+@pytest.fixture
+def skill_dir(tmp_path):
+    """Create a throwaway skill whose __main__ block demonstrates its entry point."""
+    (tmp_path / "scorer.py").write_text(SKILL_MODULE)
+    return tmp_path
+
+
+def test_entry_point_is_detected_from_main_block(skill_dir):
+    """Loader helpers called in the demo block are not taken as the entry point."""
+    module_path, function_name = resolve_entry_point(skill_dir)
+    assert module_path.name == "scorer.py"
+    assert function_name == "score_record"
+
+
+def test_unknown_entry_point_is_rejected(skill_dir):
+    with pytest.raises(ValueError):
+        resolve_entry_point(skill_dir, "scorer:missing")
+
+
+def test_results_keep_input_order_and_report_errors(skill_dir):
+    lines = [
+        '{"record_id": "R-1", "amount": 100}',
+        '',
+        'not json',
+        '{"record_id": "R-2", "amount": -5}',
+        '{"record_id": "R-3", "amount": 20}',
+    ]
+
+    results = list(run_batch(skill_dir, read_jsonl(lines), processes=1))
+
+    assert results[0] == {"record_id": "R-1", "fee": 10.0}
+    assert results[1]["error_type"] == "JSONDecodeError" and results[1]["record"] == 2
+    assert results[2] == {"error": "amount must be positive", "error_type": "ValueError", "record": 3}
+    assert results[3] == {"record_id": "R-3", "fee": 2.0}
+
+
+def test_process_pool_matches_in_process(skill_dir):
+    records = [{"record_id": f"R-{i}", "amount": i} for i in range(50)]
+
+    serial = list(run_batch(skill_dir, records, processes=1))
+    pooled = list(run_batch(skill_dir, records, processes=2, chunk_size=7))
+
+    assert pooled == serial
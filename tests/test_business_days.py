@@ -0,0 +1,84 @@
+"""
+Tests for the shared business-day calendar (skill_runtime.business_days).
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from skill_runtime.business_days import BusinessCalendar, calendars_from_rows
+
+# US settlement holidays around Thanksgiving and year end 2026
+HOLIDAYS = ["2026-11-26", "2026-12-25", "2027-01-01"]
+
+
+def step_through(calendar_holidays, start, days):
+    """Reference implementation: walk one calendar day at a time."""
+    holidays = {date.fromisoformat(d) for d in calendar_holidays}
+    step = 1 if days > 0 else -1
+    current, counted = start, 0
+    while counted < abs(days):
+        current += timedelta(days=step)
+        if current.weekday() < 5 and current not in holidays:
+            counted += 1
+    return current
+
+
+def test_t_plus_n_skips_weekends_and_holidays():
+    calendar = BusinessCalendar(HOLIDAYS)
+    assert calendar.add_business_days("2026-11-25", 1) == date(2026, 11, 27)
+    assert calendar.add_business_days("2026-11-25", 2) == date(2026, 11, 30)
+    assert calendar.add_business_days("2026-12-31", 1) == date(2027, 1, 4)
+    assert calendar.add_business_days("2026-11-27", 0) == date(2026, 11, 27)
+
+
+def test_matches_day_by_day_walk():
+    calendar = BusinessCalendar(HOLIDAYS)
+    start = date(2026, 10, 1)
+    for offset in range(0, 120, 3):
+        for days in (-7, -1, 1, 2, 5, 30):
+            day = start + timedelta(days=offset)
+            assert calendar.add_business_days(day, days) == step_through(HOLIDAYS, day, days)
+
+
+def test_range_extends_for_distant_dates():
+    calendar = BusinessCalendar(HOLIDAYS)
+    assert calendar.add_business_days("2040-06-01", 1) == date(2040, 6, 4)
+    assert calendar.add_business_days("2001-01-05", -1) == date(2001, 1, 4)
+
+
+def test_batch_matches_single_calls():
+    calendar = BusinessCalendar(HOLIDAYS)
+    days = [date(2026, 11, 20) + timedelta(days=i) for i in range(60)]
+    cycles = [i % 4 for i in range(60)]
+    expected = [calendar.add_business_days(d, n) for d, n in zip(days, cycles)]
+    assert calendar.add_business_days_batch(days, cycles) == expected
+    with pytest.raises(ValueError):
+        calendar.add_business_days_batch(days, [1, 2])
+
+
+def test_business_days_between_inverts_shift():
+    calendar = BusinessCalendar(HOLIDAYS)
+    assert calendar.business_days_between("2026-11-25", "2026-11-30") == 2
+    assert calendar.business_days_between("2026-11-30", "2026-11-25") == -2
+    assert calendar.add_business_days("2026-11-25", 2) == date(2026, 11, 30)
+
+
+def test_roll_conventions():
+    calendar = BusinessCalendar(HOLIDAYS)
+    assert calendar.roll("2026-11-26") == date(2026, 11, 27)
+    assert calendar.roll("2026-11-26", "preceding") == date(2026, 11, 25)
+    # Following would cross into December
+    assert calendar.roll("2026-10-31", "modified_following") == date(2026, 10, 30)
+    with pytest.raises(ValueError):
+        calendar.roll("2026-10-31", "nearest")
+
+
+def test_calendars_from_rows_groups_by_market():
+    rows = [
+        {"market": "US", "date": "2026-11-26"},
+        {"market": "EU", "date": "2026-12-26"},
+    ]
+    calendars = calendars_from_rows(rows)
+    assert not calendars["US"].is_business_day("2026-11-26")
+    assert calendars["EU"].is_business_day("2026-11-26")
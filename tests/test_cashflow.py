@@ -0,0 +1,83 @@
+"""
+Tests for the shared cash-flow solver (skill_runtime.cashflow).
+"""
+
+import importlib.util
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from skill_runtime import cashflow
+
+
+def test_irr_zeroes_npv():
+    flows = [-1000, 300, 400, 500]
+    rate = cashflow.irr(flows)
+    assert rate == pytest.approx(0.0889634, abs=1e-6)
+    assert cashflow.npv(rate, flows) == pytest.approx(0, abs=1e-6)
+
+
+def test_irr_converges_where_plain_newton_diverges():
+    # A losing project: Newton from 10% overshoots below -100%
+    flows = [-100] + [0] * 9 + [20]
+    rate = cashflow.irr(flows)
+    assert rate == pytest.approx(0.2 ** 0.1 - 1)
+    assert cashflow.npv(rate, flows) == pytest.approx(0, abs=1e-9)
+
+
+def test_irr_prefers_economic_root():
+    # Roots near -97% and +197%; the one nearer the guess in discount terms wins
+    assert cashflow.irr([-100, 300, -10]) == pytest.approx(1.9662878, abs=1e-6)
+
+
+def test_irr_without_sign_change_is_none():
+    assert cashflow.irr([100, 200, 300]) is None
+    assert cashflow.irr([-100, -200]) is None
+    assert cashflow.irr([-100]) is None
+
+
+def test_irr_picks_root_nearest_guess():
+    # NPV is zero at both 10% and 20%
+    flows = [-100, 230, -132]
+    assert cashflow.irr(flows, guess=0.05) == pytest.approx(0.10)
+    assert cashflow.irr(flows, guess=0.25) == pytest.approx(0.20)
+
+
+def test_xirr_on_yearly_dates_matches_irr():
+    flows = [-1000, 300, 400, 500]
+    dates = [date(2021, 1, 1), date(2022, 1, 1), date(2023, 1, 1), date(2024, 1, 1)]
+    rate = cashflow.xirr(flows, dates)
+    assert cashflow.xnpv(rate, flows, dates) == pytest.approx(0, abs=1e-6)
+    assert rate == pytest.approx(cashflow.irr(flows), abs=1e-3)
+    assert cashflow.xirr(flows, [d.isoformat() for d in dates]) == pytest.approx(rate)
+
+
+def test_xirr_rejects_mismatched_lengths():
+    with pytest.raises(ValueError):
+        cashflow.xirr([-100, 110], ["2024-01-01"])
+
+
+def test_irr_batch_matches_single_solves():
+    sets = [[-1000, 300 + i, 400, 500] for i in range(50)] + [[1, 2]]
+    expected = [cashflow.irr(flows) for flows in sets]
+    assert cashflow.irr_batch(sets) == expected
+    assert cashflow.irr_batch(sets, processes=2, chunk_size=10) == expected
+
+
+def test_standalone_skill_irr_matches_shared_solver(monkeypatch):
+    """A skill copy without skill_runtime still solves IRR locally."""
+    module_path = (Path(__file__).parent.parent / "skills" / "production-skills"
+                   / "evaluate-real-estate-investment" / "investment_analyzer.py")
+    monkeypatch.setitem(sys.modules, "skill_runtime", None)
+    spec = importlib.util.spec_from_file_location("standalone_investment_analyzer", module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    flows = [-1000, 300, 400, 500]
+    assert module.solve_irr(flows) == pytest.approx(cashflow.irr(flows), abs=1e-9)
+    assert module.solve_irr([100, 200]) is None
+    assert module.calculate_irr(1000, [80, 80, 80], 1100) == pytest.approx(
+        cashflow.irr([-1000, 80, 80, 1180]), abs=1e-9
+    )
@@ -0,0 +1,81 @@
+"""
+Tests for duplicate invoice screening in process-invoice-accuracy.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+MODULE_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "skills" / "production-skills" / "process-invoice-accuracy" / "accuracy_processor.py"
+)
+
+
+@pytest.fixture(scope="module")
+def accuracy_processor():
+    spec = importlib.util.spec_from_file_location("accuracy_processor", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def invoice(invoice_id, number, invoice_date, amount=500.0, vendor="VND-100"):
+    return {
+        "invoice_id": invoice_id,
+        "vendor_id": vendor,
+        "invoice_number": number,
+        "invoice_date": invoice_date,
+        "total_amount": amount,
+    }
+
+
+def test_recurring_sequential_invoice_is_not_a_duplicate(accuracy_processor):
+    index = accuracy_processor.DuplicateInvoiceIndex([invoice("A-1", "INV-2024-0012", "2024-03-01")])
+    result = index.check(invoice("A-2", "INV-2024-0013", "2024-04-01"))
+    assert not result["is_potential_duplicate"]
+
+    screened = accuracy_processor.screen_invoice_batch(
+        [invoice("A-2", "INV-2024-0013", "2024-04-01"), invoice("A-3", "INV-2024-0014", "2024-05-01")],
+        index,
+    )
+    assert [r["is_potential_duplicate"] for r in screened] == [False, False]
+    assert len(index) == 3
+
+
+def test_near_duplicate_numbers_are_still_flagged(accuracy_processor):
+    index = accuracy_processor.DuplicateInvoiceIndex([invoice("A-1", "INV-2024-0012", "2024-03-01")])
+    # Dropped suffix and a zero-padding variant of the same number
+    for number in ("INV-2024-0012A", "INV-2024-012"):
+        result = index.check(invoice("A-9", number, "2024-03-20"))
+        assert result["is_potential_duplicate"], number
+        assert result["potential_duplicates"][0]["match_type"] == "similar_invoice_number"
+
+
+@pytest.mark.parametrize("original, rekeyed", [
+    ("INV-2024-0012", "INV-2024-0021"),
+    ("884512", "884521"),
+    ("884512", "8845120"),
+    ("INV-2024-0012", "INV-2024-0013"),
+])
+def test_rekeyed_numbers_close_in_date_are_flagged(accuracy_processor, original, rekeyed):
+    index = accuracy_processor.DuplicateInvoiceIndex([invoice("A-1", original, "2024-03-01")])
+    result = index.check(invoice("A-2", rekeyed, "2024-03-02"))
+    assert result["is_potential_duplicate"]
+    assert result["potential_duplicates"][0]["match_type"] in (
+        "transposed_invoice_number", "similar_invoice_number"
+    )
+
+
+def test_sequence_step_across_month_end_is_flagged(accuracy_processor):
+    index = accuracy_processor.DuplicateInvoiceIndex([invoice("A-1", "INV-2024-0012", "2024-03-31")])
+    assert index.check(invoice("A-2", "INV-2024-0013", "2024-04-01"))["is_potential_duplicate"]
+
+
+def test_exact_and_normalized_matches(accuracy_processor):
+    index = accuracy_processor.DuplicateInvoiceIndex([invoice("A-1", "INV-2024-0012", "2024-03-01")])
+    exact = index.check(invoice("A-2", "INV-2024-0012", "2024-03-15"))
+    assert exact["potential_duplicates"][0]["match_type"] == "exact_invoice_number"
+    normalized = index.check(invoice("A-3", "inv 2024 0012", "2024-03-15"))
+    assert normalized["potential_duplicates"][0]["match_type"] == "normalized_invoice_number"
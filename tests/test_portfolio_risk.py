@@ -0,0 +1,30 @@
+"""
+Tests for the covariance model in calculate-portfolio-risk.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+MODULE_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "skills" / "production-skills" / "calculate-portfolio-risk" / "portfolio_risk_calculator.py"
+)
+
+
+@pytest.fixture(scope="module")
+def risk_calculator():
+    spec = importlib.util.spec_from_file_location("portfolio_risk_calculator", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_lots_of_one_ticker_are_not_diversified(risk_calculator):
+    market_data = risk_calculator.load_market_data()
+    single = risk_calculator.PortfolioRiskModel([{"ticker": "AAPL", "value": 100000}], market_data)
+    lots = risk_calculator.PortfolioRiskModel([{"ticker": "AAPL", "value": 1000}] * 100, market_data)
+
+    assert lots.volatility() == pytest.approx(single.volatility())
+    assert sum(lots.component_var(0.95, 1)) == pytest.approx(single.parametric_var(0.95, 1)["var"])
@@ -0,0 +1,177 @@
+"""
+Tests for the shared skill reference-data cache (skill_runtime.refdata).
+"""
+
+import importlib.util
+import os
+
+import pytest
+
+from skill_runtime import refdata
+
+
+SKILL_MODULE = '''
+import csv
+from pathlib import Path
+
+from skill_runtime.refdata import cached_reference_loader
+
+
+@cached_reference_loader
+def load_key_value_csv(filename):
+    csv_path = Path(__file__).parent / filename
+    with open(csv_path, 'r') as f:
+        return {row['key']: float(row['value']) for row in csv.DictReader(f)}
+'''
+
+
+@pytest.fixture
+def skill_module(tmp_path):
+    """Create a throwaway skill module with one cached loader."""
+    (tmp_path / "thresholds.csv").write_text("key,value\nmin_score,0.5\n")
+    module_path = tmp_path / "fake_skill.py"
+    module_path.write_text(SKILL_MODULE)
+
+    spec = importlib.util.spec_from_file_location("fake_skill", module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    refdata.clear_cache()
+    yield module
+    refdata.clear_cache()
+
+
+def test_second_call_is_a_cache_hit(skill_module):
+    """Repeated loads parse the CSV once."""
+    first = skill_module.load_key_value_csv("thresholds.csv")
+    second = skill_module.load_key_value_csv("thresholds.csv")
+
+    assert first == second == {"min_score": 0.5}
+    info = refdata.cache_info()
+    assert info["misses"] == 1
+    assert info["hits"] == 1
+    assert info["entries"] == 1
+
+
+def test_cached_value_is_not_shared(skill_module):
+    """Mutating a returned result must not leak into later calls."""
+    skill_module.load_key_value_csv("thresholds.csv")["min_score"] = 99
+    assert skill_module.load_key_value_csv("thresholds.csv") == {"min_score": 0.5}
+
+
+def test_changed_file_is_reloaded(skill_module, tmp_path):
+    """A newer mtime on the source CSV triggers a reload."""
+    skill_module.load_key_value_csv("thresholds.csv")
+
+    csv_path = tmp_path / "thresholds.csv"
+    csv_path.write_text("key,value\nmin_score,0.75\n")
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert skill_module.load_key_value_csv("thresholds.csv") == {"min_score": 0.75}
+    assert refdata.cache_info()["reloads"] == 1
+
+
+def test_snapshot_serves_first_load(skill_module, tmp_path):
+    """A compiled snapshot replaces the CSV parse until the CSV changes."""
+    from skill_runtime.snapshot import write_snapshot
+
+    with refdata.record_loads() as records:
+        skill_module.load_key_value_csv("thresholds.csv")
+    write_snapshot(tmp_path, [(key, fp, value) for _, key, fp, value in records])
+
+    assert skill_module.load_key_value_csv("thresholds.csv") == {"min_score": 0.5}
+    assert refdata.cache_info()["snapshot_loads"] == 1
+
+    # A stale snapshot entry is ignored and the CSV is parsed instead. The new
+    # value changes the file size on purpose: freshness is mtime/size based,
+    # and a same-size rewrite within mtime granularity is a documented blind spot
+    refdata.clear_cache()
+    csv_path = tmp_path / "thresholds.csv"
+    csv_path.write_text("key,value\nmin_score,0.95\n")
+    assert skill_module.load_key_value_csv("thresholds.csv") == {"min_score": 0.95}
+    assert refdata.cache_info()["snapshot_loads"] == 0
+
+
+COMPILER_SKILL_MODULE = SKILL_MODULE + '''
+
+def load_missing_constraints():
+    with open(Path(__file__).parent / "missing.json") as f:
+        return f.read()
+
+
+def load_skill_config():
+    return load_key_value_csv("thresholds.csv")
+'''
+
+
+def load_compiler():
+    """Import scripts/compile_skill_snapshots.py as a module."""
+    script = os.path.join(os.path.dirname(__file__), "..", "scripts", "compile_skill_snapshots.py")
+    spec = importlib.util.spec_from_file_location("compile_skill_snapshots", script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_compiler_calls_only_cached_loaders(tmp_path):
+    """Uncached loaders (here one reading a missing file) are never run."""
+    skill_dir = tmp_path / "fake-skill"
+    skill_dir.mkdir()
+    (skill_dir / "SKILL.md").write_text("# Skill: Fake\n")
+    (skill_dir / "thresholds.csv").write_text("key,value\nmin_score,0.5\n")
+    (skill_dir / "fake_skill.py").write_text(COMPILER_SKILL_MODULE)
+
+    stats = load_compiler().compile_snapshots(tmp_path)
+    assert stats == {"compiled": 1, "skipped": 0, "errors": 0}
+    assert (skill_dir / "reference.snapshot").exists()
+
+
+def test_compiler_skips_skill_with_unreadable_reference_file(tmp_path):
+    skill_dir = tmp_path / "fake-skill"
+    skill_dir.mkdir()
+    (skill_dir / "SKILL.md").write_text("# Skill: Fake\n")
+    (skill_dir / "fake_skill.py").write_text(SKILL_MODULE + '''
+
+def load_skill_config():
+    return load_key_value_csv("not_shipped.csv")
+''')
+
+    stats = load_compiler().compile_snapshots(tmp_path)
+    assert stats == {"compiled": 0, "skipped": 1, "errors": 0}
+
+
+BUILDER_MODULE = SKILL_MODULE + '''
+
+BUILDS = []
+
+
+@cached_reference_object
+def load_threshold_index():
+    BUILDS.append(1)
+    return sorted(load_key_value_csv("thresholds.csv").items())
+'''
+
+
+def test_reference_object_rebuilt_only_on_change(tmp_path):
+    (tmp_path / "thresholds.csv").write_text("key,value\nmin_score,0.5\n")
+    module_path = tmp_path / "fake_builder.py"
+    module_path.write_text(BUILDER_MODULE.replace(
+        "import cached_reference_loader", "import cached_reference_loader, cached_reference_object"
+    ))
+    spec = importlib.util.spec_from_file_location("fake_builder", module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    refdata.clear_cache()
+
+    first = module.load_threshold_index()
+    assert module.load_threshold_index() is first
+    assert len(module.BUILDS) == 1
+
+    csv_path = tmp_path / "thresholds.csv"
+    csv_path.write_text("key,value\nmin_score,0.75\n")
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert module.load_threshold_index() == [("min_score", 0.75)]
+    assert len(module.BUILDS) == 2
+    refdata.clear_cache()
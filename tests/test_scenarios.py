@@ -0,0 +1,66 @@
+"""
+Tests for the shared scenario engine (skill_runtime.scenarios).
+"""
+
+import pytest
+
+from skill_runtime import scenarios
+
+
+def profit(price, cost, volume):
+    margin = price - cost
+    return {"profit": margin * volume, "units_per_dollar": 1 / margin if margin > 0 else None}
+
+
+BASE = {"price": 10.0, "cost": 6.0, "volume": 1000}
+
+
+def test_grid_is_cartesian_product():
+    points = scenarios.grid({"price": [9, 10, 11], "cost": [5, 6]})
+    assert len(points) == 6
+    assert points[0] == {"price": 9, "cost": 5}
+    assert points[-1] == {"price": 11, "cost": 6}
+
+
+def test_evaluate_grid_overrides_base():
+    rows = scenarios.evaluate_grid(profit, BASE, {"price": [8, 12]})
+    assert [row["profit"] for row in rows] == [2000, 6000]
+
+
+def test_percentile_matches_linear_interpolation():
+    values = sorted([1.0, 2.0, 3.0, 4.0])
+    assert scenarios.percentile(values, 50) == pytest.approx(2.5)
+    assert scenarios.percentile(values, 0) == 1.0
+    assert scenarios.percentile(values, 100) == 4.0
+
+
+def test_bands_skip_undefined_values():
+    bands = scenarios.percentile_bands([1.0, None, 3.0])
+    assert bands["count"] == 2
+    assert bands["undefined"] == 1
+    assert bands["mean"] == pytest.approx(2.0)
+
+
+def test_tornado_ranks_by_swing():
+    rows = scenarios.tornado(profit, BASE, {"price": (9, 11), "volume": (900, 1100)}, "profit")
+    assert [row["parameter"] for row in rows] == ["price", "volume"]
+    assert rows[0]["swing"] == pytest.approx(2000)
+    assert rows[1]["swing"] == pytest.approx(800)
+
+
+def test_monte_carlo_is_reproducible_and_centred():
+    distributions = {"price": {"dist": "normal", "mean": 10.0, "std": 0.5}, "volume": 1000}
+    first = scenarios.monte_carlo(profit, BASE, distributions, draws=20000, seed=11)
+    second = scenarios.monte_carlo(profit, BASE, distributions, draws=20000, seed=11)
+    assert first == second
+
+    bands = first["outputs"]["profit"]
+    assert bands["count"] == 20000
+    assert bands["p50"] == pytest.approx(4000, rel=0.02)
+    assert bands["p5"] < bands["p50"] < bands["p95"]
+    assert [row["parameter"] for row in first["tornado"]] == ["price"]
+
+
+def test_unknown_distribution_is_rejected():
+    with pytest.raises(ValueError):
+        scenarios.sample({"price": {"dist": "cauchy"}}, draws=10)
@@ -0,0 +1,81 @@
+"""
+Tests for bulk matching and netting in process-trade-settlement.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+MODULE_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "skills" / "production-skills" / "process-trade-settlement" / "settlement_processor.py"
+)
+
+
+@pytest.fixture(scope="module")
+def settlement_processor():
+    spec = importlib.util.spec_from_file_location("settlement_processor", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def trade(trade_id, counterparty="CP-A", side="sell", quantity=100, price=10.0, cusip="037833100"):
+    return {
+        "trade_id": trade_id,
+        "counterparty_id": counterparty,
+        "cusip": cusip,
+        "trade_date": "2026-01-20",
+        "side": side,
+        "quantity": quantity,
+        "price": price,
+        "currency": "USD",
+    }
+
+
+def confirmation(our_trade, trade_id):
+    side = "buy" if our_trade["side"] == "sell" else "sell"
+    return dict(our_trade, trade_id=trade_id, side=side)
+
+
+def test_deliveries_share_one_position(settlement_processor):
+    ours = [trade("T1", "CP-A", quantity=600), trade("T2", "CP-B", quantity=600)]
+    theirs = [confirmation(t, "C" + t["trade_id"]) for t in ours]
+
+    result = settlement_processor.process_settlement_blotter(
+        ours, theirs, positions={"037833100": {"available": 1000, "pending_receipts": 0}}
+    )
+
+    levels = {p["counterparty_id"]: p["fail_risk"]["fail_risk_level"]
+              for p in result["netting"]["securities_positions"]}
+    assert levels == {"CP-A": "low", "CP-B": "high"}
+    assert result["summary"]["positions_at_risk"] == 1
+
+
+def test_busy_key_matches_exact_fills_then_tolerance(settlement_processor):
+    ours = [trade(f"T{k}", quantity=100, price=10.0 + k % 7 / 100) for k in range(2000)]
+    theirs = [confirmation(t, "C" + t["trade_id"]) for t in ours]
+    # One fill confirmed half a cent away, one with the wrong quantity
+    theirs[5] = dict(theirs[5], price=round(theirs[5]["price"] + 0.005, 3))
+    theirs[9] = dict(theirs[9], quantity=150)
+
+    result = settlement_processor.match_trade_blotter(ours, theirs)
+
+    assert result["summary"]["matched"] == 1999
+    assert [b["break_type"] for b in result["breaks"]] == ["quantity_break"]
+    assert result["breaks"][0]["their_quantity"] == 150
+    near = next(m for m in result["matched"] if m["price_difference"])
+    assert near["price_difference"] == pytest.approx(0.005)
+
+
+def test_leftovers_break_against_nearest_confirmation(settlement_processor):
+    ours = [trade("T1", quantity=100, price=10.0)]
+    theirs = [confirmation(trade("C1", quantity=10, price=10.0), "C1"),
+              confirmation(trade("C2", quantity=99, price=10.0), "C2")]
+
+    result = settlement_processor.match_trade_blotter(ours, theirs)
+
+    by_type = {b["break_type"]: b for b in result["breaks"]}
+    assert by_type["quantity_break"]["counterparty_trade_id"] == "C2"
+    assert by_type["unmatched_theirs"]["counterparty_trade_id"] == "C1"